@@ -1,22 +1,193 @@
 import logging
 import os
 import requests
+import threading
 import time
-from typing import Optional, Dict, Any
+import uuid
+from collections import deque
+from typing import Optional, Dict, Any, Deque
+
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from idempotency_ledger import IdempotencyLedger, derive_idempotency_key
+from resilience import CircuitBreaker, ResilienceError, TokenBucket, guarded_call
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+DEFAULT_POOL_SIZE: int = 10
+DEFAULT_TIMEOUT: float = 10  # seconds
+RETRY_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+LATENCY_WINDOW: int = 1024  # most recent request latencies kept for percentiles
+
+
+def _is_gateway_failure(error: BaseException) -> bool:
+    """
+    Whether an error says the gateway is unhealthy: transport errors and
+    429/5xx count, other 4xx responses are the caller's fault.
+    """
+    if isinstance(error, requests.HTTPError) and error.response is not None:
+        status = error.response.status_code
+        return status in RETRY_STATUS_CODES or status >= 500
+    return True
+
 
 class ACHPayments:
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        keep_alive: bool = True,
+        max_retries: int = 3,
+        backoff_factor: float = 0.5,
+        backoff_jitter: float = 0.5,
+        backoff_max: float = 10.0,
+        ledger: Optional[IdempotencyLedger] = None,
+        rate_limiter: Optional[TokenBucket] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+    ) -> None:
+        """
+        Args:
+            pool_size (int): Maximum number of pooled connections to the gateway.
+            keep_alive (bool): Reuse connections between requests.
+            max_retries (int): Total attempts per request, including the first one.
+            backoff_factor (float): Base of the exponential backoff between retries.
+            backoff_jitter (float): Upper bound of the random delay added to each backoff.
+            backoff_max (float): Cap on a single backoff delay, in seconds.
+            ledger (Optional[IdempotencyLedger]): Ledger of completed payments; when
+                set, resubmitting a payment returns the stored response.
+            rate_limiter (Optional[TokenBucket]): Shared limit on the gateway request rate.
+            circuit_breaker (Optional[CircuitBreaker]): Breaker that fails calls fast
+                while the gateway is degraded.
+        """
         # Initialize ACH payment gateway credentials/configuration here
         self.api_url: str = "https://api.example-ach-gateway.com/payments"
         self.api_key: Optional[str] = os.getenv("ACH_API_KEY")
         if not self.api_key:
             logger.warning("ACH_API_KEY environment variable is not set.")
-        self.max_retries: int = 3
-        self.retry_delay: int = 2  # seconds
+        self.max_retries: int = max_retries
+        self.backoff_factor: float = backoff_factor
+        self.backoff_jitter: float = backoff_jitter
+        self.backoff_max: float = backoff_max
+        self.pool_size: int = pool_size
+        self.keep_alive: bool = keep_alive
+        self.timeout: float = DEFAULT_TIMEOUT
+        self.ledger: Optional[IdempotencyLedger] = ledger
+        self.rate_limiter: Optional[TokenBucket] = rate_limiter
+        self.circuit_breaker: Optional[CircuitBreaker] = circuit_breaker
+        self.session: requests.Session = self._create_session()
+
+        self._stats_lock = threading.Lock()
+        self._request_count: int = 0
+        self._error_count: int = 0
+        self._latencies: Deque[float] = deque(maxlen=LATENCY_WINDOW)
+
+    def _create_session(self) -> requests.Session:
+        """
+        Build a session with a bounded connection pool and urllib3 retries
+        (exponential backoff with jitter on connection errors and retryable statuses).
+        """
+        retry = Retry(
+            total=max(self.max_retries - 1, 0),
+            status_forcelist=RETRY_STATUS_CODES,
+            allowed_methods=frozenset({"GET", "POST"}),
+            backoff_factor=self.backoff_factor,
+            backoff_jitter=self.backoff_jitter,
+            backoff_max=self.backoff_max,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(
+            pool_connections=1, pool_maxsize=self.pool_size, max_retries=retry
+        )
+        session = requests.Session()
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        if not self.keep_alive:
+            session.headers["Connection"] = "close"
+        return session
+
+    def _send(self, method: str, url: str, endpoint: str, **kwargs: Any) -> requests.Response:
+        """
+        Send a request through the pooled session behind the rate limiter and
+        circuit breaker, recording latency and errors.
+
+        Raises:
+            CircuitOpenError: If the endpoint's circuit is open (no request is sent).
+            RateLimitExceeded: If the rate limiter had no token in time.
+        """
+        return guarded_call(
+            "ach." + endpoint,
+            self._request,
+            method,
+            url,
+            rate_limiter=self.rate_limiter,
+            circuit_breaker=self.circuit_breaker,
+            is_failure=_is_gateway_failure,
+            **kwargs,
+        )
+
+    def _request(self, method: str, url: str, **kwargs: Any) -> requests.Response:
+        start = time.perf_counter()
+        try:
+            response = self.session.request(method, url, timeout=self.timeout, **kwargs)
+            response.raise_for_status()
+            return response
+        except Exception:
+            with self._stats_lock:
+                self._error_count += 1
+            raise
+        finally:
+            with self._stats_lock:
+                self._request_count += 1
+                self._latencies.append(time.perf_counter() - start)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Connection-pool and latency statistics for this client.
+
+        Returns:
+            dict: Request and error counts, connections opened, pool hit rate
+                  (share of requests served on an already-open connection) and
+                  mean/p50/p95/max latency in milliseconds over the recent window.
+        """
+        opened = pooled_requests = 0
+        # The same adapter is mounted for http:// and https://; count it once
+        adapters = {id(adapter): adapter for adapter in self.session.adapters.values()}
+        for adapter in adapters.values():
+            pools = getattr(adapter, "poolmanager", None)
+            if pools is None:
+                continue
+            for key in pools.pools.keys():
+                pool = pools.pools.get(key)
+                if pool is not None:
+                    opened += pool.num_connections
+                    pooled_requests += pool.num_requests
+        with self._stats_lock:
+            latencies = sorted(self._latencies)
+            stats: Dict[str, Any] = {
+                "requests": self._request_count,
+                "errors": self._error_count,
+            }
+        stats["connections_opened"] = opened
+        stats["pool_hit_rate"] = (
+            1 - opened / pooled_requests if pooled_requests else 0.0
+        )
+        if self.circuit_breaker is not None:
+            stats["circuits"] = self.circuit_breaker.metrics()
+        if self.rate_limiter is not None:
+            stats["rate_limiter"] = self.rate_limiter.metrics()
+        if latencies:
+            stats["latency_ms"] = {
+                "mean": 1000 * sum(latencies) / len(latencies),
+                "p50": 1000 * latencies[len(latencies) // 2],
+                "p95": 1000 * latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))],
+                "max": 1000 * latencies[-1],
+            }
+        return stats
+
+    def close(self) -> None:
+        """Close pooled connections."""
+        self.session.close()
 
     def create_payment(
         self,
@@ -24,6 +195,8 @@ class ACHPayments:
         routing_number: str,
         amount: float,
         description: str = "",
+        idempotency_key: Optional[str] = None,
+        derive_key: bool = False,
     ) -> Optional[Dict[str, Any]]:
         """
         Create an ACH payment request.
@@ -32,6 +205,14 @@ class ACHPayments:
             routing_number (str): Bank routing number.
             amount (float): Amount to transfer.
             description (str): Optional description for the payment.
+            idempotency_key (Optional[str]): Key identifying this payment. Sent as
+                the Idempotency-Key header so the gateway can drop duplicate
+                submissions, and used to look up and record the response in the
+                ledger. Pass the same key when resubmitting the same payment.
+            derive_key (bool): Without an ``idempotency_key``, derive one from the
+                payment fields, so identical payments count as one. Otherwise a
+                fresh key covers only the retries of this call, and identical
+                payments are all sent.
         Returns:
             dict or None: Payment response or None if failure.
         """
@@ -42,6 +223,20 @@ class ACHPayments:
             logger.error("Account number and routing number must be provided.")
             return None
 
+        if idempotency_key is None and derive_key:
+            idempotency_key = derive_idempotency_key(
+                account_number, routing_number, amount, description
+            )
+        # A per-call key only protects this call's retries; it is never looked up again
+        ledger = self.ledger if idempotency_key is not None else None
+        if idempotency_key is None:
+            idempotency_key = uuid.uuid4().hex
+        if ledger is not None:
+            recorded = ledger.get(idempotency_key)
+            if recorded is not None:
+                logger.info(f"Payment {idempotency_key} already submitted, returning recorded response")
+                return recorded
+
         payload: Dict[str, Any] = {
             "account_number": account_number,
             "routing_number": routing_number,
@@ -51,33 +246,34 @@ class ACHPayments:
         headers: Dict[str, str] = {
             "Authorization": f"Bearer {self.api_key}" if self.api_key else "",
             "Content-Type": "application/json",
+            "Idempotency-Key": idempotency_key,
         }
 
-        for attempt in range(1, self.max_retries + 1):
-            try:
-                logger.info(
-                    f"Attempt {attempt}: Creating ACH payment of {amount} to account "
-                    f"{account_number} with routing "
-                    f"{routing_number}"
-                )
-                response = requests.post(self.api_url, json=payload, headers=headers, timeout=10)
-                response.raise_for_status()
-                payment_response: Dict[str, Any] = response.json()
-                logger.info(f"ACH payment created successfully: {payment_response}")
-                return payment_response
-            except requests.RequestException as e:
-                logger.error(f"Error creating ACH payment on attempt {attempt}: {e}")
-                if attempt < self.max_retries:
-                    time.sleep(self.retry_delay)
-                else:
-                    return {"status": "failure", "error": str(e)}
-            except Exception as e:
-                logger.error(f"Unexpected error creating ACH payment on attempt {attempt}: {e}")
-                if attempt < self.max_retries:
-                    time.sleep(self.retry_delay)
-                else:
-                    return {"status": "failure", "error": str(e)}
-        return {"status": "failure", "error": "All attempts failed"}
+        # Retries with exponential backoff and jitter happen inside the session's adapter;
+        # the Idempotency-Key header makes a retried POST safe if the first one landed
+        try:
+            logger.info(
+                f"Creating ACH payment of {amount} to account "
+                f"{account_number} with routing "
+                f"{routing_number}"
+            )
+            response = self._send(
+                "POST", self.api_url, "create_payment", json=payload, headers=headers
+            )
+            payment_response: Dict[str, Any] = response.json()
+            logger.info(f"ACH payment created successfully: {payment_response}")
+            if ledger is not None:
+                ledger.put(idempotency_key, payment_response)
+            return payment_response
+        except ResilienceError as e:
+            logger.warning(f"ACH payment rejected client-side: {e}")
+            return {"status": "failure", "error": str(e)}
+        except requests.RequestException as e:
+            logger.error(f"Error creating ACH payment: {e}")
+            return {"status": "failure", "error": str(e)}
+        except Exception as e:
+            logger.error(f"Unexpected error creating ACH payment: {e}")
+            return {"status": "failure", "error": str(e)}
 
     def get_payment_status(self, transaction_id: str) -> Optional[Dict[str, Any]]:
         """
@@ -97,15 +293,15 @@ class ACHPayments:
         }
         try:
             logger.info(f"Retrieving status for transaction {transaction_id}")
-            response = requests.get(
-                status_url, headers=headers, timeout=10
-            )
-            response.raise_for_status()
+            response = self._send("GET", status_url, "get_payment_status", headers=headers)
             status_response: Dict[str, Any] = response.json()
             logger.info(
                 f"Payment status retrieved: {status_response}"
             )
             return status_response
+        except ResilienceError as e:
+            logger.warning(f"Payment status request rejected client-side: {e}")
+            return {"status": "failure", "error": str(e)}
         except requests.RequestException as e:
             logger.error(f"Error retrieving payment status: {e}")
             return {"status": "failure", "error": str(e)}
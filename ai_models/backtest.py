@@ -0,0 +1,293 @@
+"""
+Backtest Module
+
+Walk-forward evaluation of TrendPredictor and the Q-learning policy on
+MarketTrendAnalysis data. History is cut into consecutive test folds. Each
+fold's model is trained only on bars before the fold (an expanding window, or
+a rolling one of fixed length), so no future data leaks into a prediction.
+The out-of-sample positions of all folds are then scored in one vectorized
+pass: P&L, equity, drawdown, hit rate and Sharpe ratio. Folds, and tickers of
+a universe, are trained in parallel worker processes that read the feature
+arrays from shared memory.
+"""
+
+import logging
+from concurrent.futures import as_completed
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+import torch
+
+from ai_models.market_trend_analysis import fit_trend_predictor, predict_proba
+from ai_models.parallel_training import shared_feature_pool, worker_arrays
+from ai_models.q_learning import (
+    ACTION_POSITIONS,
+    QLearningEngine,
+    position_rewards,
+    quantile_edges,
+    quantile_states,
+)
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+TICKER = "Ticker"
+TRADING_DAYS = 252
+DEFAULT_INITIAL_TRAIN = 126  # about six months of daily bars
+DEFAULT_TEST_SIZE = 21  # about one month
+
+
+class Fold(NamedTuple):
+    """Row ranges [start, stop) of one walk-forward step."""
+
+    train_start: int
+    train_stop: int
+    test_start: int
+    test_stop: int
+
+
+class BacktestResult(NamedTuple):
+    """Out-of-sample positions with their P&L, equity and drawdown curves and summary metrics."""
+
+    positions: pd.Series
+    pnl: pd.Series
+    equity: pd.Series
+    drawdown: pd.Series
+    metrics: Dict[str, float]
+
+
+def walk_forward_folds(
+    length: int,
+    initial_train: int = DEFAULT_INITIAL_TRAIN,
+    test_size: int = DEFAULT_TEST_SIZE,
+    window: Optional[int] = None,
+) -> List[Fold]:
+    """
+    Consecutive test folds covering rows ``initial_train`` to ``length``.
+
+    Args:
+        length (int): Number of rows.
+        initial_train (int): Rows before the first test fold.
+        test_size (int): Rows per test fold.
+        window (Optional[int]): Train on at most this many rows before each
+            fold (rolling window); None trains on all of them (expanding window).
+
+    Returns:
+        List[Fold]: Folds in time order.
+    """
+    if initial_train < 1 or test_size < 1:
+        raise ValueError("initial_train and test_size must be positive")
+    folds = []
+    test_start = initial_train
+    while test_start < length:
+        test_stop = min(test_start + test_size, length)
+        train_start = 0 if window is None else max(0, test_start - window)
+        folds.append(Fold(train_start, test_start, test_start, test_stop))
+        test_start = test_stop
+    return folds
+
+
+def evaluate_positions(
+    positions: Sequence[float],
+    next_returns: Sequence[float],
+    index: Optional[pd.Index] = None,
+    cost: float = 0.0,
+    periods_per_year: int = TRADING_DAYS,
+) -> BacktestResult:
+    """
+    Score positions held over the following bar.
+
+    Args:
+        positions (Sequence[float]): Position taken at each bar (1 long, -1 short, 0 flat).
+        next_returns (Sequence[float]): Return of the bar after each one (NaN counts as 0).
+        index (Optional[pd.Index]): Index of the result series.
+        cost (float): Cost per unit of position change, as a fraction of equity.
+        periods_per_year (int): Bars per year for annualization.
+
+    Returns:
+        BacktestResult: P&L, equity and drawdown curves; total and annualized
+        return, volatility, Sharpe ratio, max drawdown, hit rate (share of
+        non-flat bars that made money), exposure and number of trades.
+    """
+    positions = np.asarray(positions, dtype=np.float64)
+    returns = np.nan_to_num(np.asarray(next_returns, dtype=np.float64))
+    turnover = np.abs(np.diff(positions, prepend=0.0))
+    pnl = positions * returns - cost * turnover
+    equity = np.cumprod(1.0 + pnl)
+    drawdown = equity / np.maximum.accumulate(equity) - 1.0 if len(equity) else equity
+    active = positions != 0
+    bars = len(pnl)
+    volatility = float(pnl.std(ddof=1) * np.sqrt(periods_per_year)) if bars > 1 else 0.0
+    total_return = float(equity[-1] - 1.0) if bars else 0.0
+    metrics = {
+        "total_return": total_return,
+        "annualized_return": float((1.0 + total_return) ** (periods_per_year / bars) - 1.0) if bars else 0.0,
+        "volatility": volatility,
+        "sharpe": float(pnl.mean() * periods_per_year / volatility) if volatility > 0 else 0.0,
+        "max_drawdown": float(drawdown.min()) if bars else 0.0,
+        "hit_rate": float((pnl[active] > 0).mean()) if active.any() else 0.0,
+        "exposure": float(active.mean()) if bars else 0.0,
+        "trades": int(np.count_nonzero(turnover)),
+        "bars": bars,
+    }
+    if index is None:
+        index = pd.RangeIndex(bars)
+    return BacktestResult(
+        pd.Series(positions, index=index, name="position"),
+        pd.Series(pnl, index=index, name="pnl"),
+        pd.Series(equity, index=index, name="equity"),
+        pd.Series(drawdown, index=index, name="drawdown"),
+        metrics,
+    )
+
+
+def _fit_predict_fold(key, fold: Fold, options: Dict[str, Any]):
+    features, targets = worker_arrays()
+    result = fit_trend_predictor(
+        features[fold.train_start:fold.train_stop],
+        targets[fold.train_start:fold.train_stop],
+        device=torch.device("cpu"),
+        **options,
+    )
+    return key, fold, predict_proba(result.model, features[fold.test_start:fold.test_stop])
+
+
+def _to_positions(probabilities: np.ndarray, threshold: float, long_short: bool) -> np.ndarray:
+    up = probabilities >= threshold
+    return np.where(up, 1.0, -1.0 if long_short else 0.0)
+
+
+def _ticker_ranges(features: pd.DataFrame) -> Dict[str, range]:
+    if isinstance(features.index, pd.MultiIndex):
+        tickers = features.index.get_level_values(TICKER).to_numpy()
+        names, starts, counts = np.unique(tickers, return_index=True, return_counts=True)
+        return {str(n): range(int(s), int(s + c)) for n, s, c in zip(names, starts, counts)}
+    return {"": range(len(features))}
+
+
+def backtest_universe(
+    features: pd.DataFrame,
+    initial_train: int = DEFAULT_INITIAL_TRAIN,
+    test_size: int = DEFAULT_TEST_SIZE,
+    window: Optional[int] = None,
+    threshold: float = 0.5,
+    long_short: bool = False,
+    cost: float = 0.0,
+    epochs: int = 30,
+    batch_size: int = 256,
+    learning_rate: float = 0.001,
+    patience: Optional[int] = 5,
+    max_workers: Optional[int] = None,
+    mp_context: str = "forkserver",
+    seed: Optional[int] = None,
+) -> Dict[str, BacktestResult]:
+    """
+    Walk-forward backtest of TrendPredictor for every ticker of a feature frame.
+
+    Every (ticker, fold) pair is an independent job on one process pool.
+
+    Args:
+        features (pd.DataFrame): Long (Ticker, Date) frame from MarketUniverse,
+            or a single ticker's MarketTrendAnalysis.data.
+        initial_train, test_size, window: See walk_forward_folds().
+        threshold (float): Up-probability at or above which the position is long.
+        long_short (bool): Go short below the threshold instead of flat.
+        cost (float): Cost per unit of position change.
+        epochs, batch_size, learning_rate, patience: Passed to fit_trend_predictor.
+        max_workers (Optional[int]): Worker processes (default: one per core).
+        mp_context (str): Start method; see shared_feature_pool().
+        seed (Optional[int]): Base seed for model initialization and shuffling.
+
+    Returns:
+        Dict[str, BacktestResult]: Results by ticker ("" for a single-ticker frame).
+    """
+    features = features.sort_index()
+    ranges = _ticker_ranges(features)
+    options = {"epochs": epochs, "batch_size": batch_size,
+               "learning_rate": learning_rate, "patience": patience}
+    jobs = []
+    for ticker, rows in ranges.items():
+        for i, fold in enumerate(walk_forward_folds(len(rows), initial_train, test_size, window)):
+            absolute = Fold(*(rows.start + bound for bound in fold))
+            jobs.append((ticker, absolute, dict(options, seed=None if seed is None else seed + i)))
+    probabilities = {ticker: np.full(len(rows), np.nan) for ticker, rows in ranges.items()}
+    if jobs:
+        with shared_feature_pool(features, max_workers=max_workers, mp_context=mp_context) as executor:
+            futures = [executor.submit(_fit_predict_fold, *job) for job in jobs]
+            for future in as_completed(futures):
+                ticker, fold, scores = future.result()
+                start = ranges[ticker].start
+                probabilities[ticker][fold.test_start - start:fold.test_stop - start] = scores
+
+    next_returns = features["Return"].groupby(level=TICKER).shift(-1) \
+        if isinstance(features.index, pd.MultiIndex) else features["Return"].shift(-1)
+    results = {}
+    for ticker, rows in ranges.items():
+        tested = slice(rows.start + initial_train, rows.stop)
+        frame_index = features.index[tested]
+        if isinstance(frame_index, pd.MultiIndex):
+            frame_index = frame_index.droplevel(TICKER)
+        results[ticker] = evaluate_positions(
+            _to_positions(probabilities[ticker][initial_train:], threshold, long_short),
+            next_returns.to_numpy()[tested],
+            index=frame_index,
+            cost=cost,
+        )
+    return results
+
+
+def backtest_trend_model(data: pd.DataFrame, **kwargs) -> BacktestResult:
+    """Walk-forward backtest of TrendPredictor on one ticker's engineered data; see backtest_universe()."""
+    return backtest_universe(data, **kwargs)[""]
+
+
+def backtest_q_policy(
+    data: pd.DataFrame,
+    initial_train: int = DEFAULT_INITIAL_TRAIN,
+    test_size: int = DEFAULT_TEST_SIZE,
+    window: Optional[int] = None,
+    state_feature: str = "Momentum",
+    n_states: int = 10,
+    episodes: int = 100,
+    alpha: float = 0.1,
+    gamma: float = 0.9,
+    epsilon: float = 0.1,
+    cost: float = 0.0,
+    seed: Optional[int] = None,
+) -> BacktestResult:
+    """
+    Walk-forward backtest of a Q-learning policy on one ticker's engineered data.
+
+    Each fold learns a policy on its training bars, with states from quantiles
+    of ``state_feature`` (bin edges fitted on the training bars only) and P&L
+    rewards. The policy's sell/buy/hold actions on the test bars become
+    positions. The Q-learning engine is vectorized, so folds run in-process.
+
+    Returns:
+        BacktestResult: Out-of-sample performance of the learned policies.
+    """
+    values = data[state_feature].to_numpy(dtype=np.float64)
+    returns = data["Return"].to_numpy(dtype=np.float64)
+    actions = np.asarray(ACTION_POSITIONS)
+    engine = QLearningEngine(alpha=alpha, gamma=gamma, epsilon=epsilon, seed=seed)
+    positions = np.zeros(max(len(data) - initial_train, 0))
+    for fold in walk_forward_folds(len(data), initial_train, test_size, window):
+        train = slice(fold.train_start, fold.train_stop)
+        edges = quantile_edges(values[train], n_states)
+        result = engine.train(
+            quantile_states(values[train], n_states, edges),
+            position_rewards(returns[train]),
+            episodes=episodes,
+            n_states=n_states,
+        )
+        test_states = quantile_states(values[fold.test_start:fold.test_stop], n_states, edges)
+        positions[fold.test_start - initial_train:fold.test_stop - initial_train] = \
+            actions[result.policy()[test_states]]
+    next_returns = data["Return"].shift(-1).to_numpy()[initial_train:]
+    return evaluate_positions(positions, next_returns, index=data.index[initial_train:], cost=cost)
+
+
+def summarize(results: Dict[str, BacktestResult]) -> pd.DataFrame:
+    """Metrics of several backtests as one frame, one row per ticker."""
+    return pd.DataFrame({ticker: result.metrics for ticker, result in results.items()}).T
@@ -0,0 +1,253 @@
+"""
+Market Data Store Module
+
+Local OHLCV store for MarketTrendAnalysis. Bars are kept in one Parquet (or
+Feather) file per ticker and interval. A refresh downloads only the bars since
+the last stored timestamp instead of the whole period, and files are
+memory-mapped on load. In offline mode data is served from the store alone.
+"""
+
+import logging
+import os
+import re
+import tempfile
+import time
+from typing import Callable, Dict, Optional
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - exercised only without pyarrow
+    pa = None
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+DEFAULT_DIRECTORY = "market_data"
+# Location of default_store: MARKET_DATA_DIR, else market_data/ at the repository
+# root, so the cache does not move with the directory a process is launched from
+SHARED_DIRECTORY = os.path.abspath(
+    os.getenv("MARKET_DATA_DIR")
+    or os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), DEFAULT_DIRECTORY)
+)
+PARQUET = "parquet"
+FEATHER = "feather"
+FILE_FORMATS = (PARQUET, FEATHER)
+MAX_REFRESH_SECONDS = 3600  # re-check daily and slower bars at most hourly
+
+INTERVAL_SECONDS: Dict[str, int] = {
+    "1m": 60, "2m": 120, "5m": 300, "15m": 900, "30m": 1800,
+    "60m": 3600, "90m": 5400, "1h": 3600,
+    "1d": 86400, "5d": 5 * 86400, "1wk": 7 * 86400,
+    "1mo": 30 * 86400, "3mo": 90 * 86400,
+}
+
+_PERIOD_PATTERN = re.compile(r"^(\d+)(d|wk|mo|y)$")
+_PERIOD_UNITS = {"d": "days", "wk": "weeks", "mo": "months", "y": "years"}
+
+Fetcher = Callable[..., pd.DataFrame]
+
+
+def period_start(period: str, end: pd.Timestamp) -> Optional[pd.Timestamp]:
+    """
+    First timestamp covered by a yfinance-style period ending at ``end``.
+
+    Args:
+        period (str): e.g. "5d", "1mo", "1y", "ytd" or "max".
+        end (pd.Timestamp): End of the period.
+
+    Returns:
+        pd.Timestamp or None: Start of the period, or None for "max".
+    """
+    if period == "max":
+        return None
+    if period == "ytd":
+        return pd.Timestamp(year=end.year, month=1, day=1, tz=end.tz)
+    match = _PERIOD_PATTERN.match(period)
+    if match is None:
+        raise ValueError(f"Unsupported period: {period}")
+    return end - pd.DateOffset(**{_PERIOD_UNITS[match.group(2)]: int(match.group(1))})
+
+
+def _flatten_columns(frame: pd.DataFrame) -> pd.DataFrame:
+    # Single-ticker yfinance downloads may carry a (Price, Ticker) column index
+    if isinstance(frame.columns, pd.MultiIndex):
+        frame = frame.copy()
+        frame.columns = frame.columns.get_level_values(0)
+    return frame
+
+
+def yfinance_fetch(ticker: str, interval: str, start=None, period: Optional[str] = None) -> pd.DataFrame:
+    """Download bars from Yahoo Finance, from ``start`` if given, else for ``period``."""
+    import yfinance as yf  # pylint: disable=import-outside-toplevel
+
+    kwargs = {"start": start} if start is not None else {"period": period}
+    return yf.download(
+        ticker,
+        interval=interval,
+        auto_adjust=False,
+        progress=False,
+        multi_level_index=False,
+        **kwargs,
+    )
+
+
+class MarketDataStore:
+    """
+    Per-ticker, per-interval OHLCV files with incremental refresh.
+
+    Usage example:
+        >>> store = MarketDataStore("market_data")
+        >>> data = store.get("NVDA", period="1y", interval="1d")
+        >>> offline = MarketDataStore("market_data", offline=True).get("NVDA")
+    """
+
+    def __init__(
+        self,
+        directory: str = DEFAULT_DIRECTORY,
+        file_format: str = PARQUET,
+        offline: bool = False,
+        fetch: Optional[Fetcher] = None,
+        refresh_seconds: Optional[float] = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        """
+        Args:
+            directory (str): Directory holding the store's files.
+            file_format (str): "parquet" (compressed) or "feather" (uncompressed,
+                so loads are zero-copy memory maps).
+            offline (bool): Never download; serve only what is stored.
+            fetch (Optional[Callable]): Downloader called as
+                ``fetch(ticker, interval, start=..., period=...)``; defaults to yfinance.
+            refresh_seconds (Optional[float]): Skip downloading when the stored
+                file is younger than this; defaults to the bar interval, capped
+                at an hour.
+            clock (Callable[[], float]): Wall-clock time source.
+        """
+        if pa is None:
+            raise ImportError("pyarrow is required for MarketDataStore")
+        if file_format not in FILE_FORMATS:
+            raise ValueError(f"file_format must be one of {FILE_FORMATS}")
+        self.directory = directory
+        self.file_format = file_format
+        self.offline = offline
+        self.fetch = fetch or yfinance_fetch
+        self.refresh_seconds = refresh_seconds
+        self._clock = clock
+        self.downloads = 0
+        self.bars_downloaded = 0
+
+    def path(self, ticker: str, interval: str) -> str:
+        """File holding the bars of ``ticker`` at ``interval``."""
+        safe_ticker = re.sub(r"[^A-Za-z0-9._-]", "_", ticker)
+        return os.path.join(self.directory, f"{safe_ticker}-{interval}.{self.file_format}")
+
+    def load(self, ticker: str, interval: str = "1d") -> Optional[pd.DataFrame]:
+        """Load every stored bar of a ticker (memory-mapped), or None if nothing is stored."""
+        path = self.path(ticker, interval)
+        if not os.path.exists(path):
+            return None
+        if self.file_format == FEATHER:
+            table = feather.read_table(path, memory_map=True)
+        else:
+            table = pq.read_table(path, memory_map=True)
+        return table.to_pandas()
+
+    def save(self, ticker: str, interval: str, data: pd.DataFrame) -> None:
+        """Replace the stored bars of a ticker atomically."""
+        os.makedirs(self.directory, exist_ok=True)
+        path = self.path(ticker, interval)
+        table = pa.Table.from_pandas(data, preserve_index=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        os.close(fd)
+        try:
+            if self.file_format == FEATHER:
+                feather.write_feather(table, tmp_path, compression="uncompressed")
+            else:
+                pq.write_table(table, tmp_path)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def _is_fresh(self, ticker: str, interval: str) -> bool:
+        refresh = self.refresh_seconds
+        if refresh is None:
+            refresh = min(INTERVAL_SECONDS.get(interval, MAX_REFRESH_SECONDS), MAX_REFRESH_SECONDS)
+        try:
+            age = self._clock() - os.path.getmtime(self.path(ticker, interval))
+        except OSError:
+            return False
+        return age < refresh
+
+    def refresh(self, ticker: str, interval: str = "1d", period: str = "1y") -> Optional[pd.DataFrame]:
+        """
+        Bring the stored bars up to date and return all of them.
+
+        Only bars from the last stored timestamp onwards are downloaded; that last
+        bar is fetched again because it may have been incomplete. Nothing is
+        downloaded in offline mode or while the file is fresh. A failed download
+        falls back to the stored bars and re-raises only if there are none.
+
+        Args:
+            ticker (str): Ticker symbol.
+            interval (str): Bar interval, e.g. "1d" or "5m".
+            period (str): History to download when nothing is stored yet.
+
+        Returns:
+            pd.DataFrame or None: Every stored bar, or None if there are none.
+        """
+        stored = self.load(ticker, interval)
+        if self.offline or (stored is not None and not stored.empty and self._is_fresh(ticker, interval)):
+            return stored
+        try:
+            if stored is None or stored.empty:
+                new = self.fetch(ticker, interval, period=period)
+            else:
+                new = self.fetch(ticker, interval, start=stored.index[-1])
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            if stored is None:
+                raise
+            logger.warning("Refreshing %s %s bars failed, serving stored data: %s", ticker, interval, e)
+            return stored
+        self.downloads += 1
+        if new is None or new.empty:
+            if stored is not None:
+                # Nothing new; touch the file so the next call within the window skips the network
+                os.utime(self.path(ticker, interval))
+            return stored
+        new = _flatten_columns(new).dropna()
+        self.bars_downloaded += len(new)
+        if stored is None or stored.empty:
+            merged = new
+        else:
+            merged = pd.concat([stored, new])
+            merged = merged[~merged.index.duplicated(keep="last")]
+        merged = merged.sort_index()
+        self.save(ticker, interval, merged)
+        return merged
+
+    def get(self, ticker: str, period: str = "1y", interval: str = "1d") -> pd.DataFrame:
+        """
+        Return the bars of the last ``period``, refreshing the store first.
+
+        Returns:
+            pd.DataFrame: Bars within the period (empty if none are available).
+        """
+        data = self.refresh(ticker, interval=interval, period=period)
+        if data is None or data.empty:
+            return pd.DataFrame()
+        start = period_start(period, data.index[-1])
+        if start is not None:
+            data = data[data.index >= start]
+        return data
+
+
+# Shared by allocation calls in this process; MARKET_DATA_OFFLINE=1 serves stored bars only
+default_store = (
+    MarketDataStore(SHARED_DIRECTORY, offline=os.getenv("MARKET_DATA_OFFLINE") == "1")
+    if pa is not None else None
+)
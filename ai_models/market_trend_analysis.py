@@ -8,6 +8,8 @@ and reinforcement learning for stock prediction and portfolio optimization.
 import os
 import sys
 import time
+import warnings
+from typing import List, NamedTuple
 
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 
@@ -21,9 +23,13 @@ from sklearn.model_selection import train_test_split
 from torch.utils.data import DataLoader, TensorDataset
 import yfinance as yf
 
+from ai_models.q_learning import train_on_data as train_q_learning
 from nvidia_integration import nvidia_integration
 
 ADJ_CLOSE = "Adj Close"
+FEATURE_COLUMNS = ["Return", "Volatility", "Momentum"]
+PREDICT_BATCH_SIZE = 65536  # rows per forward pass when scoring
+FAST_BATCH_SIZE = 256
 
 
 class TrendPredictor(nn.Module):
@@ -48,25 +54,253 @@ class TrendPredictor(nn.Module):
         return x
 
 
+def _as_feature_array(features):
+    if isinstance(features, pd.DataFrame):
+        features = features[FEATURE_COLUMNS].to_numpy(dtype=np.float32)
+    if isinstance(features, torch.Tensor):
+        return features.float()
+    array = np.asarray(features, dtype=np.float32)
+    if array.ndim == 1:
+        array = array[None, :]
+    return torch.from_numpy(np.ascontiguousarray(array))
+
+
+def predict_proba(model, features, batch_size=PREDICT_BATCH_SIZE, device=None):
+    """
+    Probability of an up move for each row of features.
+
+    Runs the model in eval mode under torch.inference_mode, in batches of
+    ``batch_size`` rows.
+
+    Args:
+        model (nn.Module): Trained TrendPredictor (or a traced graph of one).
+        features: DataFrame with the feature columns, or an array/tensor of shape (N, 3).
+        batch_size (int): Rows per forward pass.
+        device (torch.device, optional): Device to run on (default: the model's).
+
+    Returns:
+        np.ndarray: float32 probabilities of shape (N,).
+    """
+    x = _as_feature_array(features)
+    if isinstance(model, nn.Module) and not isinstance(model, torch.jit.ScriptModule):
+        model.eval()
+        if device is None:
+            device = next(model.parameters()).device
+    if device is not None:
+        x = x.to(device)
+    outputs = []
+    with torch.inference_mode():
+        for start in range(0, len(x), batch_size):
+            logits = model(x[start:start + batch_size])
+            outputs.append(torch.softmax(logits, dim=1)[:, 1].cpu())
+    if not outputs:
+        return np.empty(0, dtype=np.float32)
+    return torch.cat(outputs).numpy()
+
+
+def export_inference_graph(model, path=None):
+    """
+    Trace a model into a frozen, inference-optimized TorchScript graph on CPU.
+
+    Args:
+        model (TrendPredictor): Trained model; it is not modified.
+        path (str, optional): Where to save the graph with torch.jit.save.
+
+    Returns:
+        torch.jit.ScriptModule: The CPU graph.
+    """
+    cpu_model = TrendPredictor(
+        input_size=model.fc1.in_features,
+        hidden_size=model.fc1.out_features,
+        output_size=model.fc3.out_features,
+    )
+    cpu_model.load_state_dict({key: value.cpu() for key, value in model.state_dict().items()})
+    cpu_model.eval()
+    with warnings.catch_warnings(), torch.inference_mode(False):
+        # TorchScript is deprecated in favour of torch.export but still the
+        # simplest CPU graph that can be saved and reloaded without Python code
+        warnings.simplefilter("ignore", FutureWarning)
+        graph = torch.jit.trace(cpu_model, torch.zeros(1, cpu_model.fc1.in_features))
+        graph = torch.jit.optimize_for_inference(torch.jit.freeze(graph))
+        if path is not None:
+            torch.jit.save(graph, path)
+    return graph
+
+
+class TrainingResult(NamedTuple):
+    """Outcome of fit_trend_predictor."""
+
+    model: TrendPredictor
+    epoch_seconds: List[float]
+    train_losses: List[float]
+    validation_losses: List[float]
+    best_epoch: int
+    stopped_early: bool
+
+
+def fit_trend_predictor(
+    features,
+    targets,
+    epochs=50,
+    batch_size=FAST_BATCH_SIZE,
+    learning_rate=0.001,
+    weight_decay=1e-4,
+    hidden_size=64,
+    validation_fraction=0.2,
+    patience=None,
+    compile_model=False,
+    device=None,
+    seed=None,
+) -> TrainingResult:
+    """
+    Train a TrendPredictor with tensors resident on the device.
+
+    Instead of a DataLoader, every epoch draws a random permutation on the
+    device and slices minibatches from it by index, so there is no per-batch
+    collation or host-to-device copy. The last ``validation_fraction`` of the
+    rows (chronologically, so no future bars leak into training) is held out.
+    With ``patience`` set, training stops once the validation loss has not
+    improved for that many epochs, and the best weights are restored.
+
+    Args:
+        features: Array or tensor of shape (N, 3).
+        targets: Array or tensor of N class labels.
+        epochs (int): Maximum number of epochs.
+        batch_size (int): Rows per minibatch.
+        learning_rate (float): Adam learning rate.
+        weight_decay (float): Adam weight decay.
+        hidden_size (int): Width of the hidden layers.
+        validation_fraction (float): Share of the latest rows held out.
+        patience (Optional[int]): Epochs without improvement before stopping.
+        compile_model (bool): Run training steps through torch.compile. Ragged
+            final batches are then dropped so shapes stay static.
+        device (torch.device, optional): Device to train on (default: the NVIDIA integration's).
+        seed (Optional[int]): Seed for weights and shuffling.
+
+    Returns:
+        TrainingResult: Trained model (eval mode), per-epoch wall times and losses.
+    """
+    if device is None:
+        device = nvidia_integration.device
+    generator = None
+    if seed is not None:
+        torch.manual_seed(seed)
+        generator = torch.Generator(device=device).manual_seed(seed)
+    x = torch.from_numpy(np.array(features, dtype=np.float32)).to(device)
+    y = torch.from_numpy(np.array(targets, dtype=np.int64)).to(device)
+
+    n_validation = int(len(x) * validation_fraction) if len(x) >= 10 else 0
+    n_train = len(x) - n_validation
+    x_train, y_train = x[:n_train], y[:n_train]
+    x_validation, y_validation = x[n_train:], y[n_train:]
+
+    model = TrendPredictor(input_size=x.shape[1], hidden_size=hidden_size).to(device)
+    criterion = nn.CrossEntropyLoss()
+    optimizer = optim.Adam(model.parameters(), lr=learning_rate, weight_decay=weight_decay)
+    forward = model
+    if compile_model:
+        try:
+            forward = torch.compile(model, dynamic=False)
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            print(f"torch.compile unavailable, training eagerly: {e}")
+    # torch.compile is lazy: a missing compiler or backend only fails on the first call
+    compile_pending = forward is not model
+    drop_ragged = compile_model and n_train > batch_size
+
+    def train_step(network, index):
+        optimizer.zero_grad(set_to_none=True)
+        loss = criterion(network(x_train[index]), y_train[index])
+        loss.backward()
+        optimizer.step()
+        return loss
+
+    epoch_seconds, train_losses, validation_losses = [], [], []
+    best_loss, best_epoch, best_state = float("inf"), -1, None
+    stopped_early = False
+    for epoch in range(epochs):
+        start = time.perf_counter()
+        model.train()
+        order = torch.randperm(n_train, device=device, generator=generator)
+        stop = n_train - n_train % batch_size if drop_ragged else n_train
+        total_loss = torch.zeros((), device=device)
+        for begin in range(0, stop, batch_size):
+            index = order[begin:begin + batch_size]
+            if compile_pending:
+                compile_pending = False
+                try:
+                    loss = train_step(forward, index)
+                except Exception as e:  # pylint: disable=broad-exception-caught
+                    print(f"torch.compile failed, training eagerly: {e}")
+                    forward = model
+                    loss = train_step(forward, index)
+            else:
+                loss = train_step(forward, index)
+            total_loss += loss.detach() * len(index)
+        train_losses.append(float(total_loss) / max(stop, 1))
+
+        if n_validation:
+            model.eval()
+            with torch.inference_mode():
+                validation_loss = float(criterion(model(x_validation), y_validation))
+            validation_losses.append(validation_loss)
+            if validation_loss < best_loss:
+                best_loss, best_epoch = validation_loss, epoch
+                if patience is not None:
+                    best_state = {k: v.detach().clone() for k, v in model.state_dict().items()}
+            elif patience is not None and epoch - best_epoch >= patience:
+                epoch_seconds.append(time.perf_counter() - start)
+                stopped_early = True
+                break
+        epoch_seconds.append(time.perf_counter() - start)
+
+    if best_state is not None:
+        model.load_state_dict(best_state)
+    if best_epoch < 0:
+        best_epoch = len(epoch_seconds) - 1
+    model.eval()
+    return TrainingResult(model, epoch_seconds, train_losses, validation_losses, best_epoch, stopped_early)
+
+
 class MarketTrendAnalysis:
     """Class for market trend analysis using AI models."""
 
-    def __init__(self, ticker="GLD"):
-        """Initialize with stock ticker."""
+    def __init__(self, ticker="GLD", data_store=None, registry=None):
+        """
+        Initialize with stock ticker.
+
+        Args:
+            ticker (str): Stock ticker symbol.
+            data_store (MarketDataStore, optional): Local bar store; when set,
+                download_data fetches only bars missing from it.
+            registry (ModelRegistry, optional): Trained model cache used by
+                load_or_train_model.
+        """
         self.ticker = ticker
+        self.data_store = data_store
+        self.registry = registry
         self.model = None
         self.data = None
+        self.q_table = None
+        self._inference_graph = None  # (model it was exported from, graph)
+        self.training_result = None
+
+    def _fetch(self, period, interval):
+        if self.data_store is not None:
+            return self.data_store.get(self.ticker, period=period, interval=interval)
+        return yf.download(
+            self.ticker,
+            period=period,
+            interval=interval,
+            auto_adjust=False,
+        )
 
     def download_data(self, period='1y', interval='1d', max_retries=3, retry_delay=10):
         """Download stock data with retries and fallback."""
+        if self.data_store is not None and self.data_store.offline:
+            max_retries = 1  # retrying cannot fill an offline store
         for attempt in range(max_retries):
             try:
-                data = yf.download(
-                    self.ticker,
-                    period=period,
-                    interval=interval,
-                    auto_adjust=False,
-                )
+                data = self._fetch(period, interval)
                 if data.empty:
                     raise ValueError("Downloaded data is empty")
                 data.dropna(inplace=True)
@@ -81,7 +315,7 @@ class MarketTrendAnalysis:
                 else:
                     print("Max retries reached. Using fallback sample data.")
                     # Create fallback sample data
-                    dates = pd.date_range(end=pd.Timestamp.today(), periods=252)
+                    dates = pd.date_range(end=pd.Timestamp.today().normalize(), periods=252)
                     rng = np.random.default_rng(seed=42)
                     sample_data = pd.DataFrame(
                         {
@@ -115,7 +349,7 @@ class MarketTrendAnalysis:
         """Train the trend prediction model using GPU acceleration."""
         if self.data is None:
             raise ValueError("Data not prepared. Call feature_engineering() first.")
-        feature_columns = ["Return", "Volatility", "Momentum"]
+        feature_columns = FEATURE_COLUMNS
         features_data = self.data[feature_columns].values.astype(np.float32)
         targets = self.data["Target"].values.astype(np.int64)
 
@@ -139,8 +373,10 @@ class MarketTrendAnalysis:
             self.model = model
             return model
 
+        # Hold out the latest bars; a shuffled split would train on the future.
+        # ai_models.backtest gives a full walk-forward evaluation.
         train_features, test_features, train_targets, test_targets = train_test_split(
-            features_data, targets, test_size=0.2, random_state=42
+            features_data, targets, test_size=0.2, shuffle=False
         )
 
         # Convert to tensors
@@ -174,39 +410,121 @@ class MarketTrendAnalysis:
         self.model = model
         return model
             
-    def reinforce_learning_placeholder(self, episodes=100, alpha=0.1, gamma=0.9):
+    def train_model_fast(self, epochs=50, batch_size=FAST_BATCH_SIZE, learning_rate=0.001,
+                         validation_fraction=0.2, patience=10, compile_model=False, seed=None):
         """
-        Basic Q-learning for portfolio optimization (placeholder).
-        States: simplified market conditions, actions: buy/sell/hold.
+        Train with the tensor-resident loop in fit_trend_predictor. train_model
+        stays the reference implementation.
+
+        Returns:
+            TrendPredictor: Trained model; timings and losses are kept in
+            ``self.training_result``.
         """
         if self.data is None:
             raise ValueError("Data not prepared. Call feature_engineering() first.")
+        nvidia_integration.log_project_status("Market Trend Training")
+        result = fit_trend_predictor(
+            self.data[FEATURE_COLUMNS].to_numpy(dtype=np.float32),
+            self.data["Target"].to_numpy(dtype=np.int64),
+            epochs=epochs,
+            batch_size=batch_size,
+            learning_rate=learning_rate,
+            validation_fraction=validation_fraction,
+            patience=patience,
+            compile_model=compile_model,
+            seed=seed,
+        )
+        self.training_result = result
+        self.model = result.model
+        epoch_ms = 1000 * sum(result.epoch_seconds) / max(len(result.epoch_seconds), 1)
+        print(
+            f"Trained {len(result.epoch_seconds)} epochs ({epoch_ms:.1f} ms/epoch), "
+            f"best epoch {result.best_epoch + 1}"
+            + (", stopped early" if result.stopped_early else "")
+        )
+        return self.model
 
-        device = nvidia_integration.device
-        nvidia_integration.log_project_status("RL Training")
+    def load_or_train_model(self, epochs=50, batch_size=32, learning_rate=0.001):
+        """
+        Load a warm model for the current data from the registry, training
+        (and registering) one only when the data or hyperparameters changed
+        or the stored model expired.
+        """
+        if self.data is None:
+            raise ValueError("Data not prepared. Call feature_engineering() first.")
+        if self.registry is None:
+            return self.train_model(epochs=epochs, batch_size=batch_size, learning_rate=learning_rate)
+        hyperparameters = {"epochs": epochs, "batch_size": batch_size, "learning_rate": learning_rate}
+        model = self.registry.get_or_train(
+            self.ticker,
+            self.data,
+            hyperparameters,
+            lambda: self.train_model(epochs=epochs, batch_size=batch_size, learning_rate=learning_rate),
+        )
+        self.model = model.to(nvidia_integration.device)
+        return self.model
 
-        # Simplified Q-table as tensor
-        q_table = torch.zeros((10, 3), dtype=torch.float32).to(device)  # 10 states, 3 actions
+    def predict(self, features, batch_size=PREDICT_BATCH_SIZE, use_graph=False):
+        """
+        Score feature rows with the trained model.
 
-        for _ in range(episodes):
-            state = 0  # Start state
-            for i in range(len(self.data) - 1):
-                # Choose action (epsilon-greedy)
-                if torch.rand(1).item() < 0.1:
-                    action = torch.randint(0, 3, (1,)).item()
-                else:
-                    action = torch.argmax(q_table[state]).item()
+        Args:
+            features: DataFrame with Return, Volatility and Momentum columns, or
+                an array/tensor of shape (N, 3).
+            batch_size (int): Rows per forward pass.
+            use_graph (bool): Run an exported TorchScript CPU graph of the model
+                instead of the eager module.
 
-                # Simulate reward (simplified)
-                reward = 1 if self.data["Target"].iloc[i+1] == action % 2 else -1
+        Returns:
+            np.ndarray: Probability of an up move for each row.
+        """
+        if self.model is None:
+            raise ValueError("Model not trained. Call train_model() or load_or_train_model() first.")
+        if not use_graph:
+            return predict_proba(self.model, features, batch_size)
+        if self._inference_graph is None or self._inference_graph[0] is not self.model:
+            self._inference_graph = (self.model, export_inference_graph(self.model))
+        return predict_proba(self._inference_graph[1], features, batch_size, device=torch.device("cpu"))
+
+    def predict_latest(self, use_graph=False):
+        """
+        Probability of an up move after the most recent bar.
 
-                next_state = min(state + 1, 9)
-                q_table[state, action] += alpha * (
-                    reward + gamma * torch.max(q_table[next_state]) - q_table[state, action]
-                )
-                state = next_state
+        Returns:
+            float: Model score of the last feature row.
+        """
+        if self.data is None or self.data.empty:
+            raise ValueError("Data not prepared. Call feature_engineering() first.")
+        return float(self.predict(self.data[FEATURE_COLUMNS].iloc[-1:], use_graph=use_graph)[0])
 
-        print(f"RL training completed. Q-table shape: {q_table.shape}")
+    def reinforce_learning_placeholder(self, episodes=100, alpha=0.1, gamma=0.9, epsilon=0.1,
+                                       parallel=1, seed=None):
+        """
+        Basic Q-learning for portfolio optimization.
+        States: bars since episode start (capped at 9), actions: buy/sell/hold.
+
+        Runs on the NumPy engine in ai_models.q_learning. Episodes run
+        sequentially unless ``parallel`` opts in to averaged rounds of that
+        many episodes (see QLearningEngine).
+
+        Returns:
+            QLearningResult: Q-table, per-round mean rewards and timings.
+        """
+        if self.data is None:
+            raise ValueError("Data not prepared. Call feature_engineering() first.")
+
+        nvidia_integration.log_project_status("RL Training")
+
+        result = train_q_learning(
+            self.data, episodes=episodes, alpha=alpha, gamma=gamma, epsilon=epsilon,
+            parallel=parallel, seed=seed,
+        )
+        self.q_table = result.q_table
+        print(
+            f"RL training completed. Q-table shape: {result.q_table.shape}, "
+            f"{episodes} episodes in {result.total_seconds:.3f}s"
+        )
+        return result
 
 
 def main():
@@ -0,0 +1,214 @@
+"""
+Market Universe Module
+
+Multi-ticker counterpart of MarketTrendAnalysis. Many symbols are downloaded
+in one batched request into a long-format frame indexed by (Ticker, Date).
+Return, Volatility, Momentum and Target are then computed for every ticker at
+once with vectorized operations over the whole frame, instead of one
+feature_engineering pass per ticker. Per-ticker tensors are zero-copy slices
+of a single feature tensor.
+"""
+
+import logging
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import torch
+
+from ai_models.market_trend_analysis import ADJ_CLOSE, FEATURE_COLUMNS, predict_proba
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+TICKER = "Ticker"
+DATE = "Date"
+VOLATILITY_WINDOW = 5
+MOMENTUM_PERIOD = 5
+
+BatchFetcher = Callable[..., pd.DataFrame]
+
+
+def yfinance_fetch_many(tickers: List[str], period: str, interval: str) -> pd.DataFrame:
+    """Download many tickers from Yahoo Finance in one (internally threaded) request."""
+    import yfinance as yf  # pylint: disable=import-outside-toplevel
+
+    return yf.download(
+        tickers,
+        period=period,
+        interval=interval,
+        auto_adjust=False,
+        group_by="column",
+        progress=False,
+        threads=True,
+    )
+
+
+def to_long_format(wide: pd.DataFrame) -> pd.DataFrame:
+    """
+    Convert a yfinance multi-ticker frame with (Price, Ticker) columns to a long
+    frame indexed by (Ticker, Date). Rows of tickers that failed to download
+    (all NaN) are dropped.
+    """
+    if wide.empty:
+        return pd.DataFrame(index=pd.MultiIndex.from_arrays([[], []], names=[TICKER, DATE]))
+    long = wide.stack(level=1, future_stack=True)
+    long.index = long.index.set_names([DATE, TICKER])
+    long = long.swaplevel().sort_index()
+    long.columns.name = None
+    return long.dropna(subset=[ADJ_CLOSE])
+
+
+def compute_features(long: pd.DataFrame) -> pd.DataFrame:
+    """
+    Add Return, Volatility, Momentum and Target to a long (Ticker, Date) frame.
+
+    Each column is computed over the whole frame in one vectorized pass;
+    values whose window would reach into the previous ticker are masked.
+    Every ticker gets exactly what MarketTrendAnalysis.feature_engineering
+    produces for it alone.
+
+    Args:
+        long (pd.DataFrame): Bars sorted by (Ticker, Date) with an "Adj Close" column.
+
+    Returns:
+        pd.DataFrame: The frame with feature columns, incomplete rows dropped.
+    """
+    data = long.sort_index().copy()
+    price = data[ADJ_CLOSE].to_numpy(dtype=np.float64)
+    tickers = data.index.get_level_values(TICKER).to_numpy()
+    position = data.groupby(level=TICKER, sort=False).cumcount().to_numpy()
+    last_in_group = np.append(tickers[1:] != tickers[:-1], True) if len(tickers) else np.array([], bool)
+
+    previous = np.roll(price, 1)
+    returns = np.where(position >= 1, price / previous - 1.0, np.nan)
+    # A rolling window crossing a ticker boundary contains that ticker's NaN first return
+    volatility = pd.Series(returns).rolling(window=VOLATILITY_WINDOW).std().to_numpy()
+    momentum = np.where(
+        position >= MOMENTUM_PERIOD, price - np.roll(price, MOMENTUM_PERIOD), np.nan
+    )
+    following = np.roll(price, -1)
+    target = np.where(~last_in_group & (following > price), 1, 0)
+
+    data["Return"] = returns
+    data["Volatility"] = volatility
+    data["Momentum"] = momentum
+    data["Target"] = target
+    return data.dropna()
+
+
+def feature_tensors(
+    features: pd.DataFrame, device: Optional[torch.device] = None
+) -> Dict[str, Tuple[torch.Tensor, torch.Tensor]]:
+    """
+    Per-ticker (features, targets) tensors for batched training.
+
+    All tickers share two underlying tensors; each ticker's pair is a view
+    of its rows.
+
+    Returns:
+        dict: Ticker to (float32 features of shape (rows, 3), int64 targets).
+    """
+    x = torch.from_numpy(features[FEATURE_COLUMNS].to_numpy(dtype=np.float32, copy=True))
+    y = torch.from_numpy(features["Target"].to_numpy(dtype=np.int64, copy=True))
+    if device is not None:
+        x, y = x.to(device), y.to(device)
+    tickers = features.index.get_level_values(TICKER)
+    names, sizes = np.unique(tickers.to_numpy(), return_counts=True)
+    # np.unique sorts, matching the frame's (Ticker, Date) order
+    return {
+        name: (xs, ys)
+        for name, xs, ys in zip(names, x.split(sizes.tolist()), y.split(sizes.tolist()))
+    }
+
+
+class MarketUniverse:
+    """
+    Batched data and feature pipeline over many tickers.
+
+    Usage example:
+        >>> universe = MarketUniverse(["NVDA", "AAPL", "MSFT"])
+        >>> universe.download_data(period="1y")
+        >>> universe.feature_engineering()
+        >>> tensors = universe.feature_tensors()
+        >>> x, y = tensors["NVDA"]
+    """
+
+    def __init__(
+        self,
+        tickers: Iterable[str],
+        data_store=None,
+        fetch: Optional[BatchFetcher] = None,
+    ):
+        """
+        Args:
+            tickers (Iterable[str]): Ticker symbols.
+            data_store (MarketDataStore, optional): Local bar store; when set,
+                each ticker is read through it so only new bars are downloaded.
+            fetch (Optional[Callable]): Batched downloader called as
+                ``fetch(tickers, period, interval)``; defaults to yfinance.
+        """
+        self.tickers = list(dict.fromkeys(tickers))
+        self.data_store = data_store
+        self.fetch = fetch or yfinance_fetch_many
+        self.data: Optional[pd.DataFrame] = None
+        self.failed: List[str] = []
+
+    def download_data(self, period: str = "1y", interval: str = "1d") -> pd.DataFrame:
+        """
+        Download every ticker into a long frame indexed by (Ticker, Date).
+        Tickers without data are listed in ``self.failed``.
+        """
+        if self.data_store is not None:
+            frames = {}
+            for ticker in self.tickers:
+                try:
+                    bars = self.data_store.get(ticker, period=period, interval=interval)
+                except Exception as e:  # pylint: disable=broad-exception-caught
+                    logger.warning("Could not load %s: %s", ticker, e)
+                    continue
+                if not bars.empty:
+                    frames[ticker] = bars
+            long = (
+                pd.concat(frames, names=[TICKER, DATE]).sort_index()
+                if frames else to_long_format(pd.DataFrame())
+            )
+        else:
+            long = to_long_format(self.fetch(self.tickers, period, interval))
+        loaded = set(long.index.get_level_values(TICKER))
+        self.failed = [ticker for ticker in self.tickers if ticker not in loaded]
+        if self.failed:
+            logger.warning("No data for %d of %d tickers: %s",
+                           len(self.failed), len(self.tickers), ", ".join(self.failed[:10]))
+        self.data = long
+        return long
+
+    def feature_engineering(self) -> pd.DataFrame:
+        """Compute features for all tickers at once; see compute_features()."""
+        if self.data is None:
+            raise ValueError("Data not loaded. Call download_data() first.")
+        self.data = compute_features(self.data)
+        return self.data
+
+    def feature_tensors(self, device: Optional[torch.device] = None) -> Dict[str, Tuple[torch.Tensor, torch.Tensor]]:
+        """Per-ticker tensors of the engineered features; see feature_tensors()."""
+        if self.data is None or "Target" not in self.data:
+            raise ValueError("Data not prepared. Call feature_engineering() first.")
+        return feature_tensors(self.data, device)
+
+    def predict_latest(self, model, batch_size: Optional[int] = None) -> pd.Series:
+        """
+        Score every ticker's most recent bar with one batched forward pass.
+
+        Args:
+            model: Trained TrendPredictor (or exported graph) shared by all tickers.
+            batch_size (Optional[int]): Rows per forward pass (default: all at once).
+
+        Returns:
+            pd.Series: Probability of an up move, indexed by ticker.
+        """
+        if self.data is None or "Target" not in self.data:
+            raise ValueError("Data not prepared. Call feature_engineering() first.")
+        latest = self.data.groupby(level=TICKER, sort=True).tail(1)
+        scores = predict_proba(model, latest, batch_size=batch_size or max(len(latest), 1))
+        return pd.Series(scores, index=latest.index.get_level_values(TICKER), name="up_probability")
@@ -0,0 +1,219 @@
+"""
+Model Registry Module
+
+On-disk cache of trained TrendPredictor weights keyed by ticker, a fingerprint
+of the training data and the training hyperparameters. Callers that only need
+a prediction load a warm model instead of retraining. A model is retrained
+when new bars change the data fingerprint, or when it is older than the
+registry's max_age.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import pandas as pd
+import torch
+
+from ai_models.market_trend_analysis import FEATURE_COLUMNS, TrendPredictor
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+DEFAULT_DIRECTORY = "model_registry"
+# Location of default_registry: MODEL_REGISTRY_DIR, else model_registry/ at the
+# repository root, so checkpoints do not move with the working directory
+SHARED_DIRECTORY = os.path.abspath(
+    os.getenv("MODEL_REGISTRY_DIR")
+    or os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), DEFAULT_DIRECTORY)
+)
+DEFAULT_KEEP = 3  # checkpoints kept per ticker and hyperparameters
+DEFAULT_MAX_AGE = 7 * 86400  # retrain weekly even if no new bars arrive
+
+
+def data_fingerprint(data: pd.DataFrame) -> str:
+    """Digest of the feature and target values (and their index) a model is trained on."""
+    columns = [column for column in FEATURE_COLUMNS + ["Target"] if column in data]
+    hashed = pd.util.hash_pandas_object(data[columns], index=True)
+    return hashlib.sha256(hashed.to_numpy().tobytes()).hexdigest()
+
+
+def hyperparameters_key(hyperparameters: Dict[str, Any]) -> str:
+    """Short digest of a hyperparameter dict, independent of key order."""
+    encoded = json.dumps(hyperparameters, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()[:16]
+
+
+class ModelRegistry:
+    """
+    Versioned TrendPredictor checkpoints with an in-process cache of loaded models.
+
+    Usage example:
+        >>> registry = ModelRegistry("model_registry", max_age=86400)
+        >>> model = registry.get_or_train("NVDA", mta.data, {"epochs": 50}, mta.train_model)
+    """
+
+    def __init__(
+        self,
+        directory: str = DEFAULT_DIRECTORY,
+        max_age: Optional[float] = None,
+        keep: int = DEFAULT_KEEP,
+        clock: Callable[[], float] = time.time,
+    ):
+        """
+        Args:
+            directory (str): Directory holding checkpoint files.
+            max_age (Optional[float]): Seconds after which a checkpoint is stale
+                and its model is retrained even without new data; None never expires.
+            keep (int): Checkpoints kept per ticker and hyperparameter set.
+            clock (Callable[[], float]): Wall-clock time source.
+        """
+        self.directory = directory
+        self.max_age = max_age
+        self.keep = keep
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._loaded: Dict[str, Tuple[TrendPredictor, float]] = {}
+        self.hits = 0
+        self.trainings = 0
+
+    def path(self, ticker: str, fingerprint: str, hyperparameters: Dict[str, Any]) -> str:
+        """Checkpoint file of a (ticker, data, hyperparameters) combination."""
+        safe_ticker = re.sub(r"[^A-Za-z0-9._-]", "_", ticker)
+        name = f"{safe_ticker}-{hyperparameters_key(hyperparameters)}-{fingerprint[:16]}.pt"
+        return os.path.join(self.directory, name)
+
+    def _expired(self, created: float) -> bool:
+        return self.max_age is not None and self._clock() - created > self.max_age
+
+    def load(
+        self, ticker: str, fingerprint: str, hyperparameters: Dict[str, Any]
+    ) -> Optional[TrendPredictor]:
+        """Return the model trained on this data with these hyperparameters, or None if absent or expired."""
+        path = self.path(ticker, fingerprint, hyperparameters)
+        with self._lock:
+            cached = self._loaded.get(path)
+        if cached is not None:
+            model, created = cached
+            if not self._expired(created):
+                return model
+        if not os.path.exists(path):
+            return None
+        try:
+            checkpoint = torch.load(path, map_location="cpu", weights_only=True)
+        except (OSError, RuntimeError, ValueError) as e:
+            logger.warning("Ignoring unreadable checkpoint %s: %s", path, e)
+            return None
+        if checkpoint.get("fingerprint") != fingerprint or self._expired(checkpoint["created"]):
+            return None
+        model = TrendPredictor(**checkpoint["architecture"])
+        model.load_state_dict(checkpoint["state_dict"])
+        model.eval()
+        with self._lock:
+            self._loaded[path] = (model, checkpoint["created"])
+        return model
+
+    def save(
+        self,
+        ticker: str,
+        fingerprint: str,
+        hyperparameters: Dict[str, Any],
+        model: TrendPredictor,
+    ) -> str:
+        """
+        Store a trained model atomically and prune old checkpoints of the same
+        ticker and hyperparameters.
+
+        Returns:
+            str: Path of the checkpoint.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        path = self.path(ticker, fingerprint, hyperparameters)
+        created = self._clock()
+        checkpoint = {
+            "ticker": ticker,
+            "fingerprint": fingerprint,
+            "hyperparameters": json.dumps(hyperparameters, sort_keys=True, default=str),
+            "created": created,
+            "architecture": {
+                "input_size": model.fc1.in_features,
+                "hidden_size": model.fc1.out_features,
+                "output_size": model.fc3.out_features,
+            },
+            "state_dict": {key: value.detach().cpu() for key, value in model.state_dict().items()},
+        }
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        os.close(fd)
+        try:
+            torch.save(checkpoint, tmp_path)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        with self._lock:
+            self._loaded[path] = (model, created)
+        self._prune(ticker, hyperparameters)
+        return path
+
+    def _prune(self, ticker: str, hyperparameters: Dict[str, Any]) -> None:
+        prefix = os.path.basename(self.path(ticker, "", hyperparameters))[:-len(".pt")]
+        checkpoints = sorted(
+            (os.path.join(self.directory, name) for name in os.listdir(self.directory)
+             if name.startswith(prefix) and name.endswith(".pt")),
+            key=os.path.getmtime,
+            reverse=True,
+        )
+        for stale in checkpoints[self.keep:]:
+            with self._lock:
+                self._loaded.pop(stale, None)
+            try:
+                os.remove(stale)
+            except OSError:
+                pass
+
+    def get_or_train(
+        self,
+        ticker: str,
+        data: pd.DataFrame,
+        hyperparameters: Dict[str, Any],
+        train: Callable[[], TrendPredictor],
+    ) -> TrendPredictor:
+        """
+        Return a warm model for this data and these hyperparameters, training
+        and storing one only if there is none or it has expired.
+
+        Args:
+            ticker (str): Ticker the model predicts.
+            data (pd.DataFrame): Engineered training data.
+            hyperparameters (Dict[str, Any]): Everything that affects training.
+            train (Callable[[], TrendPredictor]): Trains a model on ``data``.
+
+        Returns:
+            TrendPredictor: Model in eval mode.
+        """
+        fingerprint = data_fingerprint(data)
+        model = self.load(ticker, fingerprint, hyperparameters)
+        if model is not None:
+            self.hits += 1
+            return model
+        logger.info("No warm %s model for the current data, training one", ticker)
+        model = train()
+        self.trainings += 1
+        self.save(ticker, fingerprint, hyperparameters, model)
+        model.eval()
+        return model
+
+    def clear_memory(self) -> None:
+        """Forget models loaded in this process; checkpoints on disk stay."""
+        with self._lock:
+            self._loaded.clear()
+
+
+# Shared by allocation calls in this process so warm models stay loaded
+default_registry = ModelRegistry(SHARED_DIRECTORY, max_age=DEFAULT_MAX_AGE)
@@ -0,0 +1,244 @@
+"""
+Parallel Training Module
+
+Trains one TrendPredictor per ticker across CPU cores. The engineered
+features of every ticker are copied once into shared memory, and worker
+processes read their ticker's rows from it without pickling any data. Each
+worker runs fit_trend_predictor with a fixed torch.set_num_threads budget, so
+processes do not oversubscribe the cores with intra-op threads, which barely
+help such a small MLP. Trained weights come back to the parent and are stored
+in the model registry.
+"""
+
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import contextmanager
+from multiprocessing import shared_memory
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import torch
+
+from ai_models.market_trend_analysis import FEATURE_COLUMNS, TrendPredictor, fit_trend_predictor
+from ai_models.model_registry import data_fingerprint
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+TICKER = "Ticker"
+DEFAULT_THREADS_PER_WORKER = 1
+
+# Worker-process state set by _init_worker
+_shared_blocks: List[shared_memory.SharedMemory] = []
+_features: Optional[np.ndarray] = None
+_targets: Optional[np.ndarray] = None
+
+
+class ParallelTrainingResult(NamedTuple):
+    """Models per ticker with what was trained, reused and failed."""
+
+    models: Dict[str, TrendPredictor]
+    trained: List[str]
+    reused: List[str]
+    failed: Dict[str, str]
+    epoch_seconds: Dict[str, List[float]]
+    total_seconds: float
+
+
+def _attach(name: str, shape: Tuple[int, ...], dtype: str) -> np.ndarray:
+    block = shared_memory.SharedMemory(name=name)
+    _shared_blocks.append(block)
+    array = np.ndarray(shape, dtype=dtype, buffer=block.buf)
+    array.flags.writeable = False
+    return array
+
+
+def _init_worker(features_spec, targets_spec, threads: int) -> None:
+    global _features, _targets  # pylint: disable=global-statement
+    torch.set_num_threads(threads)
+    _features = _attach(*features_spec)
+    _targets = _attach(*targets_spec)
+
+
+def worker_arrays() -> Tuple[np.ndarray, np.ndarray]:
+    """Inside a shared_feature_pool worker: the read-only (features, targets) arrays."""
+    if _features is None or _targets is None:
+        raise RuntimeError("Not running in a shared_feature_pool worker")
+    return _features, _targets
+
+
+def _train_slice(ticker: str, start: int, stop: int, options: Dict[str, Any]):
+    features, targets = worker_arrays()
+    # Copies only this ticker's rows out of shared memory
+    result = fit_trend_predictor(
+        features[start:stop], targets[start:stop], device=torch.device("cpu"), **options
+    )
+    state = {key: value.detach().cpu() for key, value in result.model.state_dict().items()}
+    return ticker, state, result.epoch_seconds
+
+
+def _context(method: str):
+    context = multiprocessing.get_context(method)
+    if method == "forkserver":
+        # Only takes effect before the server first starts
+        context.set_forkserver_preload([__name__])
+    return context
+
+
+def _share(array: np.ndarray) -> Tuple[shared_memory.SharedMemory, Tuple[str, Tuple[int, ...], str]]:
+    block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[:] = array
+    return block, (block.name, array.shape, array.dtype.str)
+
+
+@contextmanager
+def shared_feature_pool(
+    features: pd.DataFrame,
+    max_workers: Optional[int] = None,
+    threads_per_worker: int = DEFAULT_THREADS_PER_WORKER,
+    mp_context: str = "forkserver",
+) -> Iterator[ProcessPoolExecutor]:
+    """
+    Process pool whose workers see the feature and target columns of
+    ``features`` through shared memory (via worker_arrays()), row for row.
+
+    The default "forkserver" start method launches workers from a clean server
+    process with this module preloaded, so they neither inherit a running
+    OpenMP thread pool (as "fork" would) nor re-import torch each (as "spawn"
+    would). The shared memory is released when the context exits.
+
+    Args:
+        features (pd.DataFrame): Frame with FEATURE_COLUMNS and Target.
+        max_workers (Optional[int]): Worker processes (default: cores // threads_per_worker).
+        threads_per_worker (int): torch.set_num_threads budget of each worker.
+        mp_context (str): multiprocessing start method.
+    """
+    if max_workers is None:
+        max_workers = max(1, (os.cpu_count() or 1) // threads_per_worker)
+    blocks = []
+    try:
+        x_block, x_spec = _share(features[FEATURE_COLUMNS].to_numpy(dtype=np.float32))
+        blocks.append(x_block)
+        y_block, y_spec = _share(features["Target"].to_numpy(dtype=np.int64))
+        blocks.append(y_block)
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=_context(mp_context),
+            initializer=_init_worker,
+            initargs=(x_spec, y_spec, threads_per_worker),
+        ) as executor:
+            yield executor
+    finally:
+        for block in blocks:
+            block.close()
+            block.unlink()
+
+
+def train_tickers(
+    features: pd.DataFrame,
+    registry=None,
+    max_workers: Optional[int] = None,
+    threads_per_worker: int = DEFAULT_THREADS_PER_WORKER,
+    epochs: int = 50,
+    batch_size: int = 256,
+    learning_rate: float = 0.001,
+    validation_fraction: float = 0.2,
+    patience: Optional[int] = 10,
+    seed: Optional[int] = None,
+    mp_context: str = "forkserver",
+) -> ParallelTrainingResult:
+    """
+    Train a model per ticker of a long (Ticker, Date) feature frame in a process pool.
+
+    Tickers that already have a warm model in ``registry`` for their current
+    data and these hyperparameters are not retrained; newly trained models
+    are saved to it.
+
+    Args:
+        features (pd.DataFrame): Output of MarketUniverse.feature_engineering().
+        registry (ModelRegistry, optional): Where models are looked up and stored.
+        max_workers (Optional[int]): Worker processes (default: cores // threads_per_worker).
+        threads_per_worker (int): torch.set_num_threads budget of each worker.
+        epochs, batch_size, learning_rate, validation_fraction, patience:
+            Passed to fit_trend_predictor.
+        seed (Optional[int]): Base seed; ticker i trains with seed + i.
+        mp_context (str): Start method; see shared_feature_pool().
+
+    Returns:
+        ParallelTrainingResult: Models by ticker and per-ticker epoch timings.
+    """
+    start_time = time.perf_counter()
+    features = features.sort_index()
+    hyperparameters = {
+        "trainer": "fit_trend_predictor",
+        "epochs": epochs,
+        "batch_size": batch_size,
+        "learning_rate": learning_rate,
+        "validation_fraction": validation_fraction,
+        "patience": patience,
+    }
+    tickers = features.index.get_level_values(TICKER).to_numpy()
+    names, starts, counts = np.unique(tickers, return_index=True, return_counts=True)
+
+    models: Dict[str, TrendPredictor] = {}
+    reused: List[str] = []
+    fingerprints: Dict[str, str] = {}
+    jobs = []
+    for i, (name, begin, count) in enumerate(zip(names, starts, counts)):
+        name = str(name)
+        if registry is not None:
+            fingerprints[name] = data_fingerprint(features.iloc[begin:begin + count].droplevel(TICKER))
+            model = registry.load(name, fingerprints[name], hyperparameters)
+            if model is not None:
+                models[name] = model
+                reused.append(name)
+                continue
+        options = {
+            "epochs": epochs,
+            "batch_size": batch_size,
+            "learning_rate": learning_rate,
+            "validation_fraction": validation_fraction,
+            "patience": patience,
+            "seed": None if seed is None else seed + i,
+        }
+        jobs.append((name, int(begin), int(begin + count), options))
+
+    trained: List[str] = []
+    failed: Dict[str, str] = {}
+    epoch_seconds: Dict[str, List[float]] = {}
+    if jobs:
+        workers = max_workers
+        if workers is None:
+            workers = max(1, (os.cpu_count() or 1) // threads_per_worker)
+        workers = min(workers, len(jobs))
+        with shared_feature_pool(features, workers, threads_per_worker, mp_context) as executor:
+            futures = {executor.submit(_train_slice, *job): job[0] for job in jobs}
+            for future in as_completed(futures):
+                name = futures[future]
+                try:
+                    _, state, seconds = future.result()
+                except Exception as e:  # pylint: disable=broad-exception-caught
+                    logger.error("Training %s failed: %s", name, e)
+                    failed[name] = str(e)
+                    continue
+                model = TrendPredictor(
+                    input_size=state["fc1.weight"].shape[1],
+                    hidden_size=state["fc1.weight"].shape[0],
+                    output_size=state["fc3.weight"].shape[0],
+                )
+                model.load_state_dict(state)
+                model.eval()
+                models[name] = model
+                trained.append(name)
+                epoch_seconds[name] = seconds
+                if registry is not None:
+                    registry.save(name, fingerprints[name], hyperparameters, model)
+
+    total = time.perf_counter() - start_time
+    logger.info("Trained %d tickers (%d reused, %d failed) in %.1fs",
+                len(trained), len(reused), len(failed), total)
+    return ParallelTrainingResult(models, trained, reused, failed, epoch_seconds, total)
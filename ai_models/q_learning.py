@@ -0,0 +1,236 @@
+"""
+Q-Learning Module
+
+Vectorized tabular Q-learning over market history, replacing the per-step
+Python loop of MarketTrendAnalysis.reinforce_learning_placeholder.
+
+States and rewards are precomputed as NumPy arrays: a state index per bar and
+a reward table R[t, a] for taking action a at bar t. The Q-table is a small
+NumPy array. By default episodes run one after another exactly as in the
+placeholder, with the table held in plain Python lists for the inner loop and
+the exploration draws made once per episode. As an opt-in, many independent
+episodes can be simulated at once as a batch of Q-tables of shape (E, S, A),
+so one Python iteration advances every episode by one bar. Because the state
+sequence depends only on the data, never on the actions taken, each batched
+step is a handful of array operations.
+"""
+
+import time
+from typing import List, NamedTuple, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+ACTION_POSITIONS = (-1.0, 1.0, 0.0)  # action 0 sells, 1 buys, 2 holds
+
+
+def step_states(length: int, n_states: int = 10) -> np.ndarray:
+    """The placeholder's state: bars since the episode start, capped at n_states - 1."""
+    return np.minimum(np.arange(length), n_states - 1)
+
+
+def quantile_edges(values: Sequence[float], n_states: int = 10) -> np.ndarray:
+    """Bin edges splitting a feature into n_states equally populated states."""
+    return np.nanquantile(np.asarray(values, dtype=np.float64), np.linspace(0, 1, n_states + 1)[1:-1])
+
+
+def quantile_states(
+    values: Sequence[float], n_states: int = 10, edges: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """
+    Bin a feature (e.g. Momentum) into n_states equally populated states.
+    Pass ``edges`` from quantile_edges() on training data to bin later data
+    the same way.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    if edges is None:
+        edges = quantile_edges(values, n_states)
+    return np.searchsorted(edges, values, side="right")
+
+
+def target_rewards(target: Sequence[int], n_actions: int = 3) -> np.ndarray:
+    """
+    The placeholder's reward: +1 when ``action % 2`` equals the next bar's
+    Target, else -1.
+
+    Returns:
+        np.ndarray: R of shape (len(target) - 1, n_actions).
+    """
+    following = np.asarray(target)[1:, None]
+    actions = np.arange(n_actions)[None, :] % 2
+    return np.where(following == actions, 1.0, -1.0)
+
+
+def position_rewards(
+    returns: Sequence[float], positions: Sequence[float] = ACTION_POSITIONS
+) -> np.ndarray:
+    """
+    P&L reward: the next bar's return times the position each action takes.
+
+    Returns:
+        np.ndarray: R of shape (len(returns) - 1, len(positions)).
+    """
+    following = np.nan_to_num(np.asarray(returns, dtype=np.float64)[1:, None])
+    return following * np.asarray(positions, dtype=np.float64)[None, :]
+
+
+class QLearningResult(NamedTuple):
+    """Learned Q-table with per-round rewards and timings."""
+
+    q_table: np.ndarray
+    mean_rewards: List[float]
+    round_seconds: List[float]
+    total_seconds: float
+
+    def policy(self) -> np.ndarray:
+        """Greedy action per state."""
+        return self.q_table.argmax(axis=1)
+
+
+class QLearningEngine:
+    """
+    Batched epsilon-greedy Q-learning on precomputed states and rewards.
+
+    With the default ``parallel=1`` every episode continues from the table the
+    previous one left, which is the sequential placeholder algorithm.
+
+    ``parallel > 1`` is an opt-in approximation: episodes run in rounds of
+    ``parallel`` independent copies of the current Q-table, every copy learns
+    for one pass over the data with its own exploration, and the copies are
+    averaged into the next round's table. A round therefore counts as
+    ``parallel`` episodes but moves the table about as far as a single,
+    less noisy pass, so use it with many rounds (episodes >> parallel).
+
+    Usage example:
+        >>> engine = QLearningEngine(alpha=0.1, gamma=0.9, epsilon=0.1, seed=0)
+        >>> result = engine.train(step_states(len(data)), target_rewards(data["Target"]), episodes=100)
+        >>> result.policy()
+    """
+
+    def __init__(
+        self,
+        alpha: float = 0.1,
+        gamma: float = 0.9,
+        epsilon: float = 0.1,
+        seed: Optional[int] = None,
+    ):
+        """
+        Args:
+            alpha (float): Learning rate.
+            gamma (float): Discount factor.
+            epsilon (float): Probability of a random action.
+            seed (Optional[int]): Seed for exploration.
+        """
+        self.alpha = alpha
+        self.gamma = gamma
+        self.epsilon = epsilon
+        self.rng = np.random.default_rng(seed)
+
+    def train(
+        self,
+        states: np.ndarray,
+        rewards: np.ndarray,
+        episodes: int = 100,
+        parallel: int = 1,
+        n_states: Optional[int] = None,
+        q_table: Optional[np.ndarray] = None,
+    ) -> QLearningResult:
+        """
+        Learn a Q-table.
+
+        Args:
+            states (np.ndarray): State index of each bar, shape (T,).
+            rewards (np.ndarray): Reward table R[t, a] for bars 0..T-2, shape (T - 1, A).
+            episodes (int): Total passes over the data.
+            parallel (int): Episodes simulated at once and averaged per round;
+                1 (the default) runs them sequentially. See the class docstring.
+            n_states (Optional[int]): Number of states (default: max(states) + 1).
+            q_table (Optional[np.ndarray]): Initial Q-table (default: zeros).
+
+        Returns:
+            QLearningResult: Final Q-table, each round's mean reward per step and timings.
+        """
+        states = np.asarray(states, dtype=np.intp)
+        rewards = np.asarray(rewards, dtype=np.float64)
+        steps, n_actions = rewards.shape
+        if steps and len(states) != steps + 1:
+            raise ValueError("states must have one more entry than rewards has rows")
+        if n_states is None:
+            n_states = int(states.max()) + 1 if len(states) else 1
+        q = np.zeros((n_states, n_actions)) if q_table is None else np.array(q_table, dtype=np.float64)
+        parallel = max(1, min(parallel, episodes))
+
+        mean_rewards: List[float] = []
+        round_seconds: List[float] = []
+        total_start = time.perf_counter()
+        remaining = episodes
+        while remaining > 0:
+            batch = min(parallel, remaining)
+            start = time.perf_counter()
+            if batch == 1:
+                q, mean_reward = self._run_episode(q, states, rewards)
+            else:
+                q, mean_reward = self._run_round(q, states, rewards, batch)
+            round_seconds.append(time.perf_counter() - start)
+            mean_rewards.append(mean_reward)
+            remaining -= batch
+        return QLearningResult(q, mean_rewards, round_seconds, time.perf_counter() - total_start)
+
+    def _run_episode(self, q: np.ndarray, states: np.ndarray, rewards: np.ndarray):
+        steps, n_actions = rewards.shape
+        # Same draws as a one-episode round, so both paths agree bit for bit
+        explore = (self.rng.random((steps, 1)) < self.epsilon)[:, 0].tolist()
+        random_actions = self.rng.integers(0, n_actions, (steps, 1))[:, 0].tolist()
+        table = q.tolist()
+        reward_rows = rewards.tolist()
+        state_list = states.tolist()
+        alpha, gamma = self.alpha, self.gamma
+        total = 0.0
+        for t in range(steps):
+            row = table[state_list[t]]
+            if explore[t]:
+                action = random_actions[t]
+            else:
+                action = row.index(max(row))
+            reward = reward_rows[t][action]
+            row[action] += alpha * (reward + gamma * max(table[state_list[t + 1]]) - row[action])
+            total += reward
+        return np.array(table, dtype=np.float64).reshape(q.shape), total / max(steps, 1)
+
+    def _run_round(self, q: np.ndarray, states: np.ndarray, rewards: np.ndarray, batch: int):
+        steps, n_actions = rewards.shape
+        qs = np.repeat(q[None], batch, axis=0)  # (E, S, A)
+        episodes = np.arange(batch)
+        # Exploration draws for the whole round up front
+        explore = self.rng.random((steps, batch)) < self.epsilon
+        random_actions = self.rng.integers(0, n_actions, (steps, batch))
+        total = 0.0
+        alpha, gamma = self.alpha, self.gamma
+        for t in range(steps):
+            state, next_state = states[t], states[t + 1]
+            row = qs[:, state]  # (E, A) view
+            actions = np.where(explore[t], random_actions[t], row.argmax(axis=1))
+            reward = rewards[t, actions]
+            chosen = row[episodes, actions]
+            row[episodes, actions] = chosen + alpha * (
+                reward + gamma * qs[:, next_state].max(axis=1) - chosen
+            )
+            total += reward.sum()
+        return qs.mean(axis=0), total / max(steps * batch, 1)
+
+
+def train_on_data(
+    data: pd.DataFrame,
+    episodes: int = 100,
+    alpha: float = 0.1,
+    gamma: float = 0.9,
+    epsilon: float = 0.1,
+    n_states: int = 10,
+    parallel: int = 1,
+    seed: Optional[int] = None,
+) -> QLearningResult:
+    """Q-learning with the placeholder's state and reward definitions on engineered data."""
+    states = step_states(len(data), n_states)
+    rewards = target_rewards(data["Target"].to_numpy())
+    engine = QLearningEngine(alpha=alpha, gamma=gamma, epsilon=epsilon, seed=seed)
+    return engine.train(states, rewards, episodes=episodes, parallel=parallel, n_states=n_states)
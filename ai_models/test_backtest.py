@@ -0,0 +1,91 @@
+import time
+import unittest
+
+import numpy as np
+
+from ai_models.backtest import (
+    Fold,
+    backtest_q_policy,
+    backtest_trend_model,
+    backtest_universe,
+    evaluate_positions,
+    summarize,
+    walk_forward_folds,
+)
+from ai_models.market_universe import compute_features, to_long_format
+from ai_models.testing_helpers import prepared_analysis, wide_prices
+
+
+def engineered(periods=200, drift=0.0, seed=0):
+    return prepared_analysis(periods, seed, drift, start_date="2023-01-02").data
+
+
+def universe(tickers, periods=200, seed=0):
+    return compute_features(to_long_format(wide_prices(tickers, periods, seed, start_date="2023-01-02")))
+
+
+class TestWalkForward(unittest.TestCase):
+
+    def test_folds_expanding_and_rolling(self):
+        self.assertEqual(walk_forward_folds(10, initial_train=4, test_size=3),
+                         [Fold(0, 4, 4, 7), Fold(0, 7, 7, 10)])
+        self.assertEqual(walk_forward_folds(10, initial_train=4, test_size=4, window=3),
+                         [Fold(1, 4, 4, 8), Fold(5, 8, 8, 10)])
+        for fold in walk_forward_folds(500, 100, 30, window=60):
+            self.assertLessEqual(fold.train_stop, fold.test_start)
+        with self.assertRaises(ValueError):
+            walk_forward_folds(10, initial_train=0)
+
+    def test_evaluate_positions(self):
+        result = evaluate_positions([1, 1, 0, -1], [0.10, -0.05, 0.20, -0.10], cost=0.0)
+        np.testing.assert_allclose(result.pnl, [0.10, -0.05, 0.0, 0.10])
+        np.testing.assert_allclose(result.equity, [1.10, 1.045, 1.045, 1.1495])
+        self.assertAlmostEqual(result.metrics["max_drawdown"], 1.045 / 1.10 - 1)
+        self.assertAlmostEqual(result.metrics["hit_rate"], 2 / 3)
+        self.assertAlmostEqual(result.metrics["exposure"], 0.75)
+        self.assertEqual(result.metrics["trades"], 3)
+        with_cost = evaluate_positions([1, 1, 0, -1], [0.10, -0.05, 0.20, -0.10], cost=0.01)
+        np.testing.assert_allclose(with_cost.pnl, [0.09, -0.05, -0.01, 0.09])
+
+    def test_trend_model_backtest_is_out_of_sample(self):
+        data = engineered()
+        result = backtest_trend_model(data, initial_train=100, test_size=25, epochs=3,
+                                      max_workers=1, seed=0)
+        self.assertEqual(len(result.positions), len(data) - 100)
+        self.assertTrue(result.positions.index.equals(data.index[100:]))
+        self.assertTrue(set(np.unique(result.positions)) <= {0.0, 1.0})
+        self.assertLessEqual(result.metrics["max_drawdown"], 0.0)
+        self.assertTrue(0.0 <= result.metrics["hit_rate"] <= 1.0)
+
+    def test_universe_backtest_per_ticker(self):
+        features = universe(["AAPL", "MSFT"])
+        results = backtest_universe(features, initial_train=100, test_size=40, epochs=2,
+                                    long_short=True, max_workers=2, seed=0)
+        self.assertEqual(sorted(results), ["AAPL", "MSFT"])
+        for ticker, result in results.items():
+            self.assertEqual(len(result.positions), len(features.xs(ticker, level="Ticker")) - 100)
+            self.assertTrue(set(np.unique(result.positions)) <= {-1.0, 1.0})
+        table = summarize(results)
+        self.assertEqual(list(table.index), ["AAPL", "MSFT"])
+        self.assertIn("sharpe", table.columns)
+
+    def test_q_policy_backtest_learns_trend(self):
+        data = engineered(periods=300, drift=0.003, seed=2)
+        result = backtest_q_policy(data, initial_train=100, test_size=50, episodes=20, seed=0)
+        self.assertEqual(len(result.positions), len(data) - 100)
+        self.assertGreater(result.metrics["exposure"], 0.5)
+        self.assertGreater(result.metrics["total_return"], 0.0)
+
+    def test_vectorized_scoring_speed(self):
+        rng = np.random.default_rng(0)
+        positions = rng.choice([-1.0, 0.0, 1.0], size=(500 * 2520))
+        returns = rng.normal(0, 0.01, size=positions.shape)
+        start = time.perf_counter()
+        evaluate_positions(positions, returns)
+        elapsed = time.perf_counter() - start
+        self.assertLess(elapsed, 5.0)
+        print(f"Scored {len(positions):,} position-bars in {elapsed * 1e3:.0f} ms")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+import time
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+import torch
+import torch.nn as nn
+
+from ai_models.market_trend_analysis import (
+    FEATURE_COLUMNS,
+    MarketTrendAnalysis,
+    TrendPredictor,
+    fit_trend_predictor,
+)
+from ai_models.testing_helpers import prepared_analysis
+
+
+def separable_data(rows=400, seed=0):
+    rng = np.random.default_rng(seed)
+    x = rng.normal(size=(rows, 3)).astype(np.float32)
+    return x, (x[:, 0] > 0).astype(np.int64)
+
+
+class TestFastTraining(unittest.TestCase):
+
+    def test_learns_and_reports_per_epoch_times(self):
+        x, y = separable_data()
+        result = fit_trend_predictor(x, y, epochs=30, batch_size=64, learning_rate=0.01, seed=0,
+                                     device=torch.device("cpu"))
+        self.assertIsInstance(result.model, TrendPredictor)
+        self.assertFalse(result.model.training)
+        self.assertEqual(len(result.epoch_seconds), 30)
+        self.assertEqual(len(result.validation_losses), 30)
+        self.assertLess(result.train_losses[-1], result.train_losses[0])
+        with torch.no_grad():
+            accuracy = (result.model(torch.from_numpy(x)).argmax(1).numpy() == y).mean()
+        self.assertGreater(accuracy, 0.9)
+
+    def test_seed_makes_training_reproducible(self):
+        x, y = separable_data()
+        first = fit_trend_predictor(x, y, epochs=3, seed=5, device=torch.device("cpu"))
+        second = fit_trend_predictor(x, y, epochs=3, seed=5, device=torch.device("cpu"))
+        self.assertEqual(first.train_losses, second.train_losses)
+
+    def test_early_stopping_restores_best_weights(self):
+        rng = np.random.default_rng(1)
+        x = rng.normal(size=(200, 3)).astype(np.float32)
+        y = rng.integers(0, 2, 200)  # pure noise: validation loss soon rises
+        result = fit_trend_predictor(x, y, epochs=500, batch_size=16, learning_rate=0.05,
+                                     patience=5, seed=0, device=torch.device("cpu"))
+        self.assertTrue(result.stopped_early)
+        self.assertLess(len(result.epoch_seconds), 500)
+        self.assertEqual(len(result.epoch_seconds), result.best_epoch + 6)
+        with torch.no_grad():
+            restored = nn.CrossEntropyLoss()(result.model(torch.from_numpy(x[160:])), torch.from_numpy(y[160:]))
+        self.assertAlmostEqual(float(restored), min(result.validation_losses), places=5)
+
+    def test_validation_split_is_chronological(self):
+        x, y = separable_data(rows=100)
+        x[80:] = 0.0
+        y[80:] = 1  # the held-out tail is constant, so its loss is a pure function of the model
+        result = fit_trend_predictor(x, y, epochs=1, seed=0, device=torch.device("cpu"))
+        with torch.no_grad():
+            loss = nn.CrossEntropyLoss()(result.model(torch.from_numpy(x[80:])), torch.from_numpy(y[80:]))
+        self.assertAlmostEqual(result.validation_losses[0], float(loss), places=5)
+
+    def test_compiled_training(self):
+        x, y = separable_data(rows=300)
+        result = fit_trend_predictor(x, y, epochs=2, batch_size=64, compile_model=True, seed=0,
+                                     device=torch.device("cpu"))
+        self.assertEqual(len(result.epoch_seconds), 2)
+
+    def test_compile_failure_falls_back_to_eager(self):
+        def broken_compiled(*args, **kwargs):
+            raise RuntimeError("no compiler backend")
+
+        x, y = separable_data(rows=300)
+        with patch("torch.compile", return_value=broken_compiled):
+            result = fit_trend_predictor(x, y, epochs=2, batch_size=64, compile_model=True, seed=0,
+                                         device=torch.device("cpu"))
+        self.assertEqual(len(result.epoch_seconds), 2)
+        self.assertLess(result.train_losses[-1], result.train_losses[0])
+
+    def test_train_model_fast_on_analysis(self):
+        mta = prepared_analysis()
+        model = mta.train_model_fast(epochs=5, seed=0)
+        self.assertIs(mta.model, model)
+        self.assertEqual(len(mta.training_result.epoch_seconds), 5)
+        self.assertEqual(mta.predict(mta.data).shape, (len(mta.data),))
+        with self.assertRaises(ValueError):
+            MarketTrendAnalysis().train_model_fast()
+
+    def test_faster_than_reference_loop(self):
+        mta = prepared_analysis()
+        start = time.perf_counter()
+        mta.train_model(epochs=20)
+        reference = time.perf_counter() - start
+
+        start = time.perf_counter()
+        fit_trend_predictor(mta.data[FEATURE_COLUMNS].to_numpy(), mta.data["Target"].to_numpy(), epochs=20)
+        fast = time.perf_counter() - start
+        self.assertLess(fast, reference)
+        print(f"20 epochs on {len(mta.data)} rows: DataLoader loop {reference * 1e3:.0f} ms, "
+              f"tensor-resident {fast * 1e3:.0f} ms")
+
+
+if __name__ == "__main__":
+    unittest.main()
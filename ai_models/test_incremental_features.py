@@ -0,0 +1,96 @@
+import time
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from ai_models.incremental_features import IncrementalFeatureEngine
+from ai_models.market_trend_analysis import FEATURE_COLUMNS, MarketTrendAnalysis
+from ai_models.testing_helpers import random_walk_prices
+
+
+def batch_features(prices):
+    mta = MarketTrendAnalysis()
+    mta.data = pd.DataFrame({"Adj Close": prices})
+    return mta.feature_engineering()
+
+
+def stream_features(prices):
+    engine = IncrementalFeatureEngine()
+    rows = {}
+    for i, price in enumerate(prices):
+        features = engine.update(price)
+        if features is not None:
+            rows[i] = features
+    return pd.DataFrame.from_dict(rows, orient="index")
+
+
+class TestIncrementalFeatureEngine(unittest.TestCase):
+
+    def test_matches_batch_path(self):
+        rng = np.random.default_rng(7)
+        prices = random_walk_prices(rng, 3000, volatility=0.02)
+        expected = batch_features(prices)
+        actual = stream_features(prices)
+        self.assertTrue(actual.index.equals(expected.index))
+        np.testing.assert_allclose(
+            actual[FEATURE_COLUMNS].to_numpy(), expected[FEATURE_COLUMNS].to_numpy(),
+            rtol=1e-7, atol=1e-12,
+        )
+
+    def test_constant_prices(self):
+        features = stream_features([100.0] * 10)
+        self.assertEqual(len(features), 5)
+        self.assertTrue((features.to_numpy() == 0).all())
+
+    def test_warm_up_and_target(self):
+        engine = IncrementalFeatureEngine()
+        for price in [100, 102, 101, 103, 105]:
+            self.assertIsNone(engine.update(price))
+        with self.assertRaises(ValueError):
+            engine.vector()
+        self.assertEqual(engine.last_target, 1)
+        features = engine.update(104)
+        self.assertEqual(engine.last_target, 0)
+        self.assertAlmostEqual(features["Momentum"], 4.0)
+        self.assertEqual(engine.vector().dtype, np.float32)
+
+    def test_from_history_continues_like_batch(self):
+        prices = [100, 102, 101, 103, 105, 107, 106, 108, 110]
+        engine = IncrementalFeatureEngine.from_history(prices[:-1])
+        features = engine.update(prices[-1])
+        expected = batch_features(prices).iloc[-1]
+        for column in FEATURE_COLUMNS:
+            self.assertAlmostEqual(features[column], expected[column])
+
+    def test_invalid_parameters(self):
+        with self.assertRaises(ValueError):
+            IncrementalFeatureEngine(window=1)
+        with self.assertRaises(ValueError):
+            IncrementalFeatureEngine(momentum_period=0)
+
+    def test_update_is_cheaper_than_recomputing(self):
+        rng = np.random.default_rng(0)
+        prices = random_walk_prices(rng, 252)
+        engine = IncrementalFeatureEngine.from_history(prices)
+        new_bars = random_walk_prices(rng, 50, start=prices[-1])
+
+        start = time.perf_counter()
+        for price in new_bars:
+            engine.update(price)
+        incremental = time.perf_counter() - start
+
+        start = time.perf_counter()
+        history = list(prices)
+        for price in new_bars:
+            history.append(price)
+            batch_features(history)
+        batch = time.perf_counter() - start
+
+        self.assertLess(incremental * 10, batch)
+        print(f"50 bars on a 252-bar history: incremental {incremental * 1e6 / 50:.1f} us/bar, "
+              f"batch recompute {batch * 1e6 / 50:.0f} us/bar")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,137 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from ai_models import market_data_store
+from ai_models.market_data_store import FEATHER, MarketDataStore, period_start
+from ai_models.market_trend_analysis import MarketTrendAnalysis
+
+
+def make_bars(start, periods):
+    index = pd.date_range(start, periods=periods, freq="D", name="Date")
+    close = np.linspace(100, 100 + periods - 1, periods)
+    return pd.DataFrame(
+        {"Adj Close": close, "Close": close, "Volume": np.arange(periods, dtype=np.int64)},
+        index=index,
+    )
+
+
+class FakeFetch:
+    """Serves bars of a fixed history, recording each request."""
+
+    def __init__(self, history):
+        self.history = history
+        self.calls = []
+
+    def __call__(self, ticker, interval, start=None, period=None):
+        self.calls.append({"start": start, "period": period})
+        if start is not None:
+            return self.history[self.history.index >= start]
+        return self.history
+
+
+class TestMarketDataStore(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def make_store(self, fetch, **kwargs):
+        kwargs.setdefault("refresh_seconds", 0)
+        return MarketDataStore(self.directory, fetch=fetch, **kwargs)
+
+    def test_first_get_downloads_period_and_saves(self):
+        fetch = FakeFetch(make_bars("2024-01-01", 30))
+        store = self.make_store(fetch)
+        data = store.get("NVDA", period="1y")
+        self.assertEqual(len(data), 30)
+        self.assertEqual(fetch.calls, [{"start": None, "period": "1y"}])
+        self.assertTrue(os.path.exists(store.path("NVDA", "1d")))
+        pd.testing.assert_frame_equal(store.load("NVDA", "1d"), data, check_freq=False)
+
+    def test_refresh_fetches_only_new_bars(self):
+        history = make_bars("2024-01-01", 30)
+        fetch = FakeFetch(history.iloc[:20])
+        store = self.make_store(fetch)
+        store.get("NVDA")
+        fetch.history = history
+        data = store.get("NVDA")
+        self.assertEqual(fetch.calls[1]["start"], history.index[19])
+        # The last stored bar is fetched again, then the ten new ones
+        self.assertEqual(store.bars_downloaded, 20 + 11)
+        self.assertEqual(len(data), 30)
+        self.assertFalse(data.index.duplicated().any())
+        self.assertTrue(data.index.is_monotonic_increasing)
+
+    def test_fresh_store_skips_network(self):
+        fetch = FakeFetch(make_bars("2024-01-01", 10))
+        store = self.make_store(fetch, refresh_seconds=3600)
+        store.get("NVDA")
+        store.get("NVDA")
+        self.assertEqual(len(fetch.calls), 1)
+
+    def test_offline_serves_store_only(self):
+        fetch = FakeFetch(make_bars("2024-01-01", 10))
+        self.make_store(fetch).get("NVDA")
+        offline = self.make_store(fetch, offline=True)
+        self.assertEqual(len(offline.get("NVDA")), 10)
+        self.assertTrue(offline.get("MISSING").empty)
+        self.assertEqual(len(fetch.calls), 1)
+
+    def test_failed_refresh_serves_stored_bars(self):
+        fetch = FakeFetch(make_bars("2024-01-01", 10))
+        store = self.make_store(fetch)
+        store.get("NVDA")
+
+        def failing_fetch(*args, **kwargs):
+            raise ConnectionError("offline")
+
+        store.fetch = failing_fetch
+        self.assertEqual(len(store.get("NVDA")), 10)
+        with self.assertRaises(ConnectionError):
+            store.get("OTHER")
+
+    def test_period_slicing(self):
+        fetch = FakeFetch(make_bars("2024-01-01", 60))
+        data = self.make_store(fetch).get("NVDA", period="5d")
+        self.assertEqual(len(data), 6)  # both ends of the five-day span are inclusive
+        self.assertEqual(period_start("ytd", pd.Timestamp("2024-05-03")), pd.Timestamp("2024-01-01"))
+        self.assertIsNone(period_start("max", pd.Timestamp("2024-05-03")))
+        with self.assertRaises(ValueError):
+            period_start("forever", pd.Timestamp("2024-05-03"))
+
+    def test_feather_round_trip(self):
+        bars = make_bars("2024-01-01", 5)
+        store = self.make_store(FakeFetch(bars), file_format=FEATHER)
+        store.get("BRK.B")
+        self.assertTrue(store.path("BRK.B", "1d").endswith(".feather"))
+        pd.testing.assert_frame_equal(store.load("BRK.B", "1d"), bars, check_freq=False)
+
+    def test_market_trend_analysis_uses_store(self):
+        fetch = FakeFetch(make_bars("2024-01-01", 30))
+        mta = MarketTrendAnalysis(ticker="NVDA", data_store=self.make_store(fetch))
+        data = mta.download_data(max_retries=1, retry_delay=0)
+        self.assertEqual(len(data), 30)
+        self.assertEqual(len(mta.feature_engineering()), 25)
+
+    def test_market_trend_analysis_offline_without_data_falls_back(self):
+        store = self.make_store(FakeFetch(make_bars("2024-01-01", 5)), offline=True)
+        mta = MarketTrendAnalysis(ticker="NVDA", data_store=store)
+        data = mta.download_data(max_retries=3, retry_delay=60)
+        self.assertEqual(len(data), 252)
+
+    def test_default_store_does_not_depend_on_working_directory(self):
+        repository = os.path.dirname(os.path.dirname(os.path.abspath(market_data_store.__file__)))
+        self.assertTrue(os.path.isabs(market_data_store.default_store.directory))
+        if "MARKET_DATA_DIR" not in os.environ:
+            self.assertEqual(market_data_store.default_store.directory, os.path.join(repository, "market_data"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+import torch
+
+from ai_models.market_trend_analysis import (
+    FEATURE_COLUMNS,
+    MarketTrendAnalysis,
+    TrendPredictor,
+    export_inference_graph,
+    predict_proba,
+)
+from ai_models.market_universe import MarketUniverse
+from ai_models.testing_helpers import prepared_analysis, wide_prices
+
+
+class TestPrediction(unittest.TestCase):
+
+    def test_predict_matches_eager_forward(self):
+        mta = prepared_analysis(periods=80, with_model=True)
+        scores = mta.predict(mta.data, batch_size=16)
+        x = torch.tensor(mta.data[FEATURE_COLUMNS].to_numpy(), dtype=torch.float32)
+        mta.model.eval()
+        with torch.no_grad():
+            expected = torch.softmax(mta.model(x), dim=1)[:, 1].numpy()
+        self.assertEqual(scores.shape, (len(mta.data),))
+        np.testing.assert_allclose(scores, expected, rtol=1e-5, atol=1e-6)
+
+    def test_predict_is_deterministic_in_eval_mode(self):
+        mta = prepared_analysis(periods=80, with_model=True)
+        mta.model.train()  # dropout must not apply at inference
+        np.testing.assert_array_equal(mta.predict(mta.data), mta.predict(mta.data))
+        self.assertFalse(mta.model.training)
+
+    def test_predict_latest_and_input_shapes(self):
+        mta = prepared_analysis(periods=80, with_model=True)
+        latest = mta.predict_latest()
+        self.assertTrue(0.0 <= latest <= 1.0)
+        row = mta.data[FEATURE_COLUMNS].to_numpy()[-1]
+        self.assertAlmostEqual(float(mta.predict(row)[0]), latest, places=6)
+        self.assertAlmostEqual(float(mta.predict(torch.tensor(row[None]))[0]), latest, places=6)
+        self.assertEqual(predict_proba(mta.model, np.empty((0, 3))).shape, (0,))
+
+    def test_requires_model_and_data(self):
+        with self.assertRaises(ValueError):
+            MarketTrendAnalysis().predict(np.zeros((1, 3)))
+        mta = MarketTrendAnalysis()
+        mta.model = TrendPredictor()
+        with self.assertRaises(ValueError):
+            mta.predict_latest()
+
+    def test_exported_graph_matches_and_reloads(self):
+        mta = prepared_analysis(periods=80, with_model=True)
+        eager = mta.predict(mta.data)
+        np.testing.assert_allclose(mta.predict(mta.data, use_graph=True), eager, rtol=1e-5, atol=1e-6)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "nvda.pt")
+            export_inference_graph(mta.model, path)
+            graph = torch.jit.load(path)
+        np.testing.assert_allclose(predict_proba(graph, mta.data), eager, rtol=1e-5, atol=1e-6)
+        graph = mta._inference_graph[1]
+        mta.model = TrendPredictor()
+        mta.predict(mta.data, use_graph=True)
+        self.assertIsNot(mta._inference_graph[1], graph)  # re-exported for the new model
+
+    def test_universe_scores_latest_bar_per_ticker(self):
+        tickers = ["AAPL", "MSFT", "NVDA"]
+        wide = wide_prices(tickers, periods=30, seed=1)
+        universe = MarketUniverse(tickers, fetch=lambda t, period, interval: wide)
+        universe.download_data()
+        universe.feature_engineering()
+        model = TrendPredictor()
+        scores = universe.predict_latest(model)
+        self.assertEqual(list(scores.index), tickers)
+        for ticker in tickers:
+            row = universe.data.xs(ticker, level="Ticker").iloc[-1:]
+            self.assertAlmostEqual(scores[ticker], float(predict_proba(model, row)[0]), places=6)
+
+    def test_batched_scores_match_per_row_scores(self):
+        torch.manual_seed(0)
+        model = TrendPredictor().eval()
+        features = np.random.default_rng(0).normal(size=(500, 3)).astype(np.float32)
+        per_row = np.array([predict_proba(model, row)[0] for row in features])
+        np.testing.assert_allclose(predict_proba(model, features), per_row, rtol=1e-5, atol=1e-6)
+        np.testing.assert_allclose(predict_proba(model, features, batch_size=64), per_row, rtol=1e-5, atol=1e-6)
+        graph = export_inference_graph(model)
+        np.testing.assert_allclose(predict_proba(graph, features), per_row, rtol=1e-5, atol=1e-6)
+
+if __name__ == "__main__":
+    unittest.main()
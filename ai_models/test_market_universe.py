@@ -0,0 +1,101 @@
+import shutil
+import tempfile
+import time
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from ai_models.market_data_store import MarketDataStore
+from ai_models.market_trend_analysis import FEATURE_COLUMNS, MarketTrendAnalysis
+from ai_models.market_universe import MarketUniverse, compute_features, to_long_format
+from ai_models.testing_helpers import wide_prices
+
+
+def make_wide(tickers, periods, seed=0):
+    """A frame shaped like yf.download(list_of_tickers, group_by="column")."""
+    return wide_prices(tickers, periods, seed, fields=("Adj Close", "Close"))
+
+
+class TestMarketUniverse(unittest.TestCase):
+
+    def test_features_match_single_ticker_path(self):
+        tickers = ["AAPL", "MSFT", "NVDA"]
+        wide = make_wide(tickers, 40)
+        universe = MarketUniverse(tickers, fetch=lambda t, period, interval: wide)
+        universe.download_data()
+        features = universe.feature_engineering()
+        for ticker in tickers:
+            mta = MarketTrendAnalysis(ticker)
+            mta.data = pd.DataFrame({"Adj Close": wide[("Adj Close", ticker)]})
+            expected = mta.feature_engineering()
+            actual = features.xs(ticker, level="Ticker")
+            self.assertTrue(actual.index.equals(expected.index))
+            np.testing.assert_allclose(
+                actual[FEATURE_COLUMNS].to_numpy(), expected[FEATURE_COLUMNS].to_numpy(), rtol=1e-9
+            )
+            np.testing.assert_array_equal(actual["Target"].to_numpy(), expected["Target"].to_numpy())
+
+    def test_failed_tickers_are_dropped(self):
+        wide = make_wide(["AAPL", "FAKE"], 20)
+        wide.loc[:, (slice(None), "FAKE")] = np.nan
+        universe = MarketUniverse(["AAPL", "FAKE"], fetch=lambda t, period, interval: wide)
+        long = universe.download_data()
+        self.assertEqual(universe.failed, ["FAKE"])
+        self.assertEqual(set(long.index.get_level_values("Ticker")), {"AAPL"})
+
+    def test_feature_tensors_are_views_per_ticker(self):
+        tickers = ["AAPL", "MSFT"]
+        universe = MarketUniverse(tickers, fetch=lambda t, period, interval: make_wide(tickers, 30))
+        universe.download_data()
+        features = universe.feature_engineering()
+        tensors = universe.feature_tensors()
+        self.assertEqual(sorted(tensors), tickers)
+        x, y = tensors["MSFT"]
+        self.assertEqual(tuple(x.shape), (25, 3))
+        np.testing.assert_allclose(
+            x.numpy(), features.xs("MSFT", level="Ticker")[FEATURE_COLUMNS].to_numpy(np.float32)
+        )
+        self.assertEqual(x.untyped_storage().data_ptr(), tensors["AAPL"][0].untyped_storage().data_ptr())
+        self.assertEqual(len(y), 25)
+
+    def test_reads_through_data_store(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        wide = make_wide(["AAPL", "MSFT"], 20)
+
+        def fetch(ticker, interval, start=None, period=None):
+            return pd.DataFrame({"Adj Close": wide[("Adj Close", ticker)]})
+
+        store = MarketDataStore(directory, fetch=fetch)
+        universe = MarketUniverse(["AAPL", "MSFT"], data_store=store)
+        long = universe.download_data()
+        self.assertEqual(len(long), 40)
+        self.assertEqual(len(universe.feature_engineering()), 30)
+
+    def test_requires_download_before_features(self):
+        with self.assertRaises(ValueError):
+            MarketUniverse(["AAPL"]).feature_engineering()
+
+    def test_batched_features_faster_than_per_ticker(self):
+        tickers = ["T%03d" % i for i in range(500)]
+        long = to_long_format(make_wide(tickers, 252))
+
+        start = time.perf_counter()
+        compute_features(long)
+        batched = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for ticker in tickers[:50]:
+            mta = MarketTrendAnalysis(ticker)
+            mta.data = long.xs(ticker, level="Ticker")
+            mta.feature_engineering()
+        per_ticker = (time.perf_counter() - start) * len(tickers) / 50
+
+        self.assertLess(batched, per_ticker)
+        print(f"500 tickers x 252 bars: batched {batched * 1e3:.0f} ms, "
+              f"per-ticker (extrapolated) {per_ticker * 1e3:.0f} ms")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+import torch
+
+from ai_models.market_trend_analysis import FEATURE_COLUMNS, MarketTrendAnalysis, TrendPredictor
+from ai_models.model_registry import ModelRegistry, data_fingerprint
+from ai_models.testing_helpers import prepared_analysis
+
+
+def engineered_data(periods=60, seed=0):
+    return prepared_analysis(periods, seed, start_date="2024-01-01").data
+
+
+class TestModelRegistry(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.now = 1_000.0
+        self.registry = ModelRegistry(self.directory, max_age=3600, keep=2, clock=lambda: self.now)
+        self.data = engineered_data()
+        self.trained = 0
+
+    def train(self):
+        self.trained += 1
+        return TrendPredictor()
+
+    def test_fingerprint_tracks_data(self):
+        self.assertEqual(data_fingerprint(self.data), data_fingerprint(self.data.copy()))
+        self.assertNotEqual(data_fingerprint(self.data), data_fingerprint(self.data.iloc[:-1]))
+
+    def test_round_trip_preserves_predictions(self):
+        model = TrendPredictor(hidden_size=16).eval()
+        self.registry.save("NVDA", "abc", {"epochs": 1}, model)
+        self.registry.clear_memory()
+        loaded = self.registry.load("NVDA", "abc", {"epochs": 1})
+        x = torch.randn(8, len(FEATURE_COLUMNS))
+        with torch.no_grad():
+            torch.testing.assert_close(loaded(x), model(x))
+        self.assertFalse(loaded.training)
+        self.assertIsNone(self.registry.load("NVDA", "abc", {"epochs": 2}))
+
+    def test_get_or_train_reuses_warm_model(self):
+        first = self.registry.get_or_train("NVDA", self.data, {"epochs": 1}, self.train)
+        second = self.registry.get_or_train("NVDA", self.data, {"epochs": 1}, self.train)
+        self.assertIs(first, second)
+        self.assertEqual(self.trained, 1)
+        self.registry.clear_memory()
+        self.registry.get_or_train("NVDA", self.data, {"epochs": 1}, self.train)
+        self.assertEqual(self.trained, 1)
+        self.assertEqual(self.registry.hits, 2)
+
+    def test_new_bars_hyperparameters_and_age_trigger_retraining(self):
+        self.registry.get_or_train("NVDA", self.data, {"epochs": 1}, self.train)
+        self.registry.get_or_train("NVDA", engineered_data(61), {"epochs": 1}, self.train)
+        self.registry.get_or_train("NVDA", self.data, {"epochs": 2}, self.train)
+        self.assertEqual(self.trained, 3)
+        self.now += 3601
+        self.registry.get_or_train("NVDA", self.data, {"epochs": 1}, self.train)
+        self.assertEqual(self.trained, 4)
+
+    def test_old_checkpoints_are_pruned(self):
+        for periods in (60, 61, 62):
+            self.registry.get_or_train("NVDA", engineered_data(periods), {"epochs": 1}, self.train)
+            time.sleep(0.01)
+        self.registry.get_or_train("AAPL", self.data, {"epochs": 1}, self.train)
+        names = os.listdir(self.directory)
+        self.assertEqual(sum(name.startswith("NVDA-") for name in names), 2)
+        self.assertEqual(sum(name.startswith("AAPL-") for name in names), 1)
+
+    def test_market_trend_analysis_loads_warm_model(self):
+        mta = MarketTrendAnalysis("NVDA", registry=self.registry)
+        mta.data = self.data
+
+        start = time.perf_counter()
+        trained = mta.load_or_train_model(epochs=5)
+        cold = time.perf_counter() - start
+
+        self.registry.clear_memory()
+        start = time.perf_counter()
+        warm = mta.load_or_train_model(epochs=5)
+        warm_seconds = time.perf_counter() - start
+
+        self.assertEqual(self.registry.trainings, 1)
+        for key, value in trained.state_dict().items():
+            torch.testing.assert_close(warm.state_dict()[key].cpu(), value.cpu())
+        self.assertLess(warm_seconds, cold)
+        print(f"train {cold * 1e3:.0f} ms, warm load from disk {warm_seconds * 1e3:.1f} ms")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+import shutil
+import tempfile
+import unittest
+from multiprocessing import shared_memory
+from unittest.mock import patch
+
+import numpy as np
+
+from ai_models.market_universe import compute_features, to_long_format
+from ai_models.model_registry import ModelRegistry
+from ai_models import parallel_training
+from ai_models.parallel_training import train_tickers
+from ai_models.testing_helpers import wide_prices
+
+
+def universe_features(tickers, periods=120, seed=0):
+    return compute_features(to_long_format(wide_prices(tickers, periods, seed)))
+
+
+class TestParallelTraining(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.registry = ModelRegistry(self.directory)
+        self.features = universe_features(["AAPL", "MSFT", "NVDA"])
+
+    def test_trains_every_ticker_and_registers_models(self):
+        result = train_tickers(self.features, registry=self.registry, max_workers=2, epochs=3, seed=0)
+        self.assertEqual(sorted(result.trained), ["AAPL", "MSFT", "NVDA"])
+        self.assertEqual(result.failed, {})
+        self.assertEqual(len(result.epoch_seconds["NVDA"]), 3)
+        self.assertFalse(result.models["NVDA"].training)
+
+        again = train_tickers(self.features, registry=self.registry, max_workers=2, epochs=3, seed=0)
+        self.assertEqual(again.trained, [])
+        self.assertEqual(sorted(again.reused), ["AAPL", "MSFT", "NVDA"])
+
+    def test_new_bars_retrain_only_changed_tickers(self):
+        train_tickers(self.features, registry=self.registry, max_workers=1, epochs=2)
+        changed = self.features.drop(self.features.xs("MSFT", level="Ticker", drop_level=False).index[-1])
+        result = train_tickers(changed, registry=self.registry, max_workers=1, epochs=2)
+        self.assertEqual(result.trained, ["MSFT"])
+        self.assertEqual(sorted(result.reused), ["AAPL", "NVDA"])
+
+    def test_matches_in_process_training(self):
+        result = train_tickers(self.features, max_workers=1, epochs=2, seed=7)
+        expected = parallel_training.fit_trend_predictor(
+            self.features.xs("AAPL", level="Ticker")[["Return", "Volatility", "Momentum"]].to_numpy(),
+            self.features.xs("AAPL", level="Ticker")["Target"].to_numpy(),
+            epochs=2, seed=7, patience=10,
+        )
+        for key, value in expected.model.state_dict().items():
+            np.testing.assert_allclose(result.models["AAPL"].state_dict()[key].numpy(), value.cpu().numpy(),
+                                       rtol=1e-5, atol=1e-6)
+
+    def test_shared_memory_is_released(self):
+        created = []
+        real_share = parallel_training._share
+
+        def recording_share(array):
+            block, spec = real_share(array)
+            created.append(spec[0])
+            return block, spec
+
+        with patch.object(parallel_training, "_share", side_effect=recording_share):
+            train_tickers(self.features, max_workers=1, epochs=1)
+        self.assertEqual(len(created), 2)
+        for name in created:
+            with self.assertRaises(FileNotFoundError):
+                shared_memory.SharedMemory(name=name)
+
+    def test_rejects_zero_workers(self):
+        with self.assertRaises(ValueError):
+            train_tickers(self.features, max_workers=0, epochs=1)
+
+    def test_worker_count_does_not_change_models(self):
+        features = universe_features(["T%02d" % i for i in range(4)])
+        one = train_tickers(features, max_workers=1, epochs=3, seed=5)
+        two = train_tickers(features, max_workers=2, epochs=3, seed=5)
+        self.assertEqual(sorted(one.trained), sorted(two.trained))
+        for ticker, model in one.models.items():
+            for key, value in model.state_dict().items():
+                np.testing.assert_array_equal(two.models[ticker].state_dict()[key].numpy(), value.numpy())
+
+
+if __name__ == "__main__":
+    unittest.main()
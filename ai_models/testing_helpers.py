@@ -0,0 +1,46 @@
+"""
+Synthetic market data shared by the ai_models unit tests.
+"""
+
+from typing import Optional, Sequence
+
+import numpy as np
+import pandas as pd
+import torch
+
+from ai_models.market_trend_analysis import MarketTrendAnalysis, TrendPredictor
+
+
+def random_walk_prices(rng: np.random.Generator, shape, drift: float = 0.0,
+                       volatility: float = 0.01, start: float = 100.0) -> np.ndarray:
+    """Geometric random-walk prices; columns of a 2-D ``shape`` are independent series."""
+    return start * np.exp(np.cumsum(rng.normal(drift, volatility, shape), axis=0))
+
+
+def wide_prices(tickers: Sequence[str], periods: int, seed: int = 0, start_date: str = "2024-01-01",
+                fields: Sequence[str] = ("Adj Close",)) -> pd.DataFrame:
+    """A frame shaped like yf.download(list_of_tickers, group_by="column"), every field the same prices."""
+    prices = random_walk_prices(np.random.default_rng(seed), (periods, len(tickers)))
+    return pd.DataFrame(
+        np.hstack([prices] * len(fields)),
+        index=pd.date_range(start_date, periods=periods, freq="D", name="Date"),
+        columns=pd.MultiIndex.from_product([list(fields), list(tickers)], names=["Price", "Ticker"]),
+    )
+
+
+def prepared_analysis(periods: int = 300, seed: int = 0, drift: float = 0.0,
+                      start_date: Optional[str] = None, with_model: bool = False) -> MarketTrendAnalysis:
+    """
+    NVDA analysis with engineered features on synthetic prices, indexed by
+    daily dates from ``start_date`` if given. With ``with_model``, also an
+    untrained TrendPredictor seeded by ``seed``.
+    """
+    rng = np.random.default_rng(seed)
+    mta = MarketTrendAnalysis("NVDA")
+    index = None if start_date is None else pd.date_range(start_date, periods=periods)
+    mta.data = pd.DataFrame({"Adj Close": random_walk_prices(rng, periods, drift)}, index=index)
+    mta.feature_engineering()
+    if with_model:
+        torch.manual_seed(seed)
+        mta.model = TrendPredictor()
+    return mta
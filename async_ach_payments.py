@@ -0,0 +1,242 @@
+import asyncio
+import logging
+import os
+import random
+import uuid
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import aiohttp
+
+from ach_payments import DEFAULT_POOL_SIZE, DEFAULT_TIMEOUT, RETRY_STATUS_CODES
+from idempotency_ledger import IdempotencyLedger, derive_idempotency_key
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_IN_FLIGHT: int = 100
+
+
+class AsyncACHPayments:
+    """
+    asyncio counterpart of ACHPayments for submitting many payments concurrently
+    from one event loop. Validation, retry policy (total attempts, exponential
+    backoff with jitter on connection errors and 429/5xx) and failure responses
+    match the synchronous client.
+
+    Usage example:
+        >>> async with AsyncACHPayments() as ach:
+        ...     responses = await ach.submit_many(payments, max_in_flight=200)
+    """
+
+    def __init__(
+        self,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        keep_alive: bool = True,
+        max_retries: int = 3,
+        backoff_factor: float = 0.5,
+        backoff_jitter: float = 0.5,
+        backoff_max: float = 10.0,
+        ledger: Optional[IdempotencyLedger] = None,
+    ) -> None:
+        self.api_url: str = "https://api.example-ach-gateway.com/payments"
+        self.api_key: Optional[str] = os.getenv("ACH_API_KEY")
+        if not self.api_key:
+            logger.warning("ACH_API_KEY environment variable is not set.")
+        self.max_retries: int = max_retries
+        self.backoff_factor: float = backoff_factor
+        self.backoff_jitter: float = backoff_jitter
+        self.backoff_max: float = backoff_max
+        self.pool_size: int = pool_size
+        self.keep_alive: bool = keep_alive
+        self.timeout: float = DEFAULT_TIMEOUT
+        self.ledger: Optional[IdempotencyLedger] = ledger
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    async def __aenter__(self) -> "AsyncACHPayments":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        # Created lazily so it binds to the running event loop
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.pool_size, force_close=not self.keep_alive
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+        return self._session
+
+    async def close(self) -> None:
+        """Close pooled connections."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    def _backoff_delay(self, retry_number: int) -> float:
+        """
+        Delay before the given retry, using the same formula as urllib3's Retry:
+        no delay before the first retry, then backoff_factor * 2 ** (n - 1) plus jitter.
+        """
+        if retry_number <= 1:
+            return 0.0
+        delay = self.backoff_factor * (2 ** (retry_number - 1))
+        if self.backoff_jitter:
+            delay += random.random() * self.backoff_jitter
+        return max(0.0, min(self.backoff_max, delay))
+
+    async def _request(self, method: str, url: str, **kwargs: Any) -> Dict[str, Any]:
+        """
+        Send a request with retries and return the decoded JSON body.
+
+        Raises:
+            aiohttp.ClientError: If the last attempt failed at the transport or HTTP level.
+            asyncio.TimeoutError: If the last attempt timed out.
+        """
+        session = self._get_session()
+        for attempt in range(1, self.max_retries + 1):
+            try:
+                async with session.request(method, url, **kwargs) as response:
+                    if response.status in RETRY_STATUS_CODES and attempt < self.max_retries:
+                        logger.warning(
+                            f"{method} {url} returned {response.status} on attempt {attempt}, retrying"
+                        )
+                    else:
+                        response.raise_for_status()
+                        return await response.json()
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                if attempt >= self.max_retries:
+                    raise
+                logger.warning(f"{method} {url} failed on attempt {attempt}: {e}, retrying")
+            await asyncio.sleep(self._backoff_delay(attempt))
+        raise aiohttp.ClientError("All attempts failed")
+
+    async def create_payment(
+        self,
+        account_number: str,
+        routing_number: str,
+        amount: float,
+        description: str = "",
+        idempotency_key: Optional[str] = None,
+        derive_key: bool = False,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Create an ACH payment request.
+        Args:
+            account_number (str): Bank account number to debit/credit.
+            routing_number (str): Bank routing number.
+            amount (float): Amount to transfer.
+            description (str): Optional description for the payment.
+            idempotency_key (Optional[str]): Key identifying this payment; see
+                ACHPayments.create_payment.
+            derive_key (bool): Without an ``idempotency_key``, derive one from the
+                payment fields.
+        Returns:
+            dict or None: Payment response or None if failure.
+        """
+        if amount <= 0:
+            logger.error("Amount must be greater than zero.")
+            return None
+        if not account_number or not routing_number:
+            logger.error("Account number and routing number must be provided.")
+            return None
+
+        if idempotency_key is None and derive_key:
+            idempotency_key = derive_idempotency_key(
+                account_number, routing_number, amount, description
+            )
+        # A per-call key only protects this call's retries; it is never looked up again
+        ledger = self.ledger if idempotency_key is not None else None
+        if idempotency_key is None:
+            idempotency_key = uuid.uuid4().hex
+        if ledger is not None:
+            # SQLite calls run off the event loop
+            recorded = await asyncio.to_thread(ledger.get, idempotency_key)
+            if recorded is not None:
+                logger.info(f"Payment {idempotency_key} already submitted, returning recorded response")
+                return recorded
+
+        payload: Dict[str, Any] = {
+            "account_number": account_number,
+            "routing_number": routing_number,
+            "amount": amount,
+            "description": description,
+        }
+        headers: Dict[str, str] = {
+            "Authorization": f"Bearer {self.api_key}" if self.api_key else "",
+            "Content-Type": "application/json",
+            "Idempotency-Key": idempotency_key,
+        }
+        # The Idempotency-Key header makes a retried POST safe if the first one landed
+        try:
+            payment_response: Dict[str, Any] = await self._request(
+                "POST", self.api_url, json=payload, headers=headers
+            )
+            logger.debug(f"ACH payment created successfully: {payment_response}")
+            if ledger is not None:
+                await asyncio.to_thread(ledger.put, idempotency_key, payment_response)
+            return payment_response
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.error(f"Error creating ACH payment: {e}")
+            return {"status": "failure", "error": str(e)}
+        except Exception as e:
+            logger.error(f"Unexpected error creating ACH payment: {e}")
+            return {"status": "failure", "error": str(e)}
+
+    async def get_payment_status(self, transaction_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Retrieve the status of an ACH payment by transaction ID.
+        Args:
+            transaction_id (str): The transaction identifier.
+        Returns:
+            dict or None: Payment status information or None if failure.
+        """
+        if not transaction_id:
+            logger.error("Transaction ID must be provided.")
+            return None
+
+        status_url: str = f"{self.api_url}/{transaction_id}/status"
+        headers: Dict[str, str] = {
+            "Authorization": f"Bearer {self.api_key}" if self.api_key else "",
+        }
+        try:
+            status_response: Dict[str, Any] = await self._request(
+                "GET", status_url, headers=headers
+            )
+            logger.debug(f"Payment status retrieved: {status_response}")
+            return status_response
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.error(f"Error retrieving payment status: {e}")
+            return {"status": "failure", "error": str(e)}
+        except Exception as e:
+            logger.error(f"Unexpected error retrieving payment status: {e}")
+            return {"status": "failure", "error": str(e)}
+
+    async def submit_many(
+        self,
+        payments: Iterable[Sequence[Any]],
+        max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+    ) -> List[Optional[Dict[str, Any]]]:
+        """
+        Submit many payments concurrently with at most ``max_in_flight`` requests open.
+
+        Args:
+            payments: Iterable of (account_number, routing_number, amount[, description[, idempotency_key]]).
+            max_in_flight (int): Maximum number of concurrent requests.
+
+        Returns:
+            List[Optional[Dict[str, Any]]]: Responses in the same order as ``payments``.
+        """
+        semaphore = asyncio.Semaphore(max_in_flight)
+
+        async def submit(payment: Sequence[Any]) -> Optional[Dict[str, Any]]:
+            async with semaphore:
+                return await self.create_payment(*payment)
+
+        responses = await asyncio.gather(*(submit(payment) for payment in payments))
+        failures = sum(1 for r in responses if r is None or r.get("status") == "failure")
+        logger.info(f"Submitted {len(responses)} ACH payments, {failures} failed")
+        return list(responses)
@@ -5,35 +5,92 @@ ACH payments, and Plaid integrations.
 
 import os
 import logging
-from unittest.mock import MagicMock
-from typing import Optional, Dict, Any, Union
+from typing import TYPE_CHECKING, Optional, Dict, Any, Callable, Iterable, Sequence, Union
+
+import numpy as np
 
 from generate_account_number import (
     generate_account_number,
+    generate_account_numbers,
     is_valid_account_number,
 )
 from get_routing_number import get_routing_number
-from validate_routing_number import validate_routing_number
-from plaid_integration import PlaidIntegration
+from validate_routing_number import (
+    REASON_NAMES,
+    validate_routing_number,
+    validate_routing_numbers,
+)
 from ach_payments import ACHPayments
-from ai_models.market_trend_analysis import MarketTrendAnalysis
-from nvidia_integration import nvidia_integration
+from idempotency_ledger import SHARED_LEDGER_DIR, IdempotencyLedger
+from nacha_file import write_nacha_file
+from payment_status_tracker import PaymentStatusTracker
+from plaid_cache import PlaidResponseCache
+from resilience import DEFAULT_BURST, DEFAULT_RATE, CircuitBreaker, TokenBucket
+
+if TYPE_CHECKING:
+    from unittest.mock import MagicMock
+    from plaid_integration import PlaidIntegration
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+class _LazyClassAttribute:
+    """
+    Class attribute whose value is built by ``factory`` on first access and then
+    stored on the owner class, replacing the descriptor.
+    """
+
+    def __init__(self, factory: Callable[[], Any]) -> None:
+        self.factory = factory
+        self.name = ""
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self.name = name
+
+    def __get__(self, instance: Any, owner: type) -> Any:
+        value = self.factory()
+        setattr(owner, self.name, value)
+        return value
+
+
+# Shared by every BankingUtils call so a degraded ACH gateway or Plaid fails fast
+# instead of tying up worker threads in retries.
+circuit_breaker = CircuitBreaker()
+ach_rate_limiter = TokenBucket(rate=DEFAULT_RATE, capacity=DEFAULT_BURST)
+plaid_rate_limiter = TokenBucket(rate=DEFAULT_RATE, capacity=DEFAULT_BURST)
+# Payments submitted with an idempotency key are recorded, so a resubmission
+# returns the stored response instead of paying twice
+ach_ledger = IdempotencyLedger(SHARED_LEDGER_DIR)
+# Dashboards poll accounts and items constantly; serve repeats from memory
+plaid_response_cache = PlaidResponseCache()
+
+
+def _create_plaid_integration() -> Union["MagicMock", "PlaidIntegration"]:
+    # Patch PlaidIntegration to avoid real API calls during tests
+    if os.getenv('TESTING') == '1':
+        from unittest.mock import MagicMock  # pylint: disable=import-outside-toplevel
+        return MagicMock()
+    from plaid_integration import PlaidIntegration  # pylint: disable=import-outside-toplevel
+    return PlaidIntegration(
+        rate_limiter=plaid_rate_limiter,
+        circuit_breaker=circuit_breaker,
+        cache=plaid_response_cache,
+    )
+
+
 class BankingUtils:
     """
     A utility class for banking operations including account generation,
     routing number retrieval, validation, ACH payments, and Plaid integrations.
     """
-    # Patch PlaidIntegration to avoid real API calls during tests
-    plaid_integration: Union[MagicMock, PlaidIntegration] = (
-        MagicMock() if os.getenv('TESTING') == '1' else PlaidIntegration()
-    )
+    # Built on first use so importing this module does not load the Plaid SDK
+    plaid_integration: Union["MagicMock", "PlaidIntegration"] = _LazyClassAttribute(_create_plaid_integration)  # type: ignore[assignment]  # pylint: disable=line-too-long
 
-    ach_payments = ACHPayments()
+    ach_payments = ACHPayments(
+        ledger=ach_ledger, rate_limiter=ach_rate_limiter, circuit_breaker=circuit_breaker
+    )
+    payment_status_tracker = PaymentStatusTracker(ach_payments)
 
     @staticmethod
     def generate_account(length: int = 9) -> Optional[str]:
@@ -60,6 +117,27 @@ class BankingUtils:
             logger.error("Error generating account number: %s", e)
             return None
 
+    @staticmethod
+    def generate_accounts(count: int, length: int = 9) -> Optional[np.ndarray]:
+        """
+        Generate a batch of valid bank account numbers in one vectorized pass.
+
+        Args:
+            count (int): Number of account numbers to generate.
+            length (int): Length of each account number.
+
+        Returns:
+            Optional[np.ndarray]: Array of ASCII account numbers (dtype ``S<length>``)
+            or None if generation fails.
+        """
+        try:
+            account_numbers = generate_account_numbers(count, length)
+            logger.info("Generated %d account numbers of length %d", count, length)
+            return account_numbers
+        except ValueError as e:
+            logger.error("Error generating account numbers: %s", e)
+            return None
+
     @staticmethod
     def get_routing(bank_name: str) -> Optional[str]:
         """
@@ -101,8 +179,32 @@ class BankingUtils:
             logger.error("Error validating routing number %s: %s", routing_number, e)
             return False
 
+    @staticmethod
+    def validate_routings(routing_numbers: Union[Iterable[Any], np.ndarray]) -> Optional[np.ndarray]:
+        """
+        Validate a batch of routing numbers, logging one summary line per batch.
+
+        Args:
+            routing_numbers (Iterable[Any] | np.ndarray): Routing numbers to validate.
+
+        Returns:
+            Optional[np.ndarray]: Boolean validity mask or None if validation fails.
+        """
+        try:
+            mask, reasons = validate_routing_numbers(routing_numbers)
+        except (ValueError, TypeError) as e:
+            logger.error("Error validating routing number batch: %s", e)
+            return None
+        counts = np.bincount(reasons, minlength=len(REASON_NAMES))
+        logger.info(
+            "Validated %d routing numbers: %s",
+            len(mask),
+            ", ".join("%d %s" % (counts[code], name) for code, name in REASON_NAMES.items()),
+        )
+        return mask
+
     @classmethod
-    def create_ach_payment(cls, account_number: str, routing_number: str, amount: float, description: str = "") -> Optional[Dict[str, Any]]:  # pylint: disable=line-too-long
+    def create_ach_payment(cls, account_number: str, routing_number: str, amount: float, description: str = "", idempotency_key: Optional[str] = None) -> Optional[Dict[str, Any]]:  # pylint: disable=line-too-long
         """
         Create an ACH payment.
 
@@ -111,6 +213,9 @@ class BankingUtils:
             routing_number (str): Routing number.
             amount (float): Payment amount.
             description (str): Payment description.
+            idempotency_key (Optional[str]): Key identifying this payment. Resubmitting
+                with the same key returns the recorded response instead of paying
+                again; without one, every call is a new payment.
 
         Returns:
             Optional[Dict[str, Any]]: Payment response or None if creation fails.
@@ -121,6 +226,7 @@ class BankingUtils:
                 routing_number,
                 amount,
                 description,
+                idempotency_key=idempotency_key,
             )
             logger.info("ACH payment created: %s", response)
             return response
@@ -128,25 +234,84 @@ class BankingUtils:
             logger.error("Error creating ACH payment: %s", e)
             return None
 
+    @staticmethod
+    def create_ach_batch_file(records: Iterable[Sequence[Any]], path: str, **options: Any) -> Optional[Dict[str, Any]]:  # pylint: disable=line-too-long
+        """
+        Settle many payments through one NACHA file instead of per-payment API calls.
+
+        Args:
+            records (Iterable[Sequence[Any]]): (account_number, routing_number, amount, description) records.
+            path (str): Destination path of the NACHA file.
+            **options: Passed to NACHAFileWriter (company_id, batch_size, effective_date, ...).
+
+        Returns:
+            Optional[Dict[str, Any]]: File control totals or None if the file could not be written.
+        """
+        try:
+            summary = write_nacha_file(path, records, **options)
+            logger.info("NACHA batch file created: %s", summary)
+            return summary
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            logger.error("Error creating NACHA batch file: %s", e)
+            return None
+
     @classmethod
-    def get_ach_payment_status(cls, transaction_id: str) -> Optional[Union[str, Dict[str, Any]]]:  # pylint: disable=line-too-long
+    def get_ach_payment_status(cls, transaction_id: str, force: bool = False) -> Optional[Union[str, Dict[str, Any]]]:  # pylint: disable=line-too-long
         """
-        Get the status of an ACH payment.
+        Get the status of an ACH payment. Goes through the payment status tracker, so
+        concurrent lookups share one gateway call, settled payments are served from
+        cache and pending ones are only polled again once they are due.
 
         Args:
             transaction_id (str): Transaction ID.
+            force (bool): Poll a pending payment even if it is not due yet.
 
         Returns:
             Optional[Union[str, Dict[str, Any]]]: Payment status or None if retrieval fails.
         """
         try:
-            status = cls.ach_payments.get_payment_status(transaction_id)
+            status = cls.payment_status_tracker.get_status(transaction_id, force=force)
             logger.info("ACH payment status: %s", status)
             return status
         except Exception as e:  # pylint: disable=broad-exception-caught
             logger.error("Error getting ACH payment status: %s", e)
             return None
 
+    @classmethod
+    def get_ach_payment_statuses(cls, transaction_ids: Iterable[str], force: bool = False) -> Optional[Dict[str, Optional[Dict[str, Any]]]]:  # pylint: disable=line-too-long
+        """
+        Get the statuses of many ACH payments, coalescing duplicate lookups, serving
+        settled payments from cache and only polling the gateway for those that are due.
+
+        Args:
+            transaction_ids (Iterable[str]): Transaction IDs.
+            force (bool): Poll pending payments even if they are not due yet.
+
+        Returns:
+            Optional[Dict[str, Optional[Dict[str, Any]]]]: Status per transaction ID or None if retrieval fails.
+        """
+        try:
+            statuses = cls.payment_status_tracker.get_statuses(transaction_ids, force=force)
+            logger.info("Retrieved %d ACH payment statuses", len(statuses))
+            return statuses
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            logger.error("Error getting ACH payment statuses: %s", e)
+            return None
+
+    @staticmethod
+    def get_resilience_metrics() -> Dict[str, Any]:
+        """
+        Circuit-breaker state per ACH/Plaid endpoint and rate-limiter counters.
+
+        Returns:
+            Dict[str, Any]: Metrics under "circuits", "ach_rate_limiter" and "plaid_rate_limiter".
+        """
+        return {
+            "circuits": circuit_breaker.metrics(),
+            "ach_rate_limiter": ach_rate_limiter.metrics(),
+            "plaid_rate_limiter": plaid_rate_limiter.metrics(),
+        }
+
     @classmethod
     def create_plaid_link_token(cls, user_id: str) -> Optional[Dict[str, Any]]:
         """
@@ -186,18 +351,20 @@ class BankingUtils:
             return None
 
     @classmethod
-    def get_plaid_accounts(cls, access_token: str) -> Optional[Dict[str, Any]]:
+    def get_plaid_accounts(cls, access_token: str, fields: Optional[Iterable[str]] = None, lazy: bool = False) -> Optional[Any]:  # pylint: disable=line-too-long
         """
         Retrieve Plaid accounts linked to the access token.
 
         Args:
             access_token (str): Access token.
+            fields (Optional[Iterable[str]]): Only return these dotted field paths, e.g. "accounts.balances.available".
+            lazy (bool): Return a lazy ResponseView that converts fields on access instead of a dict.
 
         Returns:
-            Optional[Dict[str, Any]]: Accounts information or None if retrieval fails.
+            Optional[Any]: Accounts information or None if retrieval fails.
         """
         try:
-            response = cls.plaid_integration.get_accounts(access_token)
+            response = cls.plaid_integration.get_accounts(access_token, fields=fields, lazy=lazy)
             logger.info("Plaid accounts retrieved: %s", response)
             return response
         except Exception as e:  # pylint: disable=broad-exception-caught
@@ -253,18 +420,27 @@ class BankingUtils:
         for asset_class, percentage in allocations.items():
             amount = total_amount * percentage
             if asset_class == "Public Equities":
-                # AI-enhanced stock selection using GPU-accelerated model
+                # AI-enhanced stock selection using GPU-accelerated model. Imported
+                # here because torch, pandas and yfinance take seconds to load.
+                from ai_models.market_data_store import default_store  # pylint: disable=import-outside-toplevel
+                from ai_models.market_trend_analysis import MarketTrendAnalysis  # pylint: disable=import-outside-toplevel
+                from ai_models.model_registry import default_registry  # pylint: disable=import-outside-toplevel
+                from nvidia_integration import nvidia_integration  # pylint: disable=import-outside-toplevel
                 nvidia_integration.log_project_status("Equity Allocation")
-                mta = MarketTrendAnalysis(ticker="NVDA")  # NVIDIA stock for AI theme
+                # Bars are cached locally so only new ones are downloaded
+                mta = MarketTrendAnalysis(ticker="NVDA", data_store=default_store,  # NVIDIA stock for AI theme
+                                          registry=default_registry)
                 mta.download_data()
                 mta.feature_engineering()
-                mta.train_model()
-                # Predict trend on latest data (simplified: if last target is 1, positive)
-                if mta.data is not None and not mta.data.empty and mta.data["Target"].iloc[-1] == 1:
-                    logger.info("AI prediction: Positive trend for NVDA, allocating full equities.")  # pylint: disable=line-too-long
+                # Reuses the registered model unless new bars arrived
+                mta.load_or_train_model()
+                # Model score of the latest bar (the last Target is a label, not a prediction)
+                up_probability = mta.predict_latest() if mta.data is not None and not mta.data.empty else 0.0
+                if up_probability >= 0.5:
+                    logger.info("AI prediction: Positive trend for NVDA (p=%.2f), allocating full equities.", up_probability)  # pylint: disable=line-too-long
                 else:
                     amount *= 0.5  # Reduce allocation if negative trend
-                    logger.info("AI prediction: Negative trend for NVDA, reducing equities allocation.")  # pylint: disable=line-too-long
+                    logger.info("AI prediction: Negative trend for NVDA (p=%.2f), reducing equities allocation.", up_probability)  # pylint: disable=line-too-long
 
             payment_description = "%s - Allocation to %s" % (description, asset_class)
             # For demonstration, generate a new account number for each allocation
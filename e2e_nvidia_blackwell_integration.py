@@ -89,14 +89,15 @@ class E2ENVIDIAIntegration:
 
         # Get latest prediction
         if self.market_analysis.data is not None and not self.market_analysis.data.empty:
-            latest_target = self.market_analysis.data["Target"].iloc[-1]
-            prediction = "Positive" if latest_target == 1 else "Negative"
-            logger.info(f"Latest AI prediction for {ticker}: {prediction}")
+            up_probability = self.market_analysis.predict_latest()
+            prediction = "Positive" if up_probability >= 0.5 else "Negative"
+            logger.info(f"Latest AI prediction for {ticker}: {prediction} (p={up_probability:.2f})")
             return {
                 "ticker": ticker,
                 "data_points": len(data),
                 "training_time": training_time,
                 "prediction": prediction,
+                "up_probability": up_probability,
                 "model_trained": model is not None
             }
         else:
@@ -1,24 +1,51 @@
+import os
+import mmap
 import random
 import logging
-from typing import List
+from typing import Iterator, Optional, Union
+
+import numpy as np
 
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Digit sum of 2*d for each digit d, i.e. the Luhn "double and add digits" step.
+LUHN_DOUBLED_DIGITS = np.array([0, 2, 4, 6, 8, 1, 3, 5, 7, 9], dtype=np.uint8)
+
+# 256-entry lookup tables indexed by raw ASCII byte, so the Luhn engine can work on
+# bytes without decoding. Non-digit bytes map to 0 and are rejected separately.
+_ASCII_DIGITS = np.arange(ord("0"), ord("9") + 1)
+LUHN_BYTE_PLAIN = np.zeros(256, dtype=np.uint8)
+LUHN_BYTE_PLAIN[_ASCII_DIGITS] = np.arange(10)
+LUHN_BYTE_DOUBLED = np.zeros(256, dtype=np.uint8)
+LUHN_BYTE_DOUBLED[_ASCII_DIGITS] = LUHN_DOUBLED_DIGITS
+LUHN_BYTE_IS_DIGIT = np.zeros(256, dtype=bool)
+LUHN_BYTE_IS_DIGIT[_ASCII_DIGITS] = True
+_PLAIN_TRANSLATION = LUHN_BYTE_PLAIN.tobytes()
+_DOUBLED_TRANSLATION = LUHN_BYTE_DOUBLED.tobytes()
+
+DEFAULT_CHUNK_SIZE: int = 1 << 22  # 4 MiB of file data per streaming chunk
 
-def luhn_checksum(account_number: str) -> int:
+
+def luhn_checksum(account_number: Union[str, bytes]) -> int:
     """
     Calculate the Luhn checksum for the account number.
+    Works directly on ASCII bytes using precomputed digit lookup tables.
+
+    Raises:
+        ValueError: If the account number contains non-digit characters.
     """
-    def digits_of(n: str) -> List[int]:
-        return [int(d) for d in str(n)]
-    digits = digits_of(account_number)
-    odd_digits = digits[-1::-2]
-    even_digits = digits[-2::-2]
-    total = sum(odd_digits)
-    for d in even_digits:
-        total += sum(digits_of(str(d*2)))
+    if isinstance(account_number, (bytes, bytearray, memoryview)):
+        data = bytes(account_number)
+    else:
+        data = str(account_number).encode("ascii")
+    if data and not data.isdigit():
+        raise ValueError(f"Account number must contain only digits: {account_number!r}")
+    total = (
+        sum(data[-1::-2].translate(_PLAIN_TRANSLATION))
+        + sum(data[-2::-2].translate(_DOUBLED_TRANSLATION))
+    )
     return total % 10
 
 
@@ -29,6 +56,182 @@ def is_valid_account_number(account_number: str) -> bool:
     return luhn_checksum(account_number) == 0
 
 
+def _luhn_valid_fixed(matrix: np.ndarray) -> np.ndarray:
+    """
+    Luhn-check the rows of an ASCII byte matrix whose rows all fill the full width.
+    """
+    reversed_digits = matrix[:, ::-1]
+    totals = (
+        LUHN_BYTE_PLAIN[reversed_digits[:, 0::2]].sum(axis=1, dtype=np.int64)
+        + LUHN_BYTE_DOUBLED[reversed_digits[:, 1::2]].sum(axis=1, dtype=np.int64)
+    )
+    all_digits = LUHN_BYTE_IS_DIGIT[matrix].all(axis=1)
+    return all_digits & (matrix.shape[1] > 0) & (totals % 10 == 0)
+
+
+def _luhn_valid_matrix(matrix: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+    """
+    Luhn-check the rows of a right-padded ASCII byte matrix of shape (n, width).
+    """
+    if len(lengths) and (lengths == matrix.shape[1]).all():
+        return _luhn_valid_fixed(matrix)
+    # Distance of every column from the end of its row: 1 for the check digit,
+    # 2 for the first doubled digit, <= 0 for padding.
+    positions = lengths[:, None] - np.arange(matrix.shape[1])
+    in_number = positions > 0
+    contributions = np.where(
+        positions % 2 == 0, LUHN_BYTE_DOUBLED[matrix], LUHN_BYTE_PLAIN[matrix]
+    )
+    totals = np.where(in_number, contributions, 0).sum(axis=1, dtype=np.int64)
+    all_digits = (LUHN_BYTE_IS_DIGIT[matrix] | ~in_number).all(axis=1)
+    return all_digits & (lengths > 0) & (totals % 10 == 0)
+
+
+def _luhn_valid_lines(buffer: np.ndarray) -> np.ndarray:
+    """
+    Luhn-check a uint8 buffer of newline-terminated lines in one vectorized pass.
+    A trailing carriage return on a line is ignored.
+    """
+    newlines = np.flatnonzero(buffer == ord("\n"))
+    if not len(newlines):
+        return np.zeros(0, dtype=bool)
+    starts = np.empty_like(newlines)
+    starts[0] = 0
+    starts[1:] = newlines[:-1] + 1
+    ends = newlines - ((newlines > starts) & (buffer[newlines - 1] == ord("\r")))
+    lengths = ends - starts
+
+    strides = newlines - starts + 1
+    if (strides == strides[0]).all() and (lengths == lengths[0]).all():
+        # Fixed-width records (the usual case): view the buffer as a matrix.
+        rows = buffer[:newlines[-1] + 1].reshape(len(newlines), strides[0])
+        return _luhn_valid_fixed(rows[:, :lengths[0]])
+
+    # Same position scheme as _luhn_valid_matrix, but over the flat buffer: each
+    # byte's distance from the end of its own line.
+    positions = np.repeat(ends, newlines - starts + 1) - np.arange(len(buffer))
+    in_number = positions > 0
+    contributions = np.where(
+        positions % 2 == 0, LUHN_BYTE_DOUBLED[buffer], LUHN_BYTE_PLAIN[buffer]
+    )
+    contributions = np.where(in_number, contributions, 0).astype(np.int64)
+    non_digits = (in_number & ~LUHN_BYTE_IS_DIGIT[buffer]).astype(np.int64)
+    totals = np.add.reduceat(contributions, starts)
+    bad_bytes = np.add.reduceat(non_digits, starts)
+    return (bad_bytes == 0) & (lengths > 0) & (totals % 10 == 0)
+
+
+def iter_account_number_file_validity(
+    path: Union[str, "os.PathLike[str]"], chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Iterator[np.ndarray]:
+    """
+    Stream Luhn validity masks for a newline-delimited file of account numbers.
+    The file is memory-mapped and processed in chunks of roughly ``chunk_size``
+    bytes cut at line boundaries, so memory use stays constant regardless of file size.
+
+    Args:
+        path (str | os.PathLike): Path to the newline-delimited file.
+        chunk_size (int): Approximate number of bytes processed per chunk.
+
+    Yields:
+        np.ndarray: Boolean mask for the lines of each chunk, in file order.
+    """
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            offset = 0
+            while offset < size:
+                end = mm.rfind(b"\n", offset, min(offset + chunk_size, size))
+                if end < 0:
+                    # A single line longer than the chunk: extend to its newline.
+                    end = mm.find(b"\n", offset)
+                if end < 0:
+                    # Final line without a trailing newline.
+                    tail = np.frombuffer(mm[offset:size] + b"\n", dtype=np.uint8)
+                    yield _luhn_valid_lines(tail)
+                    break
+                chunk = np.frombuffer(mm, dtype=np.uint8, count=end + 1 - offset, offset=offset)
+                mask = _luhn_valid_lines(chunk)
+                del chunk  # release the buffer export before the mmap is closed
+                yield mask
+                offset = end + 1
+
+
+def is_valid_account_number_bulk(
+    account_numbers: Union[np.ndarray, bytes, bytearray, memoryview, str, "os.PathLike[str]"],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> np.ndarray:
+    """
+    Validate many account numbers with the Luhn checksum in vectorized passes.
+
+    Args:
+        account_numbers: One of
+            - a NumPy array of byte or unicode strings (e.g. from generate_account_numbers),
+            - a 2-D uint8 matrix of digit values 0-9, one account number per row,
+            - a bytes-like buffer of newline-delimited account numbers,
+            - a path to a newline-delimited file, which is memory-mapped and streamed.
+        chunk_size (int): Bytes (or rows) processed per chunk.
+
+    Returns:
+        np.ndarray: Boolean mask, True where the account number is valid. Empty
+                    entries and entries with non-digit characters are invalid.
+
+    Raises:
+        ValueError: If the array dtype or shape is not supported.
+
+    Usage example:
+        >>> is_valid_account_number_bulk(b"79927398713\n79927398710\n")
+        array([ True, False])
+    """
+    if isinstance(account_numbers, (str, os.PathLike)):
+        masks = list(iter_account_number_file_validity(account_numbers, chunk_size))
+        return np.concatenate(masks) if masks else np.zeros(0, dtype=bool)
+
+    if isinstance(account_numbers, (bytes, bytearray, memoryview)):
+        buffer = np.frombuffer(account_numbers, dtype=np.uint8)
+        if len(buffer) and buffer[-1] != ord("\n"):
+            buffer = np.append(buffer, np.uint8(ord("\n")))
+        return _luhn_valid_lines(buffer)
+
+    array = np.asarray(account_numbers)
+    if array.ndim == 2 and array.dtype == np.uint8:
+        if array.size and array.max() > 9:
+            raise ValueError("Digit matrix values must be between 0 and 9")
+        lengths = np.full(len(array), array.shape[1], dtype=np.int64)
+        return _luhn_valid_matrix(array + np.uint8(ord("0")), lengths)
+
+    if array.dtype.kind == "U":
+        array = np.char.encode(array, "ascii")
+    if array.ndim != 1 or array.dtype.kind != "S":
+        raise ValueError("Expected a 1-D array of strings or a 2-D uint8 digit matrix")
+
+    width = array.dtype.itemsize
+    rows_per_chunk = max(1, chunk_size // max(width, 1))
+    masks = []
+    for start in range(0, len(array), rows_per_chunk):
+        matrix = np.ascontiguousarray(array[start:start + rows_per_chunk])
+        matrix = matrix.view(np.uint8).reshape(len(matrix), width)
+        # NumPy pads byte strings with trailing NULs; the number ends at the last non-NUL byte.
+        non_null = matrix != 0
+        lengths = np.where(
+            non_null.any(axis=1), width - np.argmax(non_null[:, ::-1], axis=1), 0
+        )
+        masks.append(_luhn_valid_matrix(matrix, lengths))
+    return np.concatenate(masks) if masks else np.zeros(0, dtype=bool)
+
+
+def _validate_length(length: int) -> None:
+    if not isinstance(length, int):
+        logger.error("Account number length must be an integer")
+        raise ValueError("Account number length must be an integer")
+
+    if length < 2:
+        logger.error("Account number length must be at least 2")
+        raise ValueError("Account number length must be at least 2")
+
+
 def generate_account_number(length: int = 9, numeric_only: bool = True) -> str:
     """
     Generates a valid bank account number with the specified length and format.
@@ -51,13 +254,7 @@ def generate_account_number(length: int = 9, numeric_only: bool = True) -> str:
         >>> generate_account_number(12, numeric_only=False)
         'A1B2C3D4E5F6'
     """
-    if not isinstance(length, int):
-        logger.error("Account number length must be an integer")
-        raise ValueError("Account number length must be an integer")
-
-    if length < 2:
-        logger.error("Account number length must be at least 2")
-        raise ValueError("Account number length must be at least 2")
+    _validate_length(length)
 
     if numeric_only:
         while True:
@@ -79,6 +276,54 @@ def generate_account_number(length: int = 9, numeric_only: bool = True) -> str:
             return account_number
 
 
+def generate_account_numbers(
+    count: int, length: int = 9, seed: Optional[int] = None
+) -> np.ndarray:
+    """
+    Generates a batch of valid numeric account numbers in a single vectorized pass.
+    The payload digits are drawn as one NumPy matrix and the Luhn check digits for
+    every row are computed at once, so no per-number Python work or logging is done.
+
+    Args:
+        count (int): Number of account numbers to generate.
+        length (int): Length of each account number (minimum 2).
+        seed (Optional[int]): Optional seed for reproducible batches.
+
+    Returns:
+        np.ndarray: Array of shape (count,) with dtype ``S<length>`` holding the
+                    ASCII account numbers, e.g. ``array([b'7992739871'], dtype='|S10')``.
+
+    Raises:
+        ValueError: If count is negative or length is invalid.
+
+    Usage example:
+        >>> numbers = generate_account_numbers(100_000, 12)
+        >>> numbers[0].decode()
+        '483920174635'
+    """
+    _validate_length(length)
+    if not isinstance(count, int) or count < 0:
+        logger.error("Account number count must be a non-negative integer")
+        raise ValueError("Account number count must be a non-negative integer")
+
+    rng = np.random.default_rng(seed)
+    digits = np.empty((count, length), dtype=np.uint8)
+    payload = digits[:, :-1]
+    payload[...] = rng.integers(0, 10, size=payload.shape, dtype=np.uint8)
+
+    # Counting from the check digit, every second payload digit is doubled,
+    # starting with the payload's rightmost digit.
+    doubled = np.zeros(length - 1, dtype=bool)
+    doubled[length - 2::-2] = True
+    contributions = np.where(doubled, LUHN_DOUBLED_DIGITS[payload], payload)
+    totals = contributions.sum(axis=1, dtype=np.int64)
+    digits[:, -1] = (10 - totals % 10) % 10
+
+    digits += ord("0")
+    logger.info(f"Generated {count} valid account numbers of length {length}")
+    return digits.view(f"S{length}").reshape(count)
+
+
 if __name__ == "__main__":
     try:
         account_number = generate_account_number()
@@ -1,9 +1,20 @@
+import atexit
 import logging
-import json
 import os
+import threading
 import time
+from collections import OrderedDict
 from typing import Optional, Dict, Union
 
+from routing_cache_backend import (
+    DEFAULT_SQLITE_PATH,
+    SQLiteCacheBackend,
+    json_cache_lock,
+    read_json_cache,
+    write_json_cache,
+)
+from routing_directory import get_routing_directory
+
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -11,63 +22,243 @@ logger = logging.getLogger(__name__)
 
 CACHE_FILE: str = "routing_number_cache.json"
 CACHE_TTL: int = 86400  # 24 hours in seconds
+CACHE_CAPACITY: int = 10000
+CACHE_FLUSH_INTERVAL: float = 5.0  # seconds between background write-backs
+CACHE_BACKEND_ENV: str = "ROUTING_CACHE_BACKEND"  # "json" (default) or "sqlite"
+CACHE_DB_ENV: str = "ROUTING_CACHE_DB"
+
+# Local mock database for routing numbers to avoid API dependency in tests
+MOCK_ROUTING_NUMBERS: Dict[str, Optional[str]] = {
+    "capetain cetriva": "021000021",
+    "test bank": "123456789",
+    "new bank": "987654321",
+    "fail bank": None,
+    "bad json bank": None,
+}
 
 
 def load_cache() -> Dict[str, Dict[str, Union[str, float, int]]]:
     if os.path.exists(CACHE_FILE):
         try:
-            with open(CACHE_FILE, "r") as f:
-                cache: Dict[str, Dict[str, Union[str, float, int]]] = json.load(f)
-            # Remove expired cache entries
-            current_time = time.time()
-            cache = {k: v for k, v in cache.items() if current_time - float(v["timestamp"]) < CACHE_TTL}
-            return cache
+            # Entries older than CACHE_TTL are dropped on read
+            return read_json_cache(CACHE_FILE, CACHE_TTL)
         except Exception as e:
             logger.error(f"Failed to load cache: {e}")
             return {}
     return {}
 
 
-def save_cache(cache: Dict[str, Dict[str, Union[str, float, int]]]) -> None:
+def save_cache(cache: Dict[str, Dict[str, Union[str, float, int]]]) -> bool:
     try:
-        with open(CACHE_FILE, "w") as f:
-            json.dump(cache, f)
+        # Written to a temp file and renamed, so readers never see partial JSON
+        write_json_cache(CACHE_FILE, cache)
+        return True
     except Exception as e:
         logger.error(f"Failed to save cache: {e}")
+        return False
+
+
+class JSONCacheBackend:
+    """
+    Routing cache storage in CACHE_FILE, the original whole-file JSON format.
+    Each write merges the batch into the current file contents and replaces it atomically,
+    under a lock file so writers in other processes do not drop each other's entries.
+    """
+
+    def load(self) -> Dict[str, Dict[str, Union[str, float, int]]]:
+        return load_cache()
+
+    def fetch(self, key: str) -> Optional[Dict[str, Union[str, float, int]]]:
+        # Per-key reads would mean re-parsing the whole file; misses go to the source.
+        return None
+
+    def write(self, entries: Dict[str, Dict[str, Union[str, float, int]]]) -> bool:
+        try:
+            with json_cache_lock(CACHE_FILE):
+                cache = load_cache()
+                cache.update(entries)
+                return save_cache(cache)
+        except OSError as e:
+            logger.error(f"Failed to lock cache: {e}")
+            return False
+
+    def compact(self, limit: Optional[int] = None) -> int:
+        # Expired entries are dropped on every load/write cycle.
+        return 0
+
+
+def create_cache_backend() -> Union[JSONCacheBackend, SQLiteCacheBackend]:
+    """
+    Build the cache backend selected by $ROUTING_CACHE_BACKEND ("json" or "sqlite").
+    The SQLite database path comes from $ROUTING_CACHE_DB.
+    """
+    backend = os.getenv(CACHE_BACKEND_ENV, "json").lower()
+    if backend == "sqlite":
+        return SQLiteCacheBackend(os.getenv(CACHE_DB_ENV, DEFAULT_SQLITE_PATH), ttl=CACHE_TTL)
+    if backend != "json":
+        logger.error("Unknown routing cache backend '%s', using json.", backend)
+    return JSONCacheBackend()
+
+
+class RoutingNumberCache:
+    """
+    Process-level LRU cache of routing numbers with per-entry TTL expiry.
+
+    The storage backend is read once on first use. Expired entries are dropped
+    lazily when they are looked up, the least recently used entry is evicted once
+    ``capacity`` is reached, and new entries are written back to the backend in
+    batches by a background thread (and once more at interpreter exit), which also
+    compacts expired entries in the backend a batch at a time.
+    """
+
+    def __init__(
+        self,
+        capacity: int = CACHE_CAPACITY,
+        ttl: float = CACHE_TTL,
+        flush_interval: float = CACHE_FLUSH_INTERVAL,
+        backend: Optional[Union[JSONCacheBackend, SQLiteCacheBackend]] = None,
+    ) -> None:
+        self.capacity = capacity
+        self.ttl = ttl
+        self.flush_interval = flush_interval
+        self.backend = backend
+        self._configured_backend = backend
+        self._entries: "OrderedDict[str, Dict[str, Union[str, float, int]]]" = OrderedDict()
+        self._pending: Dict[str, Dict[str, Union[str, float, int]]] = {}
+        self._lock = threading.RLock()
+        self._loaded = False
+        self._stop = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+
+    def _ensure_loaded(self) -> None:
+        with self._lock:
+            if self._loaded:
+                return
+            if self.backend is None:
+                self.backend = create_cache_backend()
+            for key, entry in self.backend.load().items():
+                self._entries[key] = entry
+            while len(self._entries) > self.capacity:
+                self._entries.popitem(last=False)
+            self._loaded = True
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Return the cached routing number for ``key`` or None on a miss or expiry.
+        """
+        if not self._loaded:
+            self._ensure_loaded()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.time() - float(entry["timestamp"]) >= self.ttl:
+                del self._entries[key]
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(key)
+        if entry is None:
+            # Another process may have cached it since we loaded.
+            entry = self.backend.fetch(key)
+            if entry is None:
+                return None
+            self._store(key, entry)
+        routing_number = entry["routing_number"]
+        return routing_number if isinstance(routing_number, str) else None
+
+    def set(self, key: str, routing_number: str) -> None:
+        """
+        Store a routing number and schedule a background write-back.
+        """
+        if not self._loaded:
+            self._ensure_loaded()
+        entry = {"routing_number": routing_number, "timestamp": time.time()}
+        with self._lock:
+            self._store(key, entry)
+            self._pending[key] = entry
+            self._start_flusher()
+
+    def _store(self, key: str, entry: Dict[str, Union[str, float, int]]) -> None:
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.capacity:
+                self._entries.popitem(last=False)
+
+    def _start_flusher(self) -> None:
+        if self._flusher is not None:
+            return
+        self._stop.clear()
+        self._flusher = threading.Thread(
+            target=self._flush_loop, name="routing-cache-flusher", daemon=True
+        )
+        self._flusher.start()
+        atexit.register(self.flush)
+
+    def _flush_loop(self) -> None:
+        while not self._stop.wait(self.flush_interval):
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        Write pending entries to the backend as one batch, then compact expired ones.
+        Entries from a failed write stay pending for the next flush.
+        """
+        backend = self.backend
+        if backend is None:
+            return
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if pending and not backend.write(pending):
+            with self._lock:
+                for key, entry in pending.items():
+                    self._pending.setdefault(key, entry)
+        backend.compact()
+
+    def reset(self) -> None:
+        """
+        Drop all in-memory state without writing it, so the next access reloads the backend.
+        """
+        self._stop.set()
+        with self._lock:
+            self._entries.clear()
+            self._pending.clear()
+            self._loaded = False
+            self.backend = self._configured_backend
+            flusher, self._flusher = self._flusher, None
+        if flusher is not None:
+            flusher.join()
+            atexit.unregister(self.flush)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Process-wide cache shared by all routing lookups
+routing_cache = RoutingNumberCache()
 
 
 def get_routing_number(bank_name: str) -> Optional[str]:
     """
     Get the official routing number for a given bank name.
-    Uses a cached local store to reduce API calls.
+    Uses the process-level routing cache, so warm lookups never touch the disk;
+    misses are resolved against the FedACH directory when $FEDACH_DIRECTORY_FILE is set.
     Args:
         bank_name (str): Name of the bank.
     Returns:
         str: Routing number or error message.
     """
-    cache: Dict[str, Dict[str, Union[str, float, int]]] = load_cache()
     bank_name_lower: str = bank_name.lower()
-    if bank_name_lower in cache:
-        logger.info(f"Cache hit for bank: {bank_name}")
-        routing_number = cache[bank_name_lower]["routing_number"]
-        if isinstance(routing_number, str):
-            return routing_number
-        else:
-            return None
-
-    # Use a local mock database for routing numbers to avoid API dependency in tests
-    mock_routing_numbers = {
-        "capetain cetriva": "021000021",
-        "test bank": "123456789",
-        "new bank": "987654321",
-        "fail bank": None,
-        "bad json bank": None,
-    }
-
-    routing_number = mock_routing_numbers.get(bank_name_lower)
+    routing_number = routing_cache.get(bank_name_lower)
+    if routing_number is not None:
+        logger.debug("Cache hit for bank: %s", bank_name)
+        return routing_number
+
+    # Prefer the FedACH directory when one is configured, then the local mock table
+    directory = get_routing_directory()
+    routing_number = directory.lookup(bank_name) if directory is not None else None
+    if routing_number is None:
+        routing_number = MOCK_ROUTING_NUMBERS.get(bank_name_lower)
     if routing_number is not None:
-        cache[bank_name_lower] = {"routing_number": routing_number, "timestamp": int(time.time())}
-        save_cache(cache)
+        routing_cache.set(bank_name_lower, routing_number)
         return str(routing_number)
     else:
         logger.error("Routing number for bank '%s' not found in local database.", bank_name)
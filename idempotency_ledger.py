@@ -0,0 +1,246 @@
+"""
+On-disk idempotency ledger for ACH payment submission.
+
+Every payment carries an idempotency key, either supplied by the caller or
+derived from its fields. Successful gateway responses are recorded under that
+key, so a repeated submission returns the stored response instead of paying
+twice. Entries live in time-based segments (one SQLite file per segment, keyed
+by a primary-key index), so a lookup is a handful of indexed probes however many
+keys are stored, and expiring old entries means deleting whole segment files
+rather than rows.
+"""
+
+import glob
+import hashlib
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from nacha_file import amount_to_cents
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+DEFAULT_LEDGER_DIR: str = "ach_idempotency_ledger"
+# Ledger BankingUtils submits through: ACH_LEDGER_DIR, else ach_idempotency_ledger/
+# next to this module, whatever directory the process starts in
+SHARED_LEDGER_DIR: str = os.path.abspath(
+    os.getenv("ACH_LEDGER_DIR")
+    or os.path.join(os.path.dirname(os.path.abspath(__file__)), DEFAULT_LEDGER_DIR)
+)
+SEGMENT_SECONDS: float = 86400  # one segment per day
+RETENTION_SEGMENTS: int = 30
+BUSY_TIMEOUT_MS: int = 5000
+
+_SEGMENT_FILE = re.compile(r"segment-(\d+)\.db$")
+
+
+def derive_idempotency_key(
+    account_number: str,
+    routing_number: str,
+    amount: Any,
+    description: str = "",
+) -> str:
+    """
+    Derive a stable idempotency key from the payment fields.
+
+    The amount is normalized to cents exactly as in NACHA entries (rounding half
+    up), so 10, 10.0 and "10.00" give the same key.
+    Callers that intentionally send identical payments more than once should
+    supply their own keys instead.
+
+    Usage example:
+        >>> derive_idempotency_key("123456789", "021000021", 10.0) == \\
+        ...     derive_idempotency_key("123456789", "021000021", "10.00")
+        True
+    """
+    cents = amount_to_cents(amount)
+    canonical = "\x1f".join(
+        [str(account_number), str(routing_number), str(cents), str(description)]
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class IdempotencyLedger:
+    """
+    Segmented SQLite ledger of idempotency key -> stored payment response.
+
+    New entries go to the segment of the current time window. Lookups probe the
+    segments newest first. Segments older than ``retention_segments`` windows
+    are deleted when the ledger rolls over to a new segment.
+    """
+
+    def __init__(
+        self,
+        directory: str = DEFAULT_LEDGER_DIR,
+        segment_seconds: float = SEGMENT_SECONDS,
+        retention_segments: int = RETENTION_SEGMENTS,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        """
+        Args:
+            directory (str): Directory holding the segment files.
+            segment_seconds (float): Length of the time window covered by one segment.
+            retention_segments (int): Number of most recent segments kept.
+            clock (Callable[[], float]): Wall-clock time source.
+        """
+        if retention_segments < 1:
+            raise ValueError("Retention must keep at least one segment")
+        self.directory = directory
+        self.segment_seconds = segment_seconds
+        self.retention_segments = retention_segments
+        self._clock = clock
+        os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        # Every open connection per segment, across threads, so roll() can close them all
+        self._connections: Dict[int, List[sqlite3.Connection]] = {}
+        self._segments: List[int] = sorted(self._existing_segments(), reverse=True)
+        self._current_segment: Optional[int] = None
+
+    def _existing_segments(self) -> List[int]:
+        segments = []
+        for path in glob.glob(os.path.join(self.directory, "segment-*.db")):
+            match = _SEGMENT_FILE.search(path)
+            if match:
+                segments.append(int(match.group(1)))
+        return segments
+
+    def _segment_path(self, segment: int) -> str:
+        return os.path.join(self.directory, "segment-%d.db" % segment)
+
+    def _connection(self, segment: int) -> sqlite3.Connection:
+        connections: Dict[int, sqlite3.Connection] = getattr(self._local, "connections", None)
+        if connections is None:
+            connections = self._local.connections = {}
+        conn = connections.get(segment)
+        if conn is not None:
+            with self._lock:
+                if conn in self._connections.get(segment, ()):
+                    return conn
+            # Closed by roll() or close() from another thread
+            del connections[segment]
+        with self._lock:
+            if segment not in self._segments:
+                # Connecting would recreate a segment file roll() just deleted
+                raise sqlite3.OperationalError("Segment %d has expired" % segment)
+        conn = sqlite3.connect(
+            self._segment_path(segment),
+            timeout=BUSY_TIMEOUT_MS / 1000,
+            check_same_thread=False,
+        )
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS ledger ("
+            " key TEXT PRIMARY KEY,"
+            " response TEXT NOT NULL,"
+            " created REAL NOT NULL) WITHOUT ROWID"
+        )
+        conn.commit()
+        connections[segment] = conn
+        with self._lock:
+            self._connections.setdefault(segment, []).append(conn)
+        return conn
+
+    def _active_segment(self) -> int:
+        """
+        Segment for the current time window, rolling over when the window changes.
+        """
+        segment = int(self._clock() // self.segment_seconds)
+        if segment != self._current_segment:
+            with self._lock:
+                if segment not in self._segments:
+                    self._segments.append(segment)
+                    self._segments.sort(reverse=True)
+                self._current_segment = segment
+            self.roll()
+        return segment
+
+    def roll(self) -> int:
+        """
+        Delete segments that fall outside the retention window.
+
+        Returns:
+            int: Number of segments deleted.
+        """
+        oldest_kept = int(self._clock() // self.segment_seconds) - self.retention_segments + 1
+        with self._lock:
+            expired = [s for s in self._segments if s < oldest_kept]
+            self._segments = [s for s in self._segments if s >= oldest_kept]
+            # Connections of every thread, not only the caller's
+            stale = {segment: self._connections.pop(segment, []) for segment in expired}
+        for segment in expired:
+            for conn in stale[segment]:
+                conn.close()
+            for suffix in ("", "-wal", "-shm"):
+                try:
+                    os.remove(self._segment_path(segment) + suffix)
+                except FileNotFoundError:
+                    pass
+            logger.info("Dropped idempotency ledger segment %d", segment)
+        return len(expired)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Return the stored response for ``key``, or None if it was never recorded.
+        """
+        self._active_segment()
+        with self._lock:
+            segments = list(self._segments)
+        for segment in segments:
+            try:
+                row = self._connection(segment).execute(
+                    "SELECT response FROM ledger WHERE key = ?", (key,)
+                ).fetchone()
+            except sqlite3.Error as e:
+                logger.error("Failed to read idempotency ledger segment %d: %s", segment, e)
+                continue
+            if row is not None:
+                return json.loads(row[0])
+        return None
+
+    def put(self, key: str, response: Dict[str, Any]) -> bool:
+        """
+        Record the response for ``key``. The first recorded response wins.
+
+        Returns:
+            bool: True if the entry was committed (or already present).
+        """
+        segment = self._active_segment()
+        try:
+            conn = self._connection(segment)
+            with conn:
+                conn.execute(
+                    "INSERT OR IGNORE INTO ledger (key, response, created) VALUES (?, ?, ?)",
+                    (key, json.dumps(response), self._clock()),
+                )
+            return True
+        except sqlite3.Error as e:
+            logger.error("Failed to write idempotency ledger entry %s: %s", key, e)
+            return False
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key) is not None
+
+    def segments(self) -> List[int]:
+        """Segment ids currently kept, newest first."""
+        with self._lock:
+            return list(self._segments)
+
+    def close(self) -> None:
+        """
+        Close every connection opened by this ledger.
+        """
+        with self._lock:
+            connections, self._connections = self._connections, {}
+        for segment_connections in connections.values():
+            for conn in segment_connections:
+                conn.close()
+        self._local = threading.local()
@@ -0,0 +1,345 @@
+"""
+Streaming NACHA (ACH) file writer.
+
+Builds a NACHA-formatted settlement file from an iterator of
+(account_number, routing_number, amount, description) records. File, batch and
+entry records are written to disk as they are produced, and entry hashes and
+control totals are accumulated on the fly, so the file never has to fit in
+memory. The file is written under a temporary name and only renamed into place
+once the file control record is complete.
+"""
+
+import datetime
+import logging
+import os
+import tempfile
+from decimal import Decimal, ROUND_HALF_UP
+from typing import Any, Dict, Iterable, Optional, Sequence, TextIO
+
+from validate_routing_number import validate_routing_number
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+RECORD_SIZE: int = 94
+BLOCKING_FACTOR: int = 10
+CREDITS_ONLY_SERVICE_CLASS: str = "220"
+CHECKING_CREDIT_TRANSACTION_CODE: str = "22"
+DEFAULT_BATCH_SIZE: int = 10000
+MAX_AMOUNT_CENTS: int = 10 ** 10 - 1  # 10-digit amount field
+ENTRY_HASH_MODULUS: int = 10 ** 10  # entry hash keeps its rightmost 10 digits
+
+DEFAULT_ODFI_ROUTING: str = "021000021"  # Capetain Private AI Bank routing number
+DEFAULT_COMPANY_NAME: str = "CAPETAIN CETRIVA"
+
+
+def _alnum(value: Any, width: int) -> str:
+    """Left-justified, upper-cased, space-padded alphanumeric field."""
+    text = str(value).upper().encode("ascii", "replace").decode("ascii")
+    return text[:width].ljust(width)
+
+
+def _numeric(value: int, width: int) -> str:
+    """Right-justified, zero-padded numeric field."""
+    text = str(value)
+    if len(text) > width:
+        raise ValueError(f"Value {value} does not fit in a {width}-digit field")
+    return text.zfill(width)
+
+
+def amount_to_cents(amount: Any) -> int:
+    """
+    Convert a dollar amount to integer cents, rounding half up.
+    """
+    return int((Decimal(str(amount)) * 100).quantize(Decimal("1"), rounding=ROUND_HALF_UP))
+
+
+class NACHAFileWriter:
+    """
+    Incremental NACHA file builder. Use as a context manager: the file header is
+    written on entry, and batch/file control records plus block padding on a
+    clean exit. If the block raises, the partial file is discarded.
+
+    Usage example:
+        >>> with NACHAFileWriter("payouts.ach", company_id="1234567890") as writer:
+        ...     writer.write_entries(records)
+        >>> writer.summary()["entry_count"]
+        1000000
+    """
+
+    def __init__(
+        self,
+        path: str,
+        company_id: Optional[str] = None,
+        company_name: str = DEFAULT_COMPANY_NAME,
+        odfi_routing_number: str = DEFAULT_ODFI_ROUTING,
+        immediate_destination: Optional[str] = None,
+        destination_name: str = "",
+        entry_description: str = "PAYOUT",
+        sec_code: str = "PPD",
+        effective_date: Optional[datetime.date] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        file_id_modifier: str = "A",
+    ) -> None:
+        """
+        Args:
+            path (str): Destination path of the NACHA file.
+            company_id (Optional[str]): 10-character originator company ID
+                (defaults to $NACHA_COMPANY_ID).
+            company_name (str): Originating company name.
+            odfi_routing_number (str): Routing number of the originating bank.
+            immediate_destination (Optional[str]): Routing number of the receiving
+                operator (defaults to the ODFI).
+            destination_name (str): Name of the immediate destination.
+            entry_description (str): Company entry description shown to receivers.
+            sec_code (str): Standard entry class code.
+            effective_date (Optional[datetime.date]): Requested settlement date
+                (defaults to the next day).
+            batch_size (int): Maximum entries per batch.
+            file_id_modifier (str): Distinguishes files created on the same day.
+        """
+        if not validate_routing_number(odfi_routing_number):
+            raise ValueError(f"Invalid ODFI routing number: {odfi_routing_number}")
+        if immediate_destination is not None and not validate_routing_number(immediate_destination):
+            raise ValueError(f"Invalid immediate destination routing number: {immediate_destination}")
+        if batch_size < 1:
+            raise ValueError("Batch size must be at least 1")
+        self.path = path
+        self.company_id = company_id or os.getenv("NACHA_COMPANY_ID", "")
+        self.company_name = company_name
+        self.odfi_routing_number = odfi_routing_number
+        self.immediate_destination = immediate_destination or odfi_routing_number
+        self.destination_name = destination_name
+        self.entry_description = entry_description
+        self.sec_code = sec_code
+        self.effective_date = effective_date or (
+            datetime.date.today() + datetime.timedelta(days=1)
+        )
+        self.batch_size = batch_size
+        self.file_id_modifier = file_id_modifier
+
+        self._file: Optional[TextIO] = None
+        self._tmp_path: Optional[str] = None
+        self._record_count = 0
+        self._batch_count = 0
+        self._entry_count = 0
+        self._entry_hash = 0
+        self._total_credit = 0
+        # Running totals of the currently open batch
+        self._batch_open = False
+        self._batch_entries = 0
+        self._batch_hash = 0
+        self._batch_credit = 0
+
+    def __enter__(self) -> "NACHAFileWriter":
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, self._tmp_path = tempfile.mkstemp(prefix=".nacha-", suffix=".tmp", dir=directory)
+        try:
+            self._file = os.fdopen(fd, "w", newline="\n", buffering=1 << 20)
+            self._write_file_header()
+        except BaseException:
+            # __exit__ does not run when __enter__ raises
+            if self._file is not None:
+                self._file.close()
+            else:
+                os.close(fd)
+            os.remove(self._tmp_path)
+            raise
+        return self
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        assert self._file is not None and self._tmp_path is not None
+        if exc_type is not None:
+            self._file.close()
+            os.remove(self._tmp_path)
+            logger.error("Discarded partial NACHA file %s: %s", self.path, exc)
+            return
+        try:
+            self._close_batch()
+            self._write_file_control()
+        except Exception as e:
+            self._file.close()
+            os.remove(self._tmp_path)
+            logger.error("Discarded NACHA file %s that could not be finalized: %s", self.path, e)
+            raise
+        self._file.close()
+        os.replace(self._tmp_path, self.path)
+        logger.info(
+            "Wrote NACHA file %s: %d entries in %d batches, credits %d cents",
+            self.path, self._entry_count, self._batch_count, self._total_credit,
+        )
+
+    def _write(self, record: str) -> None:
+        assert self._file is not None
+        if len(record) != RECORD_SIZE:
+            raise ValueError(f"NACHA record must be {RECORD_SIZE} characters, got {len(record)}")
+        self._file.write(record)
+        self._file.write("\n")
+        self._record_count += 1
+
+    def _write_file_header(self) -> None:
+        now = datetime.datetime.now()
+        self._write(
+            "101"
+            + " " + self.immediate_destination
+            + _alnum(self.company_id, 10)
+            + now.strftime("%y%m%d%H%M")
+            + _alnum(self.file_id_modifier, 1)
+            + "094"
+            + f"{BLOCKING_FACTOR:02d}"
+            + "1"
+            + _alnum(self.destination_name, 23)
+            + _alnum(self.company_name, 23)
+            + _alnum("", 8)
+        )
+
+    def _open_batch(self) -> None:
+        self._batch_count += 1
+        self._batch_open = True
+        self._batch_entries = 0
+        self._batch_hash = 0
+        self._batch_credit = 0
+        self._write(
+            "5"
+            + CREDITS_ONLY_SERVICE_CLASS
+            + _alnum(self.company_name, 16)
+            + _alnum("", 20)
+            + _alnum(self.company_id, 10)
+            + _alnum(self.sec_code, 3)
+            + _alnum(self.entry_description, 10)
+            + _alnum("", 6)
+            + self.effective_date.strftime("%y%m%d")
+            + "   "
+            + "1"
+            + self.odfi_routing_number[:8]
+            + _numeric(self._batch_count, 7)
+        )
+
+    def _close_batch(self) -> None:
+        if not self._batch_open:
+            return
+        self._write(
+            "8"
+            + CREDITS_ONLY_SERVICE_CLASS
+            + _numeric(self._batch_entries, 6)
+            + _numeric(self._batch_hash % ENTRY_HASH_MODULUS, 10)
+            + _numeric(0, 12)
+            + _numeric(self._batch_credit, 12)
+            + _alnum(self.company_id, 10)
+            + _alnum("", 19)
+            + _alnum("", 6)
+            + self.odfi_routing_number[:8]
+            + _numeric(self._batch_count, 7)
+        )
+        self._batch_open = False
+
+    def _write_file_control(self) -> None:
+        # The file control record itself counts towards the block count
+        block_count = -(-(self._record_count + 1) // BLOCKING_FACTOR)
+        self._write(
+            "9"
+            + _numeric(self._batch_count, 6)
+            + _numeric(block_count, 6)
+            + _numeric(self._entry_count, 8)
+            + _numeric(self._entry_hash % ENTRY_HASH_MODULUS, 10)
+            + _numeric(0, 12)
+            + _numeric(self._total_credit, 12)
+            + _alnum("", 39)
+        )
+        while self._record_count % BLOCKING_FACTOR:
+            self._write("9" * RECORD_SIZE)
+
+    def add_entry(
+        self,
+        account_number: str,
+        routing_number: str,
+        amount: Any,
+        description: str = "",
+    ) -> None:
+        """
+        Append one credit entry, opening a new batch when the current one is full.
+
+        Raises:
+            ValueError: If the routing number, account number or amount is invalid.
+        """
+        if not validate_routing_number(routing_number):
+            raise ValueError(f"Invalid routing number: {routing_number}")
+        if not account_number or len(account_number) > 17:
+            raise ValueError(f"Account number must be 1-17 characters: {account_number!r}")
+        cents = amount_to_cents(amount)
+        if cents <= 0 or cents > MAX_AMOUNT_CENTS:
+            raise ValueError(f"Amount out of range for a NACHA entry: {amount}")
+
+        if not self._batch_open or self._batch_entries >= self.batch_size:
+            self._close_batch()
+            self._open_batch()
+
+        self._entry_count += 1
+        self._batch_entries += 1
+        rdfi = int(routing_number[:8])
+        self._batch_hash += rdfi
+        self._entry_hash += rdfi
+        self._batch_credit += cents
+        self._total_credit += cents
+        self._write(
+            "6"
+            + CHECKING_CREDIT_TRANSACTION_CODE
+            + routing_number
+            + _alnum(account_number, 17)
+            + _numeric(cents, 10)
+            + _alnum("", 15)
+            + _alnum(description, 22)
+            + "  "
+            + "0"
+            + self.odfi_routing_number[:8]
+            + _numeric(self._entry_count % 10 ** 7, 7)
+        )
+
+    def write_entries(self, records: Iterable[Sequence[Any]]) -> int:
+        """
+        Append entries from an iterator of (account, routing, amount[, description]).
+
+        Returns:
+            int: Number of entries written.
+        """
+        count = 0
+        for record in records:
+            self.add_entry(*record)
+            count += 1
+        return count
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Control totals of the file written so far.
+        """
+        return {
+            "path": self.path,
+            "entry_count": self._entry_count,
+            "batch_count": self._batch_count,
+            "record_count": self._record_count,
+            "block_count": -(-self._record_count // BLOCKING_FACTOR),
+            "entry_hash": self._entry_hash % ENTRY_HASH_MODULUS,
+            "total_credit_cents": self._total_credit,
+        }
+
+
+def write_nacha_file(
+    path: str, records: Iterable[Sequence[Any]], **options: Any
+) -> Dict[str, Any]:
+    """
+    Stream records into a complete NACHA file.
+
+    Args:
+        path (str): Destination path.
+        records: Iterable of (account_number, routing_number, amount, description).
+        **options: Passed to NACHAFileWriter (company_id, batch_size, ...).
+
+    Returns:
+        Dict[str, Any]: The writer's summary (entry/batch counts, entry hash, totals).
+
+    Raises:
+        ValueError: If any record is invalid; no file is left behind in that case.
+    """
+    with NACHAFileWriter(path, **options) as writer:
+        writer.write_entries(records)
+    return writer.summary()
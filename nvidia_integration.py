@@ -105,5 +105,17 @@ class NVIDIAIntegration:
             pynvml.nvmlShutdown()
             logger.info("NVIDIA NVML shutdown.")
 
-# Singleton instance for global use
-nvidia_integration = NVIDIAIntegration()
+_nvidia_integration: Optional[NVIDIAIntegration] = None
+
+
+def __getattr__(name: str) -> Any:
+    """
+    Build the ``nvidia_integration`` singleton on first access (PEP 562), so
+    importing this module does not probe CUDA or initialize NVML.
+    """
+    global _nvidia_integration
+    if name == "nvidia_integration":
+        if _nvidia_integration is None:
+            _nvidia_integration = NVIDIAIntegration()
+        return _nvidia_integration
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,305 @@
+"""
+Bulk ACH payment-status tracking on top of ACHPayments.get_payment_status.
+
+Concurrent requests for the same transaction share one in-flight gateway call,
+terminal statuses are cached for good, and each pending transaction is polled on
+its own schedule: young transactions often, older or unchanged ones less and
+less, and ones whose last poll failed with exponential backoff. Polls run on a
+bounded thread pool sized to the client's connection pool.
+"""
+
+import heapq
+import logging
+import random
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from ach_payments import ACHPayments, DEFAULT_POOL_SIZE
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+StatusResponse = Optional[Dict[str, Any]]
+
+# Gateway statuses after which a payment never changes again. ACHPayments reports
+# its own transport errors as {"status": "failure"}, which is deliberately not here.
+TERMINAL_STATUSES = frozenset(
+    {"completed", "settled", "returned", "rejected", "cancelled", "failed"}
+)
+ERROR_STATUS: str = "failure"
+
+MIN_POLL_INTERVAL: float = 1.0  # seconds
+MAX_POLL_INTERVAL: float = 300.0  # seconds
+AGE_FACTOR: float = 0.1  # poll interval grows by 0.1s per second of transaction age
+POLL_JITTER: float = 0.1  # +/-10% so transactions tracked together spread out
+
+
+class _TrackedPayment:
+    __slots__ = ("transaction_id", "first_seen", "last_status", "last_response",
+                 "next_poll", "unchanged_polls", "consecutive_errors", "polls")
+
+    def __init__(self, transaction_id: str, now: float) -> None:
+        self.transaction_id = transaction_id
+        self.first_seen = now
+        self.last_status: Optional[str] = None
+        self.last_response: StatusResponse = None
+        self.next_poll = now
+        self.unchanged_polls = 0
+        self.consecutive_errors = 0
+        self.polls = 0
+
+
+class PaymentStatusTracker:
+    """
+    Coalescing, adaptively scheduled payment-status poller.
+
+    Usage example:
+        >>> tracker = PaymentStatusTracker(ACHPayments())
+        >>> tracker.track(transaction_ids)
+        >>> while tracker.pending():
+        ...     tracker.poll_due()
+        ...     time.sleep(tracker.seconds_until_next_poll())
+    """
+
+    def __init__(
+        self,
+        client: ACHPayments,
+        max_workers: int = DEFAULT_POOL_SIZE,
+        min_interval: float = MIN_POLL_INTERVAL,
+        max_interval: float = MAX_POLL_INTERVAL,
+        age_factor: float = AGE_FACTOR,
+        terminal_statuses: Iterable[str] = TERMINAL_STATUSES,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Args:
+            client (ACHPayments): Client used for the underlying status calls.
+            max_workers (int): Maximum number of concurrent status calls.
+            min_interval (float): Shortest delay between polls of one transaction.
+            max_interval (float): Longest delay between polls of one transaction.
+            age_factor (float): Seconds of poll interval added per second of age.
+            terminal_statuses (Iterable[str]): Statuses that are cached permanently.
+            clock (Callable[[], float]): Monotonic time source.
+        """
+        self.client = client
+        self.max_workers = max_workers
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.age_factor = age_factor
+        self.terminal_statuses = frozenset(terminal_statuses)
+        self._clock = clock
+
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._tracked: Dict[str, _TrackedPayment] = {}
+        self._terminal: Dict[str, Dict[str, Any]] = {}
+        self._in_flight: Dict[str, "Future[StatusResponse]"] = {}
+        # (next_poll, transaction_id); stale entries are skipped when popped
+        self._schedule: List[Tuple[float, str]] = []
+        self._gateway_calls = 0
+        self._coalesced = 0
+        self._cache_hits = 0
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="ach-status"
+                )
+            return self._executor
+
+    def close(self) -> None:
+        """Shut down the worker pool."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    def is_terminal(self, response: StatusResponse) -> bool:
+        return bool(response) and response.get("status") in self.terminal_statuses
+
+    def _next_interval(self, state: _TrackedPayment, now: float) -> float:
+        if state.consecutive_errors:
+            interval = self.min_interval * 2 ** min(state.consecutive_errors, 16)
+        else:
+            by_age = (now - state.first_seen) * self.age_factor
+            by_streak = self.min_interval * 2 ** min(state.unchanged_polls, 16)
+            interval = max(by_age, by_streak)
+        interval = min(self.max_interval, max(self.min_interval, interval))
+        return interval * random.uniform(1 - POLL_JITTER, 1 + POLL_JITTER)
+
+    def track(self, transaction_ids: Iterable[str]) -> None:
+        """
+        Start tracking transactions; each becomes due for polling immediately.
+        """
+        now = self._clock()
+        with self._lock:
+            for transaction_id in transaction_ids:
+                if transaction_id in self._terminal or transaction_id in self._tracked:
+                    continue
+                self._tracked[transaction_id] = _TrackedPayment(transaction_id, now)
+                heapq.heappush(self._schedule, (now, transaction_id))
+
+    def _record(self, transaction_id: str, response: StatusResponse) -> None:
+        now = self._clock()
+        with self._lock:
+            if self.is_terminal(response):
+                self._terminal[transaction_id] = response  # type: ignore[assignment]
+                self._tracked.pop(transaction_id, None)
+                return
+            state = self._tracked.get(transaction_id)
+            if state is None:
+                state = self._tracked[transaction_id] = _TrackedPayment(transaction_id, now)
+            status = response.get("status") if response else None
+            state.polls += 1
+            state.last_response = response
+            if response is None or status == ERROR_STATUS:
+                state.consecutive_errors += 1
+            else:
+                state.consecutive_errors = 0
+                state.unchanged_polls = state.unchanged_polls + 1 if status == state.last_status else 0
+                state.last_status = status
+            state.next_poll = now + self._next_interval(state, now)
+            heapq.heappush(self._schedule, (state.next_poll, transaction_id))
+
+    def _fetch(self, transaction_id: str) -> StatusResponse:
+        try:
+            response = self.client.get_payment_status(transaction_id)
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            logger.error("Error polling status of %s: %s", transaction_id, e)
+            response = {"status": ERROR_STATUS, "error": str(e)}
+        try:
+            self._record(transaction_id, response)
+        finally:
+            # Only drop the in-flight entry once the result is visible to _cached
+            with self._lock:
+                self._in_flight.pop(transaction_id, None)
+        return response
+
+    def _submit(self, transaction_id: str) -> "Future[StatusResponse]":
+        """
+        Start a gateway call for the transaction, or join the one already in flight.
+        """
+        executor = self._get_executor()
+        with self._lock:
+            future = self._in_flight.get(transaction_id)
+            if future is not None:
+                self._coalesced += 1
+                return future
+            self._gateway_calls += 1
+            future = executor.submit(self._fetch, transaction_id)
+            self._in_flight[transaction_id] = future
+            return future
+
+    def _cached(self, transaction_id: str, force: bool) -> Tuple[bool, StatusResponse]:
+        """
+        Return (hit, response) from the terminal cache or, unless forced, the last
+        response of a transaction that is not yet due for another poll.
+        """
+        with self._lock:
+            terminal = self._terminal.get(transaction_id)
+            if terminal is not None:
+                self._cache_hits += 1
+                return True, terminal
+            state = self._tracked.get(transaction_id)
+            if (
+                not force
+                and state is not None
+                and state.last_response is not None
+                and state.next_poll > self._clock()
+            ):
+                self._cache_hits += 1
+                return True, state.last_response
+        return False, None
+
+    def get_status(self, transaction_id: str, force: bool = False) -> StatusResponse:
+        """
+        Status of one transaction, hitting the gateway only when it is due.
+
+        Args:
+            transaction_id (str): The transaction identifier.
+            force (bool): Poll even if the transaction is not due yet.
+
+        Returns:
+            dict or None: Latest known status response.
+        """
+        if not transaction_id:
+            logger.error("Transaction ID must be provided.")
+            return None
+        hit, response = self._cached(transaction_id, force)
+        if hit:
+            return response
+        return self._submit(transaction_id).result()
+
+    def get_statuses(
+        self, transaction_ids: Iterable[str], force: bool = False
+    ) -> Dict[str, StatusResponse]:
+        """
+        Statuses of many transactions; due ones are polled concurrently on the pool.
+        """
+        results: Dict[str, StatusResponse] = {}
+        futures: Dict[str, "Future[StatusResponse]"] = {}
+        for transaction_id in transaction_ids:
+            if transaction_id in results or transaction_id in futures:
+                continue
+            hit, response = self._cached(transaction_id, force)
+            if hit:
+                results[transaction_id] = response
+            else:
+                futures[transaction_id] = self._submit(transaction_id)
+        for transaction_id, future in futures.items():
+            results[transaction_id] = future.result()
+        return results
+
+    def poll_due(self) -> Dict[str, StatusResponse]:
+        """
+        Poll every tracked transaction whose next poll time has passed.
+
+        Returns:
+            Dict[str, StatusResponse]: Responses of the transactions polled.
+        """
+        now = self._clock()
+        due: List[str] = []
+        with self._lock:
+            while self._schedule and self._schedule[0][0] <= now:
+                next_poll, transaction_id = heapq.heappop(self._schedule)
+                state = self._tracked.get(transaction_id)
+                if state is not None and state.next_poll == next_poll:
+                    due.append(transaction_id)
+        futures = {transaction_id: self._submit(transaction_id) for transaction_id in due}
+        return {transaction_id: future.result() for transaction_id, future in futures.items()}
+
+    def seconds_until_next_poll(self) -> Optional[float]:
+        """
+        Time until the next tracked transaction is due, or None if nothing is pending.
+        """
+        with self._lock:
+            while self._schedule:
+                next_poll, transaction_id = self._schedule[0]
+                state = self._tracked.get(transaction_id)
+                if state is not None and state.next_poll == next_poll:
+                    return max(0.0, next_poll - self._clock())
+                heapq.heappop(self._schedule)
+        return None
+
+    def pending(self) -> List[str]:
+        """Transactions still being tracked (not yet in a terminal status)."""
+        with self._lock:
+            return list(self._tracked)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Returns:
+            dict: Gateway calls made, calls coalesced into an in-flight request,
+                  cache hits, and pending/terminal transaction counts.
+        """
+        with self._lock:
+            return {
+                "gateway_calls": self._gateway_calls,
+                "coalesced": self._coalesced,
+                "cache_hits": self._cache_hits,
+                "pending": len(self._tracked),
+                "terminal": len(self._terminal),
+            }
@@ -0,0 +1,197 @@
+"""
+In-memory cache of Plaid API responses keyed by (endpoint, access token).
+
+Balances and item metadata rarely change within a minute, so read endpoints are
+served from a bounded LRU cache with a TTL per endpoint. Concurrent misses for
+the same key are coalesced into one API call (single flight). Entries of an
+access token are dropped when its item is removed or its token invalidated.
+Raw SDK responses are stored so every hit can be converted (or wrapped) afresh.
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Set, Tuple
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+CacheKey = Tuple[str, str]
+
+DEFAULT_MAX_ENTRIES: int = 1024
+DEFAULT_TTLS: Dict[str, float] = {
+    "auth_get": 60.0,  # accounts and balances
+    "item_get": 300.0,  # item metadata
+}
+
+
+class _Flight:
+    __slots__ = ("done", "value", "error")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.value: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class PlaidResponseCache:
+    """
+    Bounded LRU cache with per-endpoint TTLs and single-flight loading.
+
+    Usage example:
+        >>> cache = PlaidResponseCache(ttls={"auth_get": 30})
+        >>> response = cache.get_or_load("auth_get", access_token, lambda: client.auth_get(request))
+    """
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        ttls: Optional[Dict[str, float]] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Args:
+            max_entries (int): Maximum number of cached responses.
+            ttls (Optional[Dict[str, float]]): Seconds to cache each endpoint's
+                responses; endpoints without a TTL are not cached.
+            clock (Callable[[], float]): Monotonic time source.
+        """
+        self.max_entries = max_entries
+        self.ttls = dict(DEFAULT_TTLS if ttls is None else ttls)
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[CacheKey, Tuple[Any, float]]" = OrderedDict()
+        self._by_token: Dict[str, Set[CacheKey]] = {}
+        self._in_flight: Dict[CacheKey, _Flight] = {}
+        # Bumped by invalidate() so a load that started earlier is not cached
+        self._generations: Dict[str, int] = {}
+        self._hits = 0
+        self._misses = 0
+        self._coalesced = 0
+        self._evictions = 0
+        self._invalidations = 0
+
+    def _discard(self, key: CacheKey) -> None:
+        self._entries.pop(key, None)
+        keys = self._by_token.get(key[1])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._by_token[key[1]]
+
+    def get(self, endpoint: str, access_token: str) -> Optional[Any]:
+        """Return a fresh cached response, or None."""
+        key = (endpoint, access_token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires = entry
+            if self._clock() >= expires:
+                self._discard(key)
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def put(self, endpoint: str, access_token: str, value: Any) -> None:
+        """Cache a response for the endpoint's TTL, evicting the least recently used entries."""
+        ttl = self.ttls.get(endpoint)
+        if not ttl or value is None:
+            return
+        key = (endpoint, access_token)
+        with self._lock:
+            self._entries[key] = (value, self._clock() + ttl)
+            self._entries.move_to_end(key)
+            self._by_token.setdefault(access_token, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                oldest = next(iter(self._entries))
+                self._discard(oldest)
+                self._evictions += 1
+
+    def get_or_load(self, endpoint: str, access_token: str, loader: Callable[[], Any]) -> Any:
+        """
+        Return the cached response or call ``loader`` once for all concurrent
+        callers missing the same key. Errors from ``loader`` propagate to every
+        waiting caller and nothing is cached.
+        """
+        if not self.ttls.get(endpoint):
+            return loader()
+        key = (endpoint, access_token)
+        value = self.get(endpoint, access_token)
+        with self._lock:
+            if value is not None:
+                self._hits += 1
+                return value
+            flight = self._in_flight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._in_flight[key] = _Flight()
+                generation = self._generations.get(access_token, 0)
+                self._misses += 1
+            else:
+                self._coalesced += 1
+        assert flight is not None
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+        try:
+            flight.value = loader()
+            with self._lock:
+                stale = self._generations.get(access_token, 0) != generation
+            if not stale:
+                self.put(endpoint, access_token, flight.value)
+            return flight.value
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
+            flight.done.set()
+
+    def invalidate(self, access_token: str) -> int:
+        """
+        Drop every cached response of an access token.
+
+        Returns:
+            int: Number of entries dropped.
+        """
+        with self._lock:
+            self._generations[access_token] = self._generations.get(access_token, 0) + 1
+            keys = list(self._by_token.get(access_token, ()))
+            for key in keys:
+                self._discard(key)
+            if keys:
+                self._invalidations += 1
+        return len(keys)
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        with self._lock:
+            self._entries.clear()
+            self._by_token.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Returns:
+            dict: Hits, misses, coalesced misses, evictions, invalidations, the
+                  hit rate and the current number of entries.
+        """
+        with self._lock:
+            lookups = self._hits + self._misses + self._coalesced
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "coalesced": self._coalesced,
+                "evictions": self._evictions,
+                "invalidations": self._invalidations,
+                "hit_rate": (self._hits + self._coalesced) / lookups if lookups else 0.0,
+                "entries": len(self._entries),
+            }
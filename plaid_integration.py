@@ -1,6 +1,6 @@
 import os
 import logging
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Iterable, Union
 
 from plaid.api import plaid_api
 from plaid.model.products import Products
@@ -9,16 +9,51 @@ from plaid.model.link_token_create_request import LinkTokenCreateRequest
 from plaid.model.link_token_create_request_user import LinkTokenCreateRequestUser
 from plaid.model.transactions_get_request import TransactionsGetRequest
 from plaid.model.transactions_get_request_options import TransactionsGetRequestOptions
+from plaid.model.transactions_sync_request import TransactionsSyncRequest
 from plaid.model.item_get_request import ItemGetRequest
 from plaid.model.item_remove_request import ItemRemoveRequest
 from plaid.model.item_access_token_invalidate_request import ItemAccessTokenInvalidateRequest
 from plaid.configuration import Configuration
 from plaid.exceptions import ApiException
 
+from plaid_cache import PlaidResponseCache
+from plaid_views import ResponseView, convert_response
+from resilience import CircuitBreaker, ResilienceError, TokenBucket, guarded_call
+
 logger = logging.getLogger(__name__)
 
+
+def _is_plaid_failure(error: BaseException) -> bool:
+    """
+    Whether an error says Plaid is unhealthy: transport errors and 429/5xx
+    responses count, other API errors (bad tokens, invalid requests) do not.
+    """
+    if isinstance(error, ApiException):
+        return error.status is None or error.status == 429 or error.status >= 500
+    return True
+
+
 class PlaidIntegration:
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        rate_limiter: Optional[TokenBucket] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        cache: Optional[PlaidResponseCache] = None,
+        lazy_responses: bool = False,
+    ) -> None:
+        """
+        Args:
+            rate_limiter (Optional[TokenBucket]): Shared limit on the Plaid request rate.
+            circuit_breaker (Optional[CircuitBreaker]): Breaker that fails calls fast
+                while Plaid is degraded.
+            cache (Optional[PlaidResponseCache]): Cache for account and item lookups.
+            lazy_responses (bool): Return lazy ResponseViews instead of dicts from
+                get_accounts, get_transactions and get_item by default.
+        """
+        self.rate_limiter = rate_limiter
+        self.circuit_breaker = circuit_breaker
+        self.cache = cache
+        self.lazy_responses = lazy_responses
         configuration = Configuration(
             host="https://sandbox.plaid.com",
             api_key={
@@ -27,7 +62,41 @@ class PlaidIntegration:
             }
         )
         self.client = plaid_api.PlaidApi(configuration)
-        
+
+    def _call(self, endpoint: str, *args: Any) -> Any:
+        """
+        Call a Plaid API method behind the rate limiter and circuit breaker.
+
+        Raises:
+            ApiException: If Plaid returned an error.
+            ResilienceError: If the call was rejected client-side.
+        """
+        return guarded_call(
+            "plaid." + endpoint,
+            getattr(self.client, endpoint),
+            *args,
+            rate_limiter=self.rate_limiter,
+            circuit_breaker=self.circuit_breaker,
+            is_failure=_is_plaid_failure,
+        )
+
+    def _convert(
+        self, response: Any, fields: Optional[Iterable[str]], lazy: Optional[bool]
+    ) -> Union[Dict[str, Any], ResponseView]:
+        return convert_response(
+            response, fields=fields, lazy=self.lazy_responses if lazy is None else lazy
+        )
+
+    def _cached_call(self, endpoint: str, access_token: str, *args: Any) -> Any:
+        """
+        Like _call, but served from the response cache when one is configured.
+        """
+        if self.cache is None:
+            return self._call(endpoint, *args)
+        return self.cache.get_or_load(
+            endpoint, access_token, lambda: self._call(endpoint, *args)
+        )
+
     def create_link_token(self, user_id: str) -> Optional[Dict[str, Any]]:
         """
         Create a link token for the client to initialize Plaid Link.
@@ -51,10 +120,10 @@ class PlaidIntegration:
                 country_codes=[CountryCode.US],
                 language="en"
             )
-            response = self.client.link_token_create(request)
+            response = self._call("link_token_create", request)
             logger.info(f"Created link token for user {user_id}")
             return response.to_dict()
-        except ApiException as e:
+        except (ApiException, ResilienceError) as e:
             logger.error(f"Plaid error creating link token: {e}")
             return None
 
@@ -74,22 +143,31 @@ class PlaidIntegration:
             >>> print(response)
         """
         try:
-            response = self.client.item_public_token_exchange(public_token)
+            response = self._call("item_public_token_exchange", public_token)
             logger.info("Exchanged public token for access token")
             return response.to_dict()
-        except ApiException as e:
+        except (ApiException, ResilienceError) as e:
             logger.error(f"Plaid error exchanging public token: {e}")
             return None
 
-    def get_accounts(self, access_token: str) -> Optional[Dict[str, Any]]:
+    def get_accounts(
+        self,
+        access_token: str,
+        fields: Optional[Iterable[str]] = None,
+        lazy: Optional[bool] = None,
+    ) -> Optional[Union[Dict[str, Any], ResponseView]]:
         """
         Retrieve accounts linked to the access token.
 
         Args:
             access_token (str): The access token.
+            fields (Optional[Iterable[str]]): Dotted field paths to return (e.g.
+                "accounts.balances.available"); other fields are never converted.
+            lazy (Optional[bool]): Return a lazy ResponseView instead of a dict
+                (defaults to the client's lazy_responses setting).
 
         Returns:
-            Optional[Dict[str, Any]]: Accounts information.
+            Optional[Union[Dict[str, Any], ResponseView]]: Accounts information.
 
         Usage example:
             >>> plaid = PlaidIntegration()
@@ -97,10 +175,10 @@ class PlaidIntegration:
             >>> print(response)
         """
         try:
-            response = self.client.auth_get(access_token)
+            response = self._cached_call("auth_get", access_token, access_token)
             logger.info("Retrieved accounts information")
-            return response.to_dict()
-        except ApiException as e:
+            return self._convert(response, fields, lazy)
+        except (ApiException, ResilienceError) as e:
             logger.error(f"Plaid error retrieving accounts: {e}")
             return None
 
@@ -110,7 +188,9 @@ class PlaidIntegration:
         start_date: str,
         end_date: str,
         options: Optional[TransactionsGetRequestOptions] = None,
-    ) -> Optional[Dict[str, Any]]:
+        fields: Optional[Iterable[str]] = None,
+        lazy: Optional[bool] = None,
+    ) -> Optional[Union[Dict[str, Any], ResponseView]]:
         """
         Retrieve transactions for the given access token and date range.
 
@@ -119,9 +199,13 @@ class PlaidIntegration:
             start_date (str): Start date in 'YYYY-MM-DD' format.
             end_date (str): End date in 'YYYY-MM-DD' format.
             options (TransactionsGetRequestOptions, optional): Additional options.
+            fields (Optional[Iterable[str]]): Dotted field paths to return (e.g.
+                "accounts.balances.available"); other fields are never converted.
+            lazy (Optional[bool]): Return a lazy ResponseView instead of a dict
+                (defaults to the client's lazy_responses setting).
 
         Returns:
-            Optional[Dict[str, Any]]: Transactions information.
+            Optional[Union[Dict[str, Any], ResponseView]]: Transactions information.
 
         Usage example:
             >>> plaid = PlaidIntegration()
@@ -135,22 +219,61 @@ class PlaidIntegration:
                 end_date=end_date,
                 options=options,
             )
-            response = self.client.transactions_get(request)
+            response = self._call("transactions_get", request)
             logger.info("Retrieved transactions information")
-            return response.to_dict()
-        except ApiException as e:
+            return self._convert(response, fields, lazy)
+        except (ApiException, ResilienceError) as e:
             logger.error(f"Plaid error retrieving transactions: {e}")
             return None
 
-    def get_item(self, access_token: str) -> Optional[Dict[str, Any]]:
+    def sync_transactions_page(
+        self,
+        access_token: str,
+        cursor: Optional[str] = None,
+        count: int = 500,
+    ) -> Any:
+        """
+        Fetch one page of /transactions/sync deltas after ``cursor``.
+
+        Unlike the other methods this returns the SDK response model rather than a
+        dict and lets errors propagate, so the sync engine can convert transactions
+        one at a time and restart pagination when Plaid asks it to.
+
+        Args:
+            access_token (str): The access token.
+            cursor (Optional[str]): Cursor from the previous sync; None for a full history.
+            count (int): Maximum number of updates per page (Plaid allows up to 500).
+
+        Returns:
+            TransactionsSyncResponse: added/modified/removed lists, next_cursor and has_more.
+
+        Raises:
+            ApiException: If Plaid returned an error.
+            ResilienceError: If the call was rejected client-side.
+        """
+        request = TransactionsSyncRequest(access_token=access_token, count=count)
+        if cursor:
+            request.cursor = cursor
+        return self._call("transactions_sync", request)
+
+    def get_item(
+        self,
+        access_token: str,
+        fields: Optional[Iterable[str]] = None,
+        lazy: Optional[bool] = None,
+    ) -> Optional[Union[Dict[str, Any], ResponseView]]:
         """
         Retrieve item information for the given access token.
 
         Args:
             access_token (str): The access token.
+            fields (Optional[Iterable[str]]): Dotted field paths to return (e.g.
+                "accounts.balances.available"); other fields are never converted.
+            lazy (Optional[bool]): Return a lazy ResponseView instead of a dict
+                (defaults to the client's lazy_responses setting).
 
         Returns:
-            Optional[Dict[str, Any]]: Item information.
+            Optional[Union[Dict[str, Any], ResponseView]]: Item information.
 
         Usage example:
             >>> plaid = PlaidIntegration()
@@ -159,10 +282,10 @@ class PlaidIntegration:
         """
         try:
             request = ItemGetRequest(access_token=access_token)
-            response = self.client.item_get(request)
+            response = self._cached_call("item_get", access_token, request)
             logger.info("Retrieved item information")
-            return response.to_dict()
-        except ApiException as e:
+            return self._convert(response, fields, lazy)
+        except (ApiException, ResilienceError) as e:
             logger.error(f"Plaid error retrieving item: {e}")
             return None
 
@@ -183,10 +306,12 @@ class PlaidIntegration:
         """
         try:
             request = ItemRemoveRequest(access_token=access_token)
-            response = self.client.item_remove(request)
+            if self.cache is not None:
+                self.cache.invalidate(access_token)
+            response = self._call("item_remove", request)
             logger.info("Removed item successfully")
             return response.to_dict()
-        except ApiException as e:
+        except (ApiException, ResilienceError) as e:
             logger.error(f"Plaid error removing item: {e}")
             return None
 
@@ -207,9 +332,11 @@ class PlaidIntegration:
         """
         try:
             request = ItemAccessTokenInvalidateRequest(access_token=access_token)
-            response = self.client.item_access_token_invalidate(request)
+            if self.cache is not None:
+                self.cache.invalidate(access_token)
+            response = self._call("item_access_token_invalidate", request)
             logger.info("Invalidated access token successfully")
             return response.to_dict()
-        except ApiException as e:
+        except (ApiException, ResilienceError) as e:
             logger.error(f"Plaid error invalidating access token: {e}")
             return None
@@ -0,0 +1,197 @@
+"""
+Lazy, read-only views over Plaid SDK response models.
+
+``response.to_dict()`` recursively converts the whole generated model tree, which
+dominates CPU time and memory for accounts and transactions responses with
+thousands of rows when callers read only a few fields. ResponseView and ListView
+wrap the model instead and convert a field only when it is read. project()
+extracts just the requested (dotted) field paths into a plain dict.
+"""
+
+from collections.abc import Mapping, Sequence
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
+
+from plaid.model_utils import ModelSimple
+
+FieldTree = Dict[str, "FieldTree"]
+
+
+def _data_stores(model: Any) -> List[Dict[str, Any]]:
+    # Generated models keep their fields in _data_store; composed (oneOf/allOf)
+    # models spread them across _composed_instances as well.
+    stores = [model._data_store]
+    if getattr(model, "_composed_schemas", None):
+        stores.extend(instance._data_store for instance in model._composed_instances)
+    return stores
+
+
+def _wrap(value: Any) -> Any:
+    if isinstance(value, ModelSimple):
+        return value.value
+    if hasattr(value, "_data_store"):
+        return ResponseView(value)
+    if isinstance(value, list):
+        return ListView(value)
+    if isinstance(value, dict):
+        return {key: _wrap(item) for key, item in value.items()}
+    return value
+
+
+_PRIMITIVES = (str, int, float, bool)
+
+
+def _materialize(value: Any) -> Any:
+    if value is None or isinstance(value, _PRIMITIVES):
+        return value
+    if isinstance(value, ListView):
+        return value.to_list()
+    if isinstance(value, ModelSimple):
+        return value.value
+    if hasattr(value, "to_dict"):
+        return value.to_dict()
+    if isinstance(value, list):
+        return [_materialize(item) for item in value]
+    if isinstance(value, dict):
+        return {key: _materialize(item) for key, item in value.items()}
+    return value
+
+
+class ResponseView(Mapping):
+    """
+    Read-only mapping over a generated model; nested models and lists are
+    wrapped on access rather than converted up front.
+
+    Usage example:
+        >>> accounts = ResponseView(plaid_client.auth_get(request))
+        >>> accounts["accounts"][0]["balances"]["available"]
+        100.0
+    """
+
+    __slots__ = ("_model",)
+
+    def __init__(self, model: Any) -> None:
+        self._model = model
+
+    def _store(self, key: str) -> Dict[str, Any]:
+        for store in _data_stores(self._model):
+            if key in store:
+                return store
+        raise KeyError(key)
+
+    def __getitem__(self, key: str) -> Any:
+        return _wrap(self._store(key)[key])
+
+    def __getattr__(self, name: str) -> Any:
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def __iter__(self) -> Iterator[str]:
+        seen = set()
+        for store in _data_stores(self._model):
+            for key in store:
+                if key not in seen:
+                    seen.add(key)
+                    yield key
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __repr__(self) -> str:
+        return "ResponseView(%s: %s)" % (type(self._model).__name__, ", ".join(self))
+
+    @property
+    def model(self) -> Any:
+        """The wrapped SDK model."""
+        return self._model
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Fully convert the wrapped model, as ``model.to_dict()`` would."""
+        return self._model.to_dict()
+
+
+class ListView(Sequence):
+    """Read-only sequence that wraps list elements when they are accessed."""
+
+    __slots__ = ("_items",)
+
+    def __init__(self, items: List[Any]) -> None:
+        self._items = items
+
+    def __getitem__(self, index: Union[int, slice]) -> Any:
+        if isinstance(index, slice):
+            return ListView(self._items[index])
+        return _wrap(self._items[index])
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __repr__(self) -> str:
+        return "ListView(%d items)" % len(self._items)
+
+    def to_list(self) -> List[Any]:
+        """Fully convert every element."""
+        return [_materialize(item) for item in self._items]
+
+
+def _field_tree(fields: Iterable[str]) -> FieldTree:
+    tree: FieldTree = {}
+    for path in fields:
+        node = tree
+        for part in path.split("."):
+            node = node.setdefault(part, {})
+    return tree
+
+
+def _project(value: Any, tree: FieldTree) -> Any:
+    if not tree:
+        return _materialize(value)
+    if isinstance(value, list):
+        return [_project(item, tree) for item in value]
+    if value is None:
+        return None
+    if isinstance(value, ResponseView):
+        value = value.model
+    result: Dict[str, Any] = {}
+    if hasattr(value, "_data_store"):
+        stores = _data_stores(value)
+        for key, subtree in tree.items():
+            for store in stores:
+                if key in store:
+                    result[key] = _project(store[key], subtree)
+                    break
+    else:
+        for key, subtree in tree.items():
+            if key in value:
+                result[key] = _project(value[key], subtree)
+    return result
+
+
+def project(model: Any, fields: Iterable[str]) -> Dict[str, Any]:
+    """
+    Extract only the given fields of a response model into a plain dict.
+
+    Fields are dotted paths; a path through a list applies to every element,
+    and a path ending at a nested object converts that whole object. Fields
+    missing from the response are left out.
+
+    Usage example:
+        >>> project(response, ["accounts.account_id", "accounts.balances.available"])
+        {'accounts': [{'account_id': 'a1', 'balances': {'available': 100.0}}]}
+    """
+    return _project(model, _field_tree(fields))
+
+
+def convert_response(
+    model: Any, fields: Optional[Iterable[str]] = None, lazy: bool = False
+) -> Union[Dict[str, Any], ResponseView]:
+    """
+    Convert a response model the way the caller asked: projected to ``fields``,
+    wrapped in a lazy ResponseView, or fully converted with to_dict().
+    """
+    if fields is not None:
+        return project(model, fields)
+    if lazy:
+        return ResponseView(model)
+    return model.to_dict()
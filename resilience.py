@@ -0,0 +1,367 @@
+"""
+Client-side rate limiting and circuit breaking for outbound API calls.
+
+A TokenBucket caps the request rate shared by every thread using a client. A
+CircuitBreaker tracks failures per endpoint over a sliding time window. Once an
+endpoint fails too often its circuit opens and calls are rejected immediately
+with CircuitOpenError, instead of each one running through the full retry
+schedule against a degraded service. After a cool-down a limited number of
+half-open trial calls decide whether the circuit closes again.
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Optional, TypeVar
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+CLOSED: str = "closed"
+OPEN: str = "open"
+HALF_OPEN: str = "half_open"
+STATE_CODES: Dict[str, int] = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+DEFAULT_RATE: float = 50.0  # requests per second
+DEFAULT_BURST: int = 100
+DEFAULT_MAX_WAIT: float = 1.0  # seconds a caller may block waiting for a token
+DEFAULT_FAILURE_THRESHOLD: int = 5
+DEFAULT_WINDOW_SECONDS: float = 30.0
+DEFAULT_OPEN_SECONDS: float = 30.0
+DEFAULT_HALF_OPEN_CALLS: int = 1
+
+
+class ResilienceError(Exception):
+    """Base class for calls rejected on the client side."""
+
+
+class RateLimitExceeded(ResilienceError):
+    """Raised when no token became available within the caller's wait budget."""
+
+
+class CircuitOpenError(ResilienceError):
+    """Raised when a call is rejected because the endpoint's circuit is open."""
+
+    def __init__(self, endpoint: str, retry_after: float) -> None:
+        super().__init__(
+            f"Circuit for {endpoint} is open; retry in {max(retry_after, 0.0):.1f}s"
+        )
+        self.endpoint = endpoint
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket: ``rate`` tokens per second, at most ``capacity`` banked.
+
+    Usage example:
+        >>> bucket = TokenBucket(rate=10, capacity=20)
+        >>> bucket.acquire(timeout=0.5)
+        True
+    """
+
+    def __init__(
+        self,
+        rate: float = DEFAULT_RATE,
+        capacity: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if rate <= 0:
+            raise ValueError("Rate must be positive")
+        self.rate = rate
+        self.capacity = float(capacity if capacity is not None else max(rate, 1.0))
+        self._clock = clock
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+        self._acquired = 0
+        self._throttled = 0
+        self._rejected = 0
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self, tokens: float = 1.0) -> bool:
+        """Take ``tokens`` if available without waiting."""
+        with self._lock:
+            self._refill()
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                self._acquired += 1
+                return True
+            return False
+
+    def acquire(self, tokens: float = 1.0, timeout: Optional[float] = None) -> bool:
+        """
+        Take ``tokens``, sleeping until they are available or ``timeout`` expires.
+
+        Returns:
+            bool: True if the tokens were taken.
+        """
+        deadline = None if timeout is None else self._clock() + timeout
+        throttled = False
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    self._acquired += 1
+                    self._throttled += throttled
+                    return True
+                wait = (tokens - self._tokens) / self.rate
+                if deadline is not None and self._clock() + wait > deadline:
+                    self._rejected += 1
+                    return False
+            throttled = True
+            time.sleep(wait)
+
+    def metrics(self) -> Dict[str, float]:
+        """
+        Returns:
+            dict: Tokens currently available and counts of acquired, throttled
+                  (had to wait) and rejected acquisitions.
+        """
+        with self._lock:
+            self._refill()
+            return {
+                "available_tokens": self._tokens,
+                "acquired": self._acquired,
+                "throttled": self._throttled,
+                "rejected": self._rejected,
+            }
+
+
+class _Circuit:
+    __slots__ = ("state", "failures", "opened_at", "trial_calls",
+                 "calls", "failed_calls", "rejected_calls", "times_opened")
+
+    def __init__(self) -> None:
+        self.state = CLOSED
+        self.failures: Deque[float] = deque()  # timestamps within the window
+        self.opened_at = 0.0
+        self.trial_calls = 0
+        self.calls = 0
+        self.failed_calls = 0
+        self.rejected_calls = 0
+        self.times_opened = 0
+
+
+class CircuitBreaker:
+    """
+    Per-endpoint circuit breaker with closed, open and half-open states.
+
+    A circuit opens when ``failure_threshold`` failures fall within the last
+    ``window_seconds``. While open, calls raise CircuitOpenError without touching
+    the network. After ``open_seconds`` up to ``half_open_calls`` trial calls are
+    let through: a success closes the circuit, a failure reopens it.
+
+    Usage example:
+        >>> breaker = CircuitBreaker(failure_threshold=5, window_seconds=30)
+        >>> breaker.call("ach.create_payment", session.post, url, json=payload)
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+        window_seconds: float = DEFAULT_WINDOW_SECONDS,
+        open_seconds: float = DEFAULT_OPEN_SECONDS,
+        half_open_calls: int = DEFAULT_HALF_OPEN_CALLS,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.failure_threshold = failure_threshold
+        self.window_seconds = window_seconds
+        self.open_seconds = open_seconds
+        self.half_open_calls = half_open_calls
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._circuits: Dict[str, _Circuit] = {}
+
+    def _circuit(self, endpoint: str) -> _Circuit:
+        circuit = self._circuits.get(endpoint)
+        if circuit is None:
+            circuit = self._circuits[endpoint] = _Circuit()
+        return circuit
+
+    def _open(self, endpoint: str, circuit: _Circuit, now: float) -> None:
+        circuit.state = OPEN
+        circuit.opened_at = now
+        circuit.trial_calls = 0
+        circuit.times_opened += 1
+        logger.warning("Circuit for %s opened after %d failures", endpoint, len(circuit.failures))
+
+    def before_call(self, endpoint: str) -> None:
+        """
+        Admit or reject a call to ``endpoint``.
+
+        Raises:
+            CircuitOpenError: If the circuit is open, or half-open with all trial
+                calls already in flight.
+        """
+        now = self._clock()
+        with self._lock:
+            circuit = self._circuit(endpoint)
+            if circuit.state == OPEN:
+                if now - circuit.opened_at < self.open_seconds:
+                    circuit.rejected_calls += 1
+                    raise CircuitOpenError(endpoint, circuit.opened_at + self.open_seconds - now)
+                circuit.state = HALF_OPEN
+                circuit.trial_calls = 0
+                logger.info("Circuit for %s half-open, allowing trial calls", endpoint)
+            if circuit.state == HALF_OPEN:
+                if circuit.trial_calls >= self.half_open_calls:
+                    circuit.rejected_calls += 1
+                    raise CircuitOpenError(endpoint, 0.0)
+                circuit.trial_calls += 1
+            circuit.calls += 1
+
+    def record_success(self, endpoint: str) -> None:
+        with self._lock:
+            circuit = self._circuit(endpoint)
+            if circuit.state == HALF_OPEN:
+                circuit.state = CLOSED
+                circuit.failures.clear()
+                logger.info("Circuit for %s closed", endpoint)
+
+    def record_failure(self, endpoint: str) -> None:
+        now = self._clock()
+        with self._lock:
+            circuit = self._circuit(endpoint)
+            circuit.failed_calls += 1
+            if circuit.state == HALF_OPEN:
+                self._open(endpoint, circuit, now)
+                return
+            circuit.failures.append(now)
+            while circuit.failures and now - circuit.failures[0] > self.window_seconds:
+                circuit.failures.popleft()
+            if circuit.state == CLOSED and len(circuit.failures) >= self.failure_threshold:
+                self._open(endpoint, circuit, now)
+
+    def call(
+        self,
+        endpoint: str,
+        func: Callable[..., T],
+        *args: Any,
+        is_failure: Optional[Callable[[BaseException], bool]] = None,
+        **kwargs: Any,
+    ) -> T:
+        """
+        Run ``func`` through the circuit for ``endpoint``.
+
+        Exceptions propagate; ``is_failure`` decides which of them count against
+        the circuit (default: all), so e.g. 4xx client errors can be excluded.
+        """
+        self.before_call(endpoint)
+        return self._call_admitted(endpoint, func, args, kwargs, is_failure)
+
+    def _call_admitted(
+        self,
+        endpoint: str,
+        func: Callable[..., T],
+        args: Any,
+        kwargs: Dict[str, Any],
+        is_failure: Optional[Callable[[BaseException], bool]],
+    ) -> T:
+        try:
+            result = func(*args, **kwargs)
+        except BaseException as e:
+            if is_failure is None or is_failure(e):
+                self.record_failure(endpoint)
+            else:
+                self.record_success(endpoint)
+            raise
+        self.record_success(endpoint)
+        return result
+
+    def cancel_call(self, endpoint: str) -> None:
+        """
+        Undo before_call for a call that was admitted but never made, freeing its
+        half-open trial slot.
+        """
+        with self._lock:
+            circuit = self._circuit(endpoint)
+            circuit.calls -= 1
+            if circuit.state == HALF_OPEN and circuit.trial_calls > 0:
+                circuit.trial_calls -= 1
+
+    def state(self, endpoint: str) -> str:
+        """Current state of the endpoint's circuit (an open one past its cool-down reads half-open)."""
+        with self._lock:
+            circuit = self._circuits.get(endpoint)
+            if circuit is None:
+                return CLOSED
+            if circuit.state == OPEN and self._clock() - circuit.opened_at >= self.open_seconds:
+                return HALF_OPEN
+            return circuit.state
+
+    def reset(self, endpoint: Optional[str] = None) -> None:
+        """Close one circuit, or all of them, and forget their failures."""
+        with self._lock:
+            if endpoint is None:
+                self._circuits.clear()
+            else:
+                self._circuits.pop(endpoint, None)
+
+    def metrics(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Returns:
+            dict: Per endpoint, the state (and numeric state code: 0 closed,
+                  1 half-open, 2 open), failures in the current window, and
+                  totals of admitted, failed and rejected calls and times opened.
+        """
+        with self._lock:
+            endpoints = list(self._circuits)
+        metrics: Dict[str, Dict[str, Any]] = {}
+        for endpoint in endpoints:
+            state = self.state(endpoint)
+            with self._lock:
+                circuit = self._circuits.get(endpoint)
+                if circuit is None:
+                    continue
+                metrics[endpoint] = {
+                    "state": state,
+                    "state_code": STATE_CODES[state],
+                    "window_failures": len(circuit.failures),
+                    "calls": circuit.calls,
+                    "failures": circuit.failed_calls,
+                    "rejected": circuit.rejected_calls,
+                    "times_opened": circuit.times_opened,
+                }
+        return metrics
+
+
+def guarded_call(
+    endpoint: str,
+    func: Callable[..., T],
+    *args: Any,
+    rate_limiter: Optional[TokenBucket] = None,
+    circuit_breaker: Optional[CircuitBreaker] = None,
+    max_wait: float = DEFAULT_MAX_WAIT,
+    is_failure: Optional[Callable[[BaseException], bool]] = None,
+    **kwargs: Any,
+) -> T:
+    """
+    Call ``func`` behind an optional circuit breaker and rate limiter.
+
+    The circuit is checked first so an open circuit fails fast without
+    consuming or waiting for a token.
+
+    Raises:
+        CircuitOpenError: If the endpoint's circuit is open.
+        RateLimitExceeded: If no token became available within ``max_wait`` seconds.
+    """
+    if circuit_breaker is not None:
+        circuit_breaker.before_call(endpoint)
+    if rate_limiter is not None and not rate_limiter.acquire(timeout=max_wait):
+        if circuit_breaker is not None:
+            circuit_breaker.cancel_call(endpoint)
+        raise RateLimitExceeded(f"Rate limit exceeded for {endpoint}")
+    if circuit_breaker is None:
+        return func(*args, **kwargs)
+    return circuit_breaker._call_admitted(  # pylint: disable=protected-access
+        endpoint, func, args, kwargs, is_failure
+    )
@@ -0,0 +1,249 @@
+"""
+Storage backends for the routing-number cache.
+
+The JSON file format is kept for import/export, and its writes are atomic
+(temp file + rename) so concurrent readers never see a truncated file;
+read-merge-write cycles hold a lock file so concurrent writers keep each
+other's entries. The
+SQLite backend runs in WAL mode so many worker processes can read while one
+writes, applies batched upserts in a single transaction, and deletes expired
+rows a batch at a time.
+"""
+
+import fcntl
+import json
+import logging
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Union
+
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+CacheEntry = Dict[str, Union[str, float, int]]
+
+DEFAULT_SQLITE_PATH: str = "routing_number_cache.db"
+COMPACT_BATCH_SIZE: int = 500
+BUSY_TIMEOUT_MS: int = 5000
+
+
+def read_json_cache(path: str, ttl: float) -> Dict[str, CacheEntry]:
+    """
+    Read a JSON cache file, dropping entries older than ``ttl`` seconds.
+
+    Raises:
+        OSError: If the file cannot be read.
+        ValueError: If the file is not valid JSON.
+    """
+    with open(path, "r") as f:
+        cache: Dict[str, CacheEntry] = json.load(f)
+    current_time = time.time()
+    return {k: v for k, v in cache.items() if current_time - float(v["timestamp"]) < ttl}
+
+
+def write_json_cache(path: str, entries: Dict[str, CacheEntry]) -> None:
+    """
+    Atomically replace a JSON cache file: the data is written to a temporary file
+    in the same directory, fsynced, then renamed over the target.
+
+    Raises:
+        OSError: If the file cannot be written.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix=".routing-cache-", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(entries, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+@contextmanager
+def json_cache_lock(path: str) -> Iterator[None]:
+    """
+    Hold an exclusive lock on ``path + ".lock"`` for the duration of the block.
+    The cache file itself is replaced on every write, so it cannot carry the lock.
+
+    Raises:
+        OSError: If the lock file cannot be opened or locked.
+    """
+    with open(path + ".lock", "a") as lock_file:
+        fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+
+class SQLiteCacheBackend:
+    """
+    Routing cache storage in a SQLite database in WAL mode.
+
+    Each thread gets its own connection. Writes are single transactions, so
+    readers in other processes see either the old or the new batch, never a
+    partial one.
+    """
+
+    def __init__(
+        self,
+        path: str = DEFAULT_SQLITE_PATH,
+        ttl: float = 86400,
+        compact_batch_size: int = COMPACT_BATCH_SIZE,
+    ) -> None:
+        self.path = path
+        self.ttl = ttl
+        self.compact_batch_size = compact_batch_size
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+
+    def _connection(self) -> sqlite3.Connection:
+        conn: Optional[sqlite3.Connection] = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(
+                self.path, timeout=BUSY_TIMEOUT_MS / 1000, check_same_thread=False
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS routing_cache ("
+                " bank_name TEXT PRIMARY KEY,"
+                " routing_number TEXT NOT NULL,"
+                " timestamp REAL NOT NULL)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS routing_cache_timestamp"
+                " ON routing_cache (timestamp)"
+            )
+            conn.commit()
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+
+    def load(self) -> Dict[str, CacheEntry]:
+        """
+        Return all unexpired entries.
+        """
+        try:
+            rows = self._connection().execute(
+                "SELECT bank_name, routing_number, timestamp FROM routing_cache"
+                " WHERE timestamp >= ?",
+                (time.time() - self.ttl,),
+            ).fetchall()
+        except sqlite3.Error as e:
+            logger.error("Failed to load routing cache from %s: %s", self.path, e)
+            return {}
+        return {
+            name: {"routing_number": routing_number, "timestamp": timestamp}
+            for name, routing_number, timestamp in rows
+        }
+
+    def fetch(self, key: str) -> Optional[CacheEntry]:
+        """
+        Return one unexpired entry, e.g. one written by another process since load().
+        """
+        try:
+            row = self._connection().execute(
+                "SELECT routing_number, timestamp FROM routing_cache"
+                " WHERE bank_name = ? AND timestamp >= ?",
+                (key, time.time() - self.ttl),
+            ).fetchone()
+        except sqlite3.Error as e:
+            logger.error("Failed to read routing cache entry %s: %s", key, e)
+            return None
+        if row is None:
+            return None
+        return {"routing_number": row[0], "timestamp": row[1]}
+
+    def write(self, entries: Dict[str, CacheEntry]) -> bool:
+        """
+        Upsert a batch of entries in one transaction.
+
+        Returns:
+            bool: True if the batch was committed.
+        """
+        if not entries:
+            return True
+        try:
+            conn = self._connection()
+            with conn:
+                conn.executemany(
+                    "INSERT INTO routing_cache (bank_name, routing_number, timestamp)"
+                    " VALUES (?, ?, ?)"
+                    " ON CONFLICT (bank_name) DO UPDATE SET"
+                    " routing_number = excluded.routing_number,"
+                    " timestamp = excluded.timestamp",
+                    [
+                        (key, str(entry["routing_number"]), float(entry["timestamp"]))
+                        for key, entry in entries.items()
+                    ],
+                )
+            return True
+        except sqlite3.Error as e:
+            logger.error("Failed to write routing cache to %s: %s", self.path, e)
+            return False
+
+    def compact(self, limit: Optional[int] = None) -> int:
+        """
+        Delete up to ``limit`` expired rows (default: compact_batch_size).
+
+        Returns:
+            int: Number of rows deleted.
+        """
+        limit = self.compact_batch_size if limit is None else limit
+        try:
+            conn = self._connection()
+            with conn:
+                cursor = conn.execute(
+                    "DELETE FROM routing_cache WHERE rowid IN ("
+                    " SELECT rowid FROM routing_cache WHERE timestamp < ? LIMIT ?)",
+                    (time.time() - self.ttl, limit),
+                )
+            return cursor.rowcount
+        except sqlite3.Error as e:
+            logger.error("Failed to compact routing cache %s: %s", self.path, e)
+            return 0
+
+    def import_json(self, path: str) -> int:
+        """
+        Import unexpired entries from a JSON cache file.
+
+        Returns:
+            int: Number of entries imported.
+        """
+        entries = read_json_cache(path, self.ttl)
+        if not self.write(entries):
+            return 0
+        return len(entries)
+
+    def export_json(self, path: str) -> int:
+        """
+        Atomically export all unexpired entries to a JSON cache file.
+
+        Returns:
+            int: Number of entries exported.
+        """
+        entries = self.load()
+        write_json_cache(path, entries)
+        return len(entries)
+
+    def close(self) -> None:
+        """
+        Close every connection opened by this backend.
+        """
+        with self._connections_lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            conn.close()
+        self._local = threading.local()
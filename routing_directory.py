@@ -0,0 +1,280 @@
+"""
+Indexed FedACH participant directory.
+
+Parses the fixed-width FedACH directory file (one 155-character record per
+routing number) once into a compact columnar store and keeps hash indexes on
+routing number and normalized bank name, plus sorted arrays for prefix search
+and an inverted token index for fuzzy bank-name search.
+"""
+
+import bisect
+import difflib
+import logging
+import math
+import mmap
+import os
+import re
+import threading
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+FEDACH_DIRECTORY_ENV: str = "FEDACH_DIRECTORY_FILE"
+FEDACH_RECORD_LENGTH: int = 155
+
+# Zero-based [start, end) column slices of the FedACH directory record layout.
+FEDACH_FIELDS: Dict[str, Tuple[int, int]] = {
+    "routing_number": (0, 9),
+    "office_code": (9, 10),
+    "servicing_frb_number": (10, 19),
+    "record_type_code": (19, 20),
+    "change_date": (20, 26),
+    "new_routing_number": (26, 35),
+    "customer_name": (35, 71),
+    "address": (71, 107),
+    "city": (107, 127),
+    "state": (127, 129),
+    "zip_code": (129, 134),
+    "zip_code_extension": (134, 138),
+    "telephone": (138, 148),
+    "institution_status_code": (148, 149),
+    "data_view_code": (149, 150),
+}
+# Only the fields up to the data view code are required; the trailing filler is optional.
+_MIN_RECORD_LENGTH: int = max(end for _, end in FEDACH_FIELDS.values())
+
+_ABBREVIATION_MARKS = re.compile(r"[.']")
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+
+
+def normalize_bank_name(name: str) -> str:
+    """
+    Normalize a bank name for indexing: lowercase, abbreviation dots dropped and
+    other punctuation folded to single spaces.
+
+    Usage example:
+        >>> normalize_bank_name("JPMorgan Chase Bank, N.A.")
+        'jpmorgan chase bank na'
+    """
+    return _NON_ALNUM.sub(" ", _ABBREVIATION_MARKS.sub("", name.lower())).strip()
+
+
+class RoutingDirectory:
+    """
+    Columnar, indexed view of the FedACH participant directory.
+
+    Columns are stored as fixed-width NumPy byte-string arrays (one per field),
+    so ~20k records take a few megabytes and records are only decoded into
+    dicts when they are returned.
+    """
+
+    def __init__(self, columns: Dict[str, np.ndarray]) -> None:
+        self.columns = columns
+        routing_numbers = [r.decode("ascii") for r in columns["routing_number"].tolist()]
+        names = [
+            normalize_bank_name(n.decode("latin-1"))
+            for n in columns["customer_name"].tolist()
+        ]
+
+        self._by_routing: Dict[str, int] = {r: i for i, r in enumerate(routing_numbers)}
+        self._by_name: Dict[str, List[int]] = defaultdict(list)
+        self._by_token: Dict[str, List[int]] = defaultdict(list)
+        for row, name in enumerate(names):
+            self._by_name[name].append(row)
+            for token in set(name.split()):
+                self._by_token[token].append(row)
+
+        # Sorted copies for prefix search via binary search.
+        name_order = np.argsort(np.array(names, dtype=str), kind="stable")
+        self._sorted_names: List[str] = [names[i] for i in name_order]
+        self._sorted_name_rows = name_order
+        routing_order = np.argsort(columns["routing_number"], kind="stable")
+        self._sorted_routing: List[str] = [routing_numbers[i] for i in routing_order]
+        self._sorted_routing_rows = routing_order
+        self._vocabulary: List[str] = sorted(self._by_token)
+
+    @classmethod
+    def load(cls, path: str) -> "RoutingDirectory":
+        """
+        Memory-map and parse a FedACH directory file.
+
+        Args:
+            path (str): Path to the fixed-width directory file.
+
+        Returns:
+            RoutingDirectory: The indexed directory.
+
+        Raises:
+            ValueError: If the file is not in the FedACH fixed-width layout.
+        """
+        with open(path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if size == 0:
+                return cls.from_records(np.zeros((0, _MIN_RECORD_LENGTH), dtype=np.uint8))
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                first_newline = mm.find(b"\n")
+                stride = first_newline + 1 if first_newline >= 0 else size
+                record_length = first_newline if first_newline >= 0 else size
+                if first_newline > 0 and mm[first_newline - 1:first_newline] == b"\r":
+                    record_length -= 1
+                if record_length < _MIN_RECORD_LENGTH:
+                    raise ValueError(
+                        "Record length %d is shorter than the FedACH layout (%d)"
+                        % (record_length, _MIN_RECORD_LENGTH)
+                    )
+                full_records = size // stride
+                records = np.frombuffer(mm, dtype=np.uint8, count=full_records * stride)
+                records = records.reshape(full_records, stride)[:, :_MIN_RECORD_LENGTH]
+                tail = mm[full_records * stride:].rstrip(b"\r\n")
+                if len(tail) >= _MIN_RECORD_LENGTH:
+                    tail_record = np.frombuffer(tail[:_MIN_RECORD_LENGTH], dtype=np.uint8)
+                    records = np.vstack([records, tail_record])
+                directory = cls.from_records(records)
+                del records  # release the buffer export before the mmap is closed
+        logger.info("Loaded %d FedACH directory records from %s", len(directory), path)
+        return directory
+
+    @classmethod
+    def from_records(cls, records: np.ndarray) -> "RoutingDirectory":
+        """
+        Build a directory from an (n, >=150) uint8 matrix of raw fixed-width records.
+        """
+        columns = {
+            # Always a copy: a single-row slice is already contiguous, and a view
+            # would keep a memory-mapped file's buffer exported after load()
+            name: np.array(records[:, start:end], copy=True).view(f"S{end - start}").ravel()
+            for name, (start, end) in FEDACH_FIELDS.items()
+        }
+        return cls(columns)
+
+    def __len__(self) -> int:
+        return len(self.columns["routing_number"])
+
+    def record(self, row: int) -> Dict[str, str]:
+        """
+        Decode one row of the columnar store into a dict of stripped strings.
+        """
+        return {
+            name: column[row].decode("latin-1").strip()
+            for name, column in self.columns.items()
+        }
+
+    def institution(self, routing_number: str) -> Optional[Dict[str, str]]:
+        """
+        Reverse lookup: return the institution record for a routing number.
+        """
+        row = self._by_routing.get(routing_number)
+        return self.record(row) if row is not None else None
+
+    def lookup(self, bank_name: str) -> Optional[str]:
+        """
+        Return the routing number for an exact (normalized) bank name.
+        Main offices are preferred over branches when a name has several records.
+        """
+        rows = self._by_name.get(normalize_bank_name(bank_name))
+        if not rows:
+            return None
+        office_codes = self.columns["office_code"]
+        row = next((r for r in rows if office_codes[r] == b"O"), rows[0])
+        return self.columns["routing_number"][row].decode("ascii")
+
+    def search_prefix(self, prefix: str, limit: int = 20) -> List[Dict[str, str]]:
+        """
+        Return records whose normalized bank name starts with ``prefix``.
+        """
+        prefix = normalize_bank_name(prefix)
+        start = bisect.bisect_left(self._sorted_names, prefix)
+        results = []
+        for i in range(start, min(start + limit, len(self._sorted_names))):
+            if not self._sorted_names[i].startswith(prefix):
+                break
+            results.append(self.record(int(self._sorted_name_rows[i])))
+        return results
+
+    def search_routing_prefix(self, prefix: str, limit: int = 20) -> List[Dict[str, str]]:
+        """
+        Return records whose routing number starts with ``prefix``.
+        """
+        start = bisect.bisect_left(self._sorted_routing, prefix)
+        results = []
+        for i in range(start, min(start + limit, len(self._sorted_routing))):
+            if not self._sorted_routing[i].startswith(prefix):
+                break
+            results.append(self.record(int(self._sorted_routing_rows[i])))
+        return results
+
+    def _matching_tokens(self, token: str) -> List[str]:
+        if token in self._by_token:
+            return [token]
+        # Tokens the query is a prefix of (e.g. "natl" -> "natl", "chas" -> "chase").
+        start = bisect.bisect_left(self._vocabulary, token)
+        matches = []
+        for candidate in self._vocabulary[start:start + 10]:
+            if not candidate.startswith(token):
+                break
+            matches.append(candidate)
+        if matches:
+            return matches
+        return difflib.get_close_matches(token, self._vocabulary, n=3, cutoff=0.8)
+
+    def search(self, query: str, limit: int = 10) -> List[Dict[str, str]]:
+        """
+        Token-based fuzzy bank-name search.
+
+        Each query token is matched exactly, as a prefix, or by close spelling
+        against the token index. Records are ranked by the summed inverse document
+        frequency of the tokens they match, so rare words like "cetriva" outweigh
+        common ones like "bank".
+
+        Args:
+            query (str): Free-text bank name.
+            limit (int): Maximum number of records to return.
+
+        Returns:
+            List[Dict[str, str]]: Matching records, best match first.
+        """
+        scores: Dict[int, float] = defaultdict(float)
+        total = max(len(self), 1)
+        for token in normalize_bank_name(query).split():
+            for match in self._matching_tokens(token):
+                rows = self._by_token[match]
+                weight = math.log(1 + total / len(rows))
+                if match != token:
+                    weight *= difflib.SequenceMatcher(None, token, match).ratio()
+                for row in rows:
+                    scores[row] += weight
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))[:limit]
+        return [self.record(row) for row, _ in ranked]
+
+
+_directory: Optional[RoutingDirectory] = None
+_directory_path: Optional[str] = None
+_directory_lock = threading.Lock()
+
+
+def get_routing_directory() -> Optional[RoutingDirectory]:
+    """
+    Return the process-wide directory loaded from $FEDACH_DIRECTORY_FILE, or None
+    if the variable is unset or the file cannot be loaded. Each path is parsed once.
+    """
+    global _directory, _directory_path
+    path = os.getenv(FEDACH_DIRECTORY_ENV)
+    if not path:
+        return None
+    if _directory_path == path:
+        return _directory
+    with _directory_lock:
+        if _directory_path != path:
+            try:
+                _directory = RoutingDirectory.load(path)
+            except (OSError, ValueError) as e:
+                logger.error("Failed to load FedACH directory %s: %s", path, e)
+                _directory = None
+            _directory_path = path
+    return _directory
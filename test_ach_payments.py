@@ -1,6 +1,64 @@
+import json
+import tempfile
+import threading
+import time
 import unittest
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from unittest.mock import patch, MagicMock
 from ach_payments import ACHPayments
+from idempotency_ledger import IdempotencyLedger
+
+
+class StubGatewayHandler(BaseHTTPRequestHandler):
+    """Minimal keep-alive ACH gateway: POST creates a payment, GET returns its status."""
+
+    protocol_version = "HTTP/1.1"
+    wbufsize = 65536  # send headers and body in one segment
+
+    def log_message(self, format, *args):
+        pass
+
+    def _reply(self, status, body):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        payload = json.loads(self.rfile.read(length))
+        server = self.server
+        with server.lock:
+            server.posts += 1
+            server.idempotency_keys.append(self.headers.get("Idempotency-Key"))
+            fail = server.failures_remaining > 0
+            if fail:
+                server.failures_remaining -= 1
+        if fail:
+            self._reply(503, {"error": "unavailable"})
+        else:
+            self._reply(200, {"status": "success", "transaction_id": "tx-%d" % server.posts,
+                              "amount": payload["amount"]})
+
+    def do_GET(self):
+        self._reply(200, {"status": "completed"})
+
+
+def start_stub_gateway(test_case, failures=0):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubGatewayHandler)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.posts = 0
+    server.idempotency_keys = []
+    server.failures_remaining = failures
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    test_case.addCleanup(server.server_close)
+    test_case.addCleanup(server.shutdown)
+    return server, "http://127.0.0.1:%d/payments" % server.server_address[1]
 
 
 class TestACHPayments(unittest.TestCase):
@@ -8,31 +66,27 @@ class TestACHPayments(unittest.TestCase):
         self.ach = ACHPayments()
         self.ach.api_key = "test_api_key"  # Set a test API key
 
-    @patch("ach_payments.requests.post")
-    def test_create_payment_success(self, mock_post):
+    def test_create_payment_success(self):
         mock_response = MagicMock()
         mock_response.raise_for_status.return_value = None
         mock_response.json.return_value = {
             "status": "success",
             "transaction_id": "12345",
         }
-        mock_post.return_value = mock_response
-
-        response = self.ach.create_payment(
-            "123456789", "987654321", 100.0, "Test payment"
-        )
+        with patch.object(self.ach.session, "request", return_value=mock_response):
+            response = self.ach.create_payment(
+                "123456789", "987654321", 100.0, "Test payment"
+            )
         self.assertIsNotNone(response)
         self.assertEqual(response.get("status"), "success")
         self.assertIn("transaction_id", response)
 
     
-    @patch("ach_payments.requests.post")
-    def test_create_payment_failure(self, mock_post):
-        mock_post.side_effect = Exception("API error")
-
-        response = self.ach.create_payment(
-            "123456789", "987654321", 100.0, "Test payment"
-        )
+    def test_create_payment_failure(self):
+        with patch.object(self.ach.session, "request", side_effect=Exception("API error")):
+            response = self.ach.create_payment(
+                "123456789", "987654321", 100.0, "Test payment"
+            )
         self.assertIsNotNone(response)
         self.assertEqual(response.get("status"), "failure")
     
@@ -49,22 +103,19 @@ class TestACHPayments(unittest.TestCase):
         response = self.ach.create_payment("123456789", "", 100.0, "Test payment")
         self.assertIsNone(response)
 
-    @patch("ach_payments.requests.get")
-    def test_get_payment_status_success(self, mock_get):
+    def test_get_payment_status_success(self):
         mock_response = MagicMock()
         mock_response.raise_for_status.return_value = None
         mock_response.json.return_value = {"status": "completed"}
-        mock_get.return_value = mock_response
 
-        response = self.ach.get_payment_status("12345")
+        with patch.object(self.ach.session, "request", return_value=mock_response):
+            response = self.ach.get_payment_status("12345")
         self.assertIsNotNone(response)
         self.assertEqual(response.get("status"), "completed")
 
-    @patch("ach_payments.requests.get")
-    def test_get_payment_status_failure(self, mock_get):
-        mock_get.side_effect = Exception("API error")
-
-        response = self.ach.get_payment_status("12345")
+    def test_get_payment_status_failure(self):
+        with patch.object(self.ach.session, "request", side_effect=Exception("API error")):
+            response = self.ach.get_payment_status("12345")
         self.assertIsNotNone(response)
         self.assertEqual(response.get("status"), "failure")
     
@@ -74,6 +125,117 @@ class TestACHPayments(unittest.TestCase):
         self.assertIsNone(response)
 
 
+class TestACHPaymentsAgainstStubGateway(unittest.TestCase):
+    def make_client(self, url, **kwargs):
+        ach = ACHPayments(**kwargs)
+        ach.api_key = "test_api_key"
+        ach.api_url = url
+        self.addCleanup(ach.close)
+        return ach
+
+    def test_keep_alive_reuses_connections(self):
+        _, url = start_stub_gateway(self)
+        ach = self.make_client(url)
+        count = 300
+        start_time = time.time()
+        for i in range(count):
+            response = ach.create_payment("123456789", "021000021", 10.0 + i)
+            self.assertEqual(response["status"], "success")
+        duration = time.time() - start_time
+        self.assertEqual(ach.get_payment_status("tx-1")["status"], "completed")
+
+        stats = ach.stats()
+        self.assertEqual(stats["requests"], count + 1)
+        self.assertEqual(stats["errors"], 0)
+        self.assertEqual(stats["connections_opened"], 1)
+        self.assertGreater(stats["pool_hit_rate"], 0.99)
+        self.assertIn("p95", stats["latency_ms"])
+        print(f"Sequential ACH throughput: {count / duration:.0f} payments/second")
+
+    def test_concurrent_payments_bounded_by_pool(self):
+        server, url = start_stub_gateway(self)
+        ach = self.make_client(url, pool_size=4)
+        count = 400
+        start_time = time.time()
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            responses = list(executor.map(
+                lambda i: ach.create_payment("123456789", "021000021", 1.0 + i), range(count)
+            ))
+        duration = time.time() - start_time
+        self.assertTrue(all(r["status"] == "success" for r in responses))
+        self.assertEqual(server.posts, count)
+        stats = ach.stats()
+        self.assertLessEqual(stats["connections_opened"], 4)
+        self.assertGreater(stats["pool_hit_rate"], 0.95)
+        print(f"Concurrent ACH throughput: {count / duration:.0f} payments/second")
+
+    def test_retries_with_backoff_on_retryable_status(self):
+        server, url = start_stub_gateway(self, failures=2)
+        ach = self.make_client(url, backoff_factor=0.01, backoff_jitter=0.01)
+        response = ach.create_payment("123456789", "021000021", 25.0)
+        self.assertEqual(response["status"], "success")
+        self.assertEqual(server.posts, 3)
+
+    def test_failure_after_retries_exhausted(self):
+        server, url = start_stub_gateway(self, failures=10)
+        ach = self.make_client(url, max_retries=2, backoff_factor=0.01, backoff_jitter=0)
+        response = ach.create_payment("123456789", "021000021", 25.0)
+        self.assertEqual(response["status"], "failure")
+        self.assertEqual(server.posts, 2)
+        self.assertEqual(ach.stats()["errors"], 1)
+
+    def test_retries_reuse_idempotency_key(self):
+        server, url = start_stub_gateway(self, failures=2)
+        ach = self.make_client(url, backoff_factor=0.01, backoff_jitter=0.01)
+        ach.create_payment("123456789", "021000021", 25.0)
+        self.assertEqual(len(server.idempotency_keys), 3)
+        self.assertEqual(len(set(server.idempotency_keys)), 1)
+        self.assertIsNotNone(server.idempotency_keys[0])
+
+    def test_ledger_returns_recorded_response_without_network_call(self):
+        server, url = start_stub_gateway(self)
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        ledger = IdempotencyLedger(tmpdir.name)
+        self.addCleanup(ledger.close)
+        ach = self.make_client(url, ledger=ledger)
+
+        first = ach.create_payment("123456789", "021000021", 25.0, "rent", derive_key=True)
+        second = ach.create_payment("123456789", "021000021", 25, "rent", derive_key=True)
+        self.assertEqual(first, second)
+        self.assertEqual(server.posts, 1)
+
+        third = ach.create_payment("123456789", "021000021", 25.0, "rent", idempotency_key="rent-2")
+        self.assertNotEqual(third["transaction_id"], first["transaction_id"])
+        self.assertEqual(server.posts, 2)
+        self.assertEqual(server.idempotency_keys[1], "rent-2")
+
+    def test_ledger_does_not_record_failures(self):
+        server, url = start_stub_gateway(self, failures=1)
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        ledger = IdempotencyLedger(tmpdir.name)
+        self.addCleanup(ledger.close)
+        ach = self.make_client(url, max_retries=1, ledger=ledger)
+        self.assertEqual(ach.create_payment("123456789", "021000021", 5.0, idempotency_key="pay-1")["status"],
+                         "failure")
+        self.assertEqual(ach.create_payment("123456789", "021000021", 5.0, idempotency_key="pay-1")["status"],
+                         "success")
+        self.assertEqual(server.posts, 2)
+
+    def test_identical_payments_without_key_are_all_sent(self):
+        server, url = start_stub_gateway(self)
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        ledger = IdempotencyLedger(tmpdir.name)
+        self.addCleanup(ledger.close)
+        ach = self.make_client(url, ledger=ledger)
+        first = ach.create_payment("123456789", "021000021", 25.0, "payout")
+        second = ach.create_payment("123456789", "021000021", 25.0, "payout")
+        self.assertNotEqual(first["transaction_id"], second["transaction_id"])
+        self.assertEqual(server.posts, 2)
+        self.assertNotEqual(server.idempotency_keys[0], server.idempotency_keys[1])
+
 
 if __name__ == "__main__":
     unittest.main()
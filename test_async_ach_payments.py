@@ -0,0 +1,89 @@
+import tempfile
+import time
+import unittest
+
+from async_ach_payments import AsyncACHPayments
+from idempotency_ledger import IdempotencyLedger
+from test_ach_payments import start_stub_gateway
+
+
+class TestAsyncACHPayments(unittest.IsolatedAsyncioTestCase):
+    def make_client(self, url, **kwargs):
+        ach = AsyncACHPayments(**kwargs)
+        ach.api_key = "test_api_key"
+        ach.api_url = url
+        return ach
+
+    async def asyncTearDown(self):
+        if getattr(self, "ach", None) is not None:
+            await self.ach.close()
+
+    async def test_create_payment_and_status(self):
+        _, url = start_stub_gateway(self)
+        self.ach = self.make_client(url)
+        response = await self.ach.create_payment("123456789", "021000021", 100.0, "Test")
+        self.assertEqual(response["status"], "success")
+        status = await self.ach.get_payment_status(response["transaction_id"])
+        self.assertEqual(status["status"], "completed")
+
+    async def test_validation_matches_sync_client(self):
+        self.ach = AsyncACHPayments()
+        self.assertIsNone(await self.ach.create_payment("123456789", "021000021", -1.0))
+        self.assertIsNone(await self.ach.create_payment("", "021000021", 1.0))
+        self.assertIsNone(await self.ach.get_payment_status(""))
+
+    async def test_retries_then_succeeds(self):
+        server, url = start_stub_gateway(self, failures=2)
+        self.ach = self.make_client(url, backoff_factor=0.01, backoff_jitter=0.01)
+        response = await self.ach.create_payment("123456789", "021000021", 5.0)
+        self.assertEqual(response["status"], "success")
+        self.assertEqual(server.posts, 3)
+
+    async def test_retries_reuse_idempotency_key(self):
+        server, url = start_stub_gateway(self, failures=2)
+        self.ach = self.make_client(url, backoff_factor=0.01, backoff_jitter=0.01)
+        await self.ach.create_payment("123456789", "021000021", 5.0)
+        self.assertEqual(len(server.idempotency_keys), 3)
+        self.assertEqual(len(set(server.idempotency_keys)), 1)
+        self.assertIsNotNone(server.idempotency_keys[0])
+
+    async def test_ledger_returns_recorded_response_without_network_call(self):
+        server, url = start_stub_gateway(self)
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        ledger = IdempotencyLedger(tmpdir.name)
+        self.addCleanup(ledger.close)
+        self.ach = self.make_client(url, ledger=ledger)
+        first = await self.ach.create_payment("123456789", "021000021", 5.0, "rent", "rent-1")
+        second = await self.ach.create_payment("123456789", "021000021", 5.0, "rent", "rent-1")
+        self.assertEqual(first, second)
+        self.assertEqual(server.posts, 1)
+        self.assertEqual(server.idempotency_keys, ["rent-1"])
+
+    async def test_failure_after_retries_exhausted(self):
+        server, url = start_stub_gateway(self, failures=10)
+        self.ach = self.make_client(url, max_retries=2, backoff_factor=0.01, backoff_jitter=0)
+        response = await self.ach.create_payment("123456789", "021000021", 5.0)
+        self.assertEqual(response["status"], "failure")
+        self.assertEqual(server.posts, 2)
+
+    async def test_connection_error_returns_failure(self):
+        self.ach = self.make_client("http://127.0.0.1:9/payments", backoff_factor=0.01, backoff_jitter=0)
+        response = await self.ach.create_payment("123456789", "021000021", 5.0)
+        self.assertEqual(response["status"], "failure")
+
+    async def test_submit_many_preserves_order(self):
+        server, url = start_stub_gateway(self)
+        self.ach = self.make_client(url, pool_size=20)
+        count = 1000
+        payments = [("123456789", "021000021", float(i + 1), "Payout %d" % i) for i in range(count)]
+        start_time = time.time()
+        responses = await self.ach.submit_many(payments, max_in_flight=50)
+        duration = time.time() - start_time
+        self.assertEqual(server.posts, count)
+        self.assertEqual([r["amount"] for r in responses], [p[2] for p in payments])
+        print(f"Async ACH throughput: {count / duration:.0f} payments/second")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,7 @@
 import unittest
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 from banking_utils import BankingUtils
+from payment_status_tracker import PaymentStatusTracker
 
 
 class TestBankingUtils(unittest.TestCase):
@@ -20,6 +21,14 @@ class TestBankingUtils(unittest.TestCase):
         account = BankingUtils.generate_account(3)
         self.assertIsNone(account)
 
+    def test_generate_accounts_valid(self):
+        accounts = BankingUtils.generate_accounts(100, 10)
+        self.assertEqual(len(accounts), 100)
+        self.assertTrue(all(len(account) == 10 for account in accounts))
+
+    def test_generate_accounts_invalid_length(self):
+        self.assertIsNone(BankingUtils.generate_accounts(100, 1))
+
     @patch('banking_utils.get_routing_number')
     def test_get_routing_success(self, mock_get_routing):
         mock_get_routing.return_value = '987654321'
@@ -44,30 +53,82 @@ class TestBankingUtils(unittest.TestCase):
         result = BankingUtils.validate_routing('123456789')
         self.assertFalse(result)
 
+    def test_validate_routings(self):
+        mask = BankingUtils.validate_routings(['021000021', '123456789', None])
+        self.assertEqual(mask.tolist(), [True, False, False])
+
+    def test_validate_routings_logs_one_summary_line(self):
+        with self.assertLogs('banking_utils', level='INFO') as logs:
+            BankingUtils.validate_routings(['021000021'] * 100)
+        self.assertEqual(len(logs.output), 1)
+
+    @patch('banking_utils.write_nacha_file')
+    def test_create_ach_batch_file(self, mock_write):
+        mock_write.return_value = {'entry_count': 1}
+        records = [('123456789', '021000021', 10.0, 'desc')]
+        summary = BankingUtils.create_ach_batch_file(records, 'payouts.ach', company_id='1234567890')
+        self.assertEqual(summary, {'entry_count': 1})
+        mock_write.assert_called_once_with('payouts.ach', records, company_id='1234567890')
+
+    @patch('banking_utils.write_nacha_file')
+    def test_create_ach_batch_file_failure(self, mock_write):
+        mock_write.side_effect = ValueError('Invalid routing number')
+        self.assertIsNone(BankingUtils.create_ach_batch_file([], 'payouts.ach'))
+
     @patch('banking_utils.BankingUtils.ach_payments', create=True)
     def test_create_ach_payment_success(self, mock_ach_payments):
         mock_ach_payments.create_payment.return_value = {'status': 'success'}
         response = BankingUtils.create_ach_payment('123', '456', 100.0, 'desc')
         self.assertEqual(response, {'status': 'success'})
 
+    @patch('banking_utils.BankingUtils.ach_payments', create=True)
+    def test_create_ach_payment_passes_idempotency_key(self, mock_ach_payments):
+        mock_ach_payments.create_payment.return_value = {'status': 'success'}
+        BankingUtils.create_ach_payment('123', '456', 100.0, 'desc', idempotency_key='payout-1')
+        mock_ach_payments.create_payment.assert_called_once_with(
+            '123', '456', 100.0, 'desc', idempotency_key='payout-1'
+        )
+
+    def test_ach_payments_record_to_ledger(self):
+        self.assertIsNotNone(BankingUtils.ach_payments.ledger)
+
     @patch('banking_utils.BankingUtils.ach_payments', create=True)
     def test_create_ach_payment_failure(self, mock_ach_payments):
         mock_ach_payments.create_payment.side_effect = Exception('Error')
         response = BankingUtils.create_ach_payment('123', '456', 100.0, 'desc')
         self.assertIsNone(response)
 
-    @patch('banking_utils.BankingUtils.ach_payments', create=True)
-    def test_get_ach_payment_status_success(self, mock_ach_payments):
-        mock_ach_payments.get_payment_status.return_value = 'completed'
+    @patch('banking_utils.BankingUtils.payment_status_tracker')
+    def test_get_ach_payment_status_success(self, mock_tracker):
+        mock_tracker.get_status.return_value = 'completed'
         status = BankingUtils.get_ach_payment_status('tx123')
         self.assertEqual(status, 'completed')
+        mock_tracker.get_status.assert_called_once_with('tx123', force=False)
 
-    @patch('banking_utils.BankingUtils.ach_payments', create=True)
-    def test_get_ach_payment_status_failure(self, mock_ach_payments):
-        mock_ach_payments.get_payment_status.side_effect = Exception('Error')
+    @patch('banking_utils.BankingUtils.payment_status_tracker')
+    def test_get_ach_payment_status_failure(self, mock_tracker):
+        mock_tracker.get_status.side_effect = Exception('Error')
         status = BankingUtils.get_ach_payment_status('tx123')
         self.assertIsNone(status)
 
+    def test_get_ach_payment_status_caches_settled_payments(self):
+        client = MagicMock()
+        client.get_payment_status.return_value = {'status': 'completed'}
+        tracker = PaymentStatusTracker(client)
+        self.addCleanup(tracker.close)
+        with patch.object(BankingUtils, 'payment_status_tracker', tracker):
+            for _ in range(3):
+                status = BankingUtils.get_ach_payment_status('tx123')
+                self.assertEqual(status, {'status': 'completed'})
+        client.get_payment_status.assert_called_once_with('tx123')
+
+    @patch('banking_utils.BankingUtils.payment_status_tracker')
+    def test_get_ach_payment_statuses(self, mock_tracker):
+        mock_tracker.get_statuses.return_value = {'tx1': {'status': 'completed'}}
+        statuses = BankingUtils.get_ach_payment_statuses(['tx1', 'tx1'])
+        self.assertEqual(statuses, {'tx1': {'status': 'completed'}})
+        mock_tracker.get_statuses.assert_called_once_with(['tx1', 'tx1'], force=False)
+
     @patch('banking_utils.BankingUtils.plaid_integration', create=True)
     def test_create_plaid_link_token_success(self, mock_plaid):
         mock_plaid.create_link_token.return_value = {'link_token': 'token'}
@@ -34,7 +34,7 @@ class TestBankingUtilsEdgeCases(unittest.TestCase):
         response = BankingUtils.create_ach_payment("123", "456", 100.0)
         self.assertIsNone(response)
 
-    @patch.object(BankingUtils.ach_payments, 'get_payment_status')
+    @patch.object(BankingUtils.payment_status_tracker, 'get_status')
     def test_get_ach_payment_status_exception(self, mock_get_status):
         mock_get_status.side_effect = Exception("Get status error")
         status = BankingUtils.get_ach_payment_status("TX123")
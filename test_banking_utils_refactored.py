@@ -80,7 +80,7 @@ class TestBankingUtils(unittest.TestCase):
         response = BankingUtils.create_ach_payment('123', '456', 100.0)
         self.assertIsNone(response)
 
-    @patch.object(BankingUtils.ach_payments, 'get_payment_status')
+    @patch.object(BankingUtils.payment_status_tracker, 'get_status')
     def test_get_ach_payment_status(self, mock_get_status):
         \"\"\"Test get_ach_payment_status success and exception cases.\"\"\"
         # Success case
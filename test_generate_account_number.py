@@ -1,5 +1,17 @@
+import os
+import tempfile
 import unittest
-from generate_account_number import generate_account_number, is_valid_account_number
+
+import numpy as np
+
+from generate_account_number import (
+    generate_account_number,
+    generate_account_numbers,
+    is_valid_account_number,
+    is_valid_account_number_bulk,
+    iter_account_number_file_validity,
+    luhn_checksum,
+)
 
 
 class TestGenerateAccountNumber(unittest.TestCase):
@@ -22,6 +34,84 @@ class TestGenerateAccountNumber(unittest.TestCase):
         with self.assertRaises(ValueError):
             generate_account_number("ten")
 
+    def test_generate_batch(self):
+        accounts = generate_account_numbers(1000, 12)
+        self.assertEqual(accounts.shape, (1000,))
+        self.assertEqual(accounts.dtype.itemsize, 12)
+        for account in accounts:
+            self.assertTrue(account.isdigit())
+            self.assertTrue(is_valid_account_number(account.decode()))
+
+    def test_generate_batch_minimum_length(self):
+        accounts = generate_account_numbers(50, 2)
+        self.assertTrue(all(is_valid_account_number(a.decode()) for a in accounts))
+
+    def test_generate_batch_is_reproducible_with_seed(self):
+        first = generate_account_numbers(10, 9, seed=7)
+        second = generate_account_numbers(10, 9, seed=7)
+        self.assertTrue((first == second).all())
+
+    def test_generate_batch_empty(self):
+        self.assertEqual(len(generate_account_numbers(0)), 0)
+
+    def test_generate_batch_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            generate_account_numbers(10, 1)
+        with self.assertRaises(ValueError):
+            generate_account_numbers(-1)
+
+
+class TestLuhnEngine(unittest.TestCase):
+    def test_luhn_checksum_str_and_bytes(self):
+        self.assertEqual(luhn_checksum("79927398713"), 0)
+        self.assertEqual(luhn_checksum(b"79927398713"), 0)
+        self.assertNotEqual(luhn_checksum(b"79927398710"), 0)
+
+    def test_luhn_checksum_non_digit(self):
+        with self.assertRaises(ValueError):
+            luhn_checksum("7992739871A")
+
+    def test_bulk_string_array(self):
+        accounts = np.array(["79927398713", "79927398710", "0", "", "12a4"])
+        mask = is_valid_account_number_bulk(accounts)
+        self.assertEqual(mask.tolist(), [True, False, True, False, False])
+
+    def test_bulk_generated_batch(self):
+        accounts = generate_account_numbers(5000, 16)
+        self.assertTrue(is_valid_account_number_bulk(accounts).all())
+
+    def test_bulk_digit_matrix(self):
+        digits = np.array([[7, 9, 9, 2, 7, 3, 9, 8, 7, 1, 3],
+                           [7, 9, 9, 2, 7, 3, 9, 8, 7, 1, 0]], dtype=np.uint8)
+        self.assertEqual(is_valid_account_number_bulk(digits).tolist(), [True, False])
+
+    def test_bulk_buffer_mixed_lines(self):
+        buffer = b"79927398713\r\n79927398710\n\n4539578763621486\n059"
+        mask = is_valid_account_number_bulk(buffer)
+        self.assertEqual(mask.tolist(), [True, False, False, True, True])
+
+    def test_bulk_file_streaming_matches_scalar(self):
+        lines = ["79927398713", "1234", "4539578763621486", "x1", "0", "18"] * 50
+        with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False) as f:
+            f.write("\n".join(lines) + "\n")
+        self.addCleanup(os.remove, f.name)
+        expected = [line.isdigit() and is_valid_account_number(line) for line in lines]
+
+        chunks = list(iter_account_number_file_validity(f.name, chunk_size=64))
+        self.assertGreater(len(chunks), 1)
+        self.assertEqual(np.concatenate(chunks).tolist(), expected)
+        self.assertEqual(is_valid_account_number_bulk(f.name).tolist(), expected)
+
+    def test_bulk_empty_file(self):
+        with tempfile.NamedTemporaryFile(delete=False) as f:
+            pass
+        self.addCleanup(os.remove, f.name)
+        self.assertEqual(len(is_valid_account_number_bulk(f.name)), 0)
+
+    def test_bulk_unsupported_array(self):
+        with self.assertRaises(ValueError):
+            is_valid_account_number_bulk(np.array([1.5, 2.5]))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,12 +1,21 @@
+import time
 import unittest
 from unittest.mock import patch
-from get_routing_number import get_routing_number, load_cache, save_cache
+from get_routing_number import (
+    RoutingNumberCache,
+    get_routing_number,
+    load_cache,
+    routing_cache,
+    save_cache,
+)
 
 
 class TestGetRoutingNumber(unittest.TestCase):
     def setUp(self):
         # Clear cache before each test
         self.cache = {}
+        routing_cache.reset()
+        self.addCleanup(routing_cache.reset)
 
     @patch('get_routing_number.load_cache')
     @patch('get_routing_number.save_cache')
@@ -54,7 +63,67 @@ class TestGetRoutingNumber(unittest.TestCase):
 
         routing = get_routing_number('Bad JSON Bank')
         self.assertIn("not found in local database", routing)
-    
+
+    @patch('get_routing_number.load_cache')
+    @patch('get_routing_number.save_cache')
+    def test_warm_lookups_do_no_file_io(self, mock_save_cache, mock_load_cache):
+        mock_load_cache.return_value = {}
+        for _ in range(10000):
+            self.assertEqual(get_routing_number('Capetain Cetriva'), '021000021')
+        mock_load_cache.assert_called_once()
+        mock_save_cache.assert_not_called()
+
+
+class TestRoutingNumberCache(unittest.TestCase):
+    def setUp(self):
+        patcher = patch('get_routing_number.load_cache', return_value={})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        save_patcher = patch('get_routing_number.save_cache')
+        self.mock_save_cache = save_patcher.start()
+        self.addCleanup(save_patcher.stop)
+
+    def make_cache(self, **kwargs):
+        cache = RoutingNumberCache(**kwargs)
+        self.addCleanup(cache.reset)
+        return cache
+
+    def test_lru_eviction(self):
+        cache = self.make_cache(capacity=2)
+        cache.set('a', '111111111')
+        cache.set('b', '222222222')
+        cache.get('a')
+        cache.set('c', '333333333')
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('a'), '111111111')
+        self.assertEqual(cache.get('c'), '333333333')
+
+    def test_ttl_expiry(self):
+        cache = self.make_cache(ttl=0.05)
+        cache.set('a', '111111111')
+        self.assertEqual(cache.get('a'), '111111111')
+        time.sleep(0.1)
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(len(cache), 0)
+
+    def test_flush_writes_batch_once(self):
+        cache = self.make_cache(flush_interval=60)
+        for i in range(3):
+            cache.set('bank %d' % i, '02100002%d' % i)
+        cache.flush()
+        cache.flush()
+        self.mock_save_cache.assert_called_once()
+        self.assertEqual(len(self.mock_save_cache.call_args[0][0]), 3)
+
+    def test_background_flush(self):
+        cache = self.make_cache(flush_interval=0.01)
+        cache.set('a', '111111111')
+        deadline = time.time() + 2
+        while not self.mock_save_cache.called and time.time() < deadline:
+            time.sleep(0.01)
+        self.mock_save_cache.assert_called_once()
+
 
 if __name__ == "__main__":
     unittest.main()
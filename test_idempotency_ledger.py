@@ -0,0 +1,121 @@
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from idempotency_ledger import IdempotencyLedger, derive_idempotency_key
+from nacha_file import amount_to_cents
+from testing_helpers import FakeClock
+
+
+class TestDeriveIdempotencyKey(unittest.TestCase):
+    def test_amount_normalized_to_cents(self):
+        key = derive_idempotency_key("123456789", "021000021", 10)
+        self.assertEqual(key, derive_idempotency_key("123456789", "021000021", 10.0))
+        self.assertEqual(key, derive_idempotency_key("123456789", "021000021", "10.00"))
+
+    def test_sub_cent_amounts_round_like_nacha_entries(self):
+        # 10.005 rounds half up to 1001 cents, as in the NACHA file
+        self.assertEqual(amount_to_cents("10.005"), 1001)
+        self.assertEqual(derive_idempotency_key("123456789", "021000021", "10.005"),
+                         derive_idempotency_key("123456789", "021000021", "10.01"))
+
+    def test_fields_distinguish_keys(self):
+        base = derive_idempotency_key("123456789", "021000021", 10, "rent")
+        self.assertNotEqual(base, derive_idempotency_key("123456789", "021000021", 10.01, "rent"))
+        self.assertNotEqual(base, derive_idempotency_key("123456789", "021000021", 10, "rent2"))
+        self.assertNotEqual(base, derive_idempotency_key("12345678", "9021000021", 10, "rent"))
+
+
+class TestIdempotencyLedger(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.clock = FakeClock(1700000000.0)
+        self.ledger = self.make_ledger()
+
+    def make_ledger(self):
+        ledger = IdempotencyLedger(
+            self.tmpdir.name, segment_seconds=3600, retention_segments=3, clock=self.clock
+        )
+        self.addCleanup(ledger.close)
+        return ledger
+
+    def test_put_get_first_response_wins(self):
+        self.assertIsNone(self.ledger.get("k1"))
+        self.assertTrue(self.ledger.put("k1", {"status": "success", "transaction_id": "tx-1"}))
+        self.assertTrue(self.ledger.put("k1", {"status": "success", "transaction_id": "tx-2"}))
+        self.assertEqual(self.ledger.get("k1")["transaction_id"], "tx-1")
+        self.assertIn("k1", self.ledger)
+
+    def test_persists_across_instances(self):
+        self.ledger.put("k1", {"status": "success"})
+        self.ledger.close()
+        self.assertEqual(self.make_ledger().get("k1"), {"status": "success"})
+
+    def test_lookup_spans_segments_and_old_segments_expire(self):
+        self.ledger.put("old", {"status": "success"})
+        self.clock.now += 3600
+        self.ledger.put("new", {"status": "success"})
+        self.assertEqual(len(self.ledger.segments()), 2)
+        self.assertIsNotNone(self.ledger.get("old"))
+
+        self.clock.now += 2 * 3600
+        self.assertIsNone(self.ledger.get("old"))
+        self.assertIsNotNone(self.ledger.get("new"))
+        self.assertEqual(len(self.ledger.segments()), 2)
+        self.assertEqual(
+            len([f for f in os.listdir(self.tmpdir.name) if f.endswith(".db")]), 2
+        )
+
+    def test_roll_closes_connections_of_other_threads(self):
+        self.ledger.put("old", {"status": "success"})
+        old_segment = self.ledger.segments()[0]
+        with ThreadPoolExecutor(max_workers=1) as worker:
+            # The worker thread opens and keeps its own connection to the old segment
+            self.assertIsNotNone(worker.submit(self.ledger.get, "old").result())
+            held = worker.submit(lambda: self.ledger._local.connections[old_segment]).result()
+
+            self.clock.now += 3 * 3600
+            self.assertEqual(self.ledger.roll(), 1)
+            with self.assertRaises(sqlite3.ProgrammingError):
+                held.execute("SELECT 1")
+            self.assertFalse(os.path.exists(self.ledger._segment_path(old_segment)))
+
+            self.assertIsNone(worker.submit(self.ledger.get, "old").result())
+            self.assertTrue(worker.submit(self.ledger.put, "new", {"status": "success"}).result())
+            self.assertIsNotNone(worker.submit(self.ledger.get, "new").result())
+        self.assertFalse(os.path.exists(self.ledger._segment_path(old_segment)))
+
+    def test_concurrent_writers(self):
+        def write(worker):
+            for i in range(200):
+                self.ledger.put("%d-%d" % (worker, i), {"i": i})
+
+        threads = [threading.Thread(target=write, args=(w,)) for w in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(self.ledger.get("3-199"), {"i": 199})
+
+    def test_lookup_cost_independent_of_size(self):
+        conn = self.ledger._connection(self.ledger._active_segment())
+        with conn:
+            conn.executemany(
+                "INSERT INTO ledger (key, response, created) VALUES (?, '{}', 0)",
+                (("key-%d" % i,) for i in range(200000)),
+            )
+        start = time.perf_counter()
+        for i in range(0, 200000, 200):
+            self.assertIsNotNone(self.ledger.get("key-%d" % i))
+        per_lookup = (time.perf_counter() - start) / 1000
+        self.assertLess(per_lookup, 0.001)
+        print(f"Idempotency ledger lookup: {per_lookup * 1e6:.1f} us with 200k keys")
+
+
+if __name__ == "__main__":
+    unittest.main()
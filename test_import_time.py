@@ -0,0 +1,57 @@
+import os
+import subprocess
+import sys
+import unittest
+
+# Cumulative import time budget for banking_utils, in microseconds. Startup is
+# dominated by numpy and requests; torch, pandas, sklearn, yfinance and the Plaid
+# SDK must only load when the features that need them are used.
+IMPORT_BUDGET_US = 1500000
+HEAVY_MODULES = ("torch", "pandas", "sklearn", "yfinance", "plaid", "pynvml")
+
+
+def _import_times(module):
+    """Run ``python -X importtime -c 'import module'`` and return {module: cumulative_us}."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import %s" % module],
+        capture_output=True,
+        text=True,
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+class TestImportTime(unittest.TestCase):
+    def test_banking_utils_does_not_import_heavy_dependencies(self):
+        times = _import_times("banking_utils")
+        loaded = sorted(
+            name for name in times if name.split(".")[0] in HEAVY_MODULES
+        )
+        self.assertEqual(loaded, [])
+
+    def test_banking_utils_import_budget(self):
+        times = _import_times("banking_utils")
+        self.assertLess(times["banking_utils"], IMPORT_BUDGET_US)
+
+    def test_nvidia_singleton_is_lazy(self):
+        code = (
+            "import nvidia_integration as n\n"
+            "assert n._nvidia_integration is None\n"
+            "assert n.nvidia_integration is n.nvidia_integration\n"
+        )
+        subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            check=True,
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
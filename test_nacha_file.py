@@ -0,0 +1,116 @@
+import datetime
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from nacha_file import (
+    NACHAFileWriter,
+    amount_to_cents,
+    write_nacha_file,
+)
+
+
+def _records(count):
+    routing_numbers = ["021000021", "011000015", "026009593"]
+    for i in range(count):
+        yield ("%09d" % i, routing_numbers[i % 3], "%d.%02d" % (i + 1, i % 100), "Payee %d" % i)
+
+
+class TestNACHAFileWriter(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.path = os.path.join(self.tmpdir.name, "payouts.ach")
+        self.options = {
+            "company_id": "1234567890",
+            "effective_date": datetime.date(2024, 1, 2),
+        }
+
+    def read_records(self):
+        with open(self.path) as f:
+            return f.read().splitlines()
+
+    def test_amount_to_cents(self):
+        self.assertEqual(amount_to_cents(10), 1000)
+        self.assertEqual(amount_to_cents(0.1 + 0.2), 30)
+        self.assertEqual(amount_to_cents("1.005"), 101)
+
+    def test_record_layout_and_blocking(self):
+        summary = write_nacha_file(self.path, _records(5), **self.options)
+        lines = self.read_records()
+        self.assertTrue(all(len(line) == 94 for line in lines))
+        self.assertEqual(len(lines) % 10, 0)
+        self.assertEqual([line[0] for line in lines[:9]], list("156666689"))
+        self.assertTrue(all(line == "9" * 94 for line in lines[9:]))
+        self.assertEqual(summary["entry_count"], 5)
+        self.assertEqual(summary["block_count"], len(lines) // 10)
+
+        entry = lines[2]
+        self.assertEqual(entry[1:3], "22")
+        self.assertEqual(entry[3:12], "021000021")
+        self.assertEqual(entry[12:29].rstrip(), "000000000")
+        self.assertEqual(entry[29:39], "0000000100")
+        self.assertEqual(entry[54:76].rstrip(), "PAYEE 0")
+        self.assertEqual(entry[79:94], "021000020000001")
+
+    def test_control_totals(self):
+        records = list(_records(25))
+        summary = write_nacha_file(self.path, records, batch_size=10, **self.options)
+        lines = self.read_records()
+        expected_hash = sum(int(r[1][:8]) for r in records) % 10 ** 10
+        expected_credit = sum(amount_to_cents(r[2]) for r in records)
+
+        batch_controls = [line for line in lines if line[0] == "8"]
+        self.assertEqual([int(line[4:10]) for line in batch_controls], [10, 10, 5])
+        self.assertEqual(sum(int(line[32:44]) for line in batch_controls), expected_credit)
+        self.assertEqual(summary["batch_count"], 3)
+
+        file_control = next(line for line in lines if line[0] == "9")
+        self.assertEqual(int(file_control[1:7]), 3)
+        self.assertEqual(int(file_control[7:13]), len(lines) // 10)
+        self.assertEqual(int(file_control[13:21]), 25)
+        self.assertEqual(int(file_control[21:31]), expected_hash)
+        self.assertEqual(int(file_control[43:55]), expected_credit)
+
+    def test_invalid_record_leaves_no_file(self):
+        records = list(_records(3)) + [("123", "123456789", 1.0, "bad")]
+        with self.assertRaises(ValueError):
+            write_nacha_file(self.path, records, **self.options)
+        self.assertFalse(os.path.exists(self.path))
+        self.assertEqual(os.listdir(self.tmpdir.name), [])
+
+    def test_rejects_bad_amount(self):
+        with self.assertRaises(ValueError):
+            with NACHAFileWriter(self.path, **self.options) as writer:
+                writer.add_entry("123456789", "021000021", 0)
+
+    def test_control_total_overflow_leaves_no_file(self):
+        # 101 maximum entries exceed the 12-digit batch and file credit totals
+        records = [("123456789", "021000021", "99999999.99")] * 101
+        with self.assertRaises(ValueError):
+            write_nacha_file(self.path, records, **self.options)
+        self.assertFalse(os.path.exists(self.path))
+        self.assertEqual(os.listdir(self.tmpdir.name), [])
+
+    def test_rejects_invalid_immediate_destination(self):
+        with self.assertRaises(ValueError):
+            NACHAFileWriter(self.path, immediate_destination="123456789", **self.options)
+
+    def test_header_failure_leaves_no_file(self):
+        writer = NACHAFileWriter(self.path, **self.options)
+        with patch.object(writer, "_write_file_header", side_effect=ValueError("bad header")):
+            with self.assertRaises(ValueError):
+                with writer:
+                    pass
+        self.assertEqual(os.listdir(self.tmpdir.name), [])
+
+    def test_streams_large_files(self):
+        summary = write_nacha_file(self.path, _records(100000), **self.options)
+        self.assertEqual(summary["entry_count"], 100000)
+        self.assertEqual(summary["batch_count"], 10)
+        self.assertEqual(os.path.getsize(self.path), summary["record_count"] * 95)
+
+
+if __name__ == "__main__":
+    unittest.main()
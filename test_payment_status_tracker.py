@@ -0,0 +1,109 @@
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock
+
+from payment_status_tracker import PaymentStatusTracker
+from testing_helpers import FakeClock
+
+
+class TestPaymentStatusTracker(unittest.TestCase):
+    def setUp(self):
+        self.client = MagicMock()
+        self.client.get_payment_status.return_value = {"status": "pending"}
+        self.clock = FakeClock(1000.0)
+        self.tracker = PaymentStatusTracker(
+            self.client, max_workers=4, min_interval=1.0, max_interval=60.0, clock=self.clock
+        )
+        self.addCleanup(self.tracker.close)
+
+    def test_terminal_status_cached_permanently(self):
+        self.client.get_payment_status.return_value = {"status": "completed"}
+        self.assertEqual(self.tracker.get_status("tx-1")["status"], "completed")
+        self.clock.now += 10 ** 6
+        self.assertEqual(self.tracker.get_status("tx-1", force=True)["status"], "completed")
+        self.assertEqual(self.client.get_payment_status.call_count, 1)
+        self.assertEqual(self.tracker.stats()["terminal"], 1)
+
+    def test_failure_is_not_terminal(self):
+        self.client.get_payment_status.return_value = {"status": "failure", "error": "timeout"}
+        self.tracker.get_status("tx-1")
+        self.clock.now += 60
+        self.client.get_payment_status.return_value = {"status": "completed"}
+        self.assertEqual(self.tracker.get_status("tx-1")["status"], "completed")
+        self.assertEqual(self.client.get_payment_status.call_count, 2)
+
+    def test_pending_status_served_from_cache_until_due(self):
+        self.tracker.get_status("tx-1")
+        self.tracker.get_status("tx-1")
+        self.assertEqual(self.client.get_payment_status.call_count, 1)
+        self.clock.now += 2
+        self.tracker.get_status("tx-1")
+        self.assertEqual(self.client.get_payment_status.call_count, 2)
+
+    def test_concurrent_requests_coalesced(self):
+        release = threading.Event()
+
+        def slow_status(transaction_id):
+            release.wait(5)
+            return {"status": "pending"}
+
+        self.client.get_payment_status.side_effect = slow_status
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(self.tracker.get_status("tx-1")))
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        time.sleep(0.1)
+        release.set()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(results), 8)
+        self.assertEqual(self.client.get_payment_status.call_count, 1)
+        self.assertEqual(self.tracker.stats()["coalesced"], 7)
+
+    def test_backoff_grows_with_unchanged_status_and_age(self):
+        self.tracker.track(["tx-1"])
+        intervals = []
+        for _ in range(6):
+            self.tracker.poll_due()
+            wait = self.tracker.seconds_until_next_poll()
+            intervals.append(wait)
+            self.clock.now += wait
+        self.assertGreater(intervals[-1], intervals[0] * 4)
+        self.assertLessEqual(max(intervals), 60.0 * 1.1)
+
+    def test_errors_back_off_exponentially(self):
+        self.client.get_payment_status.side_effect = Exception("gateway down")
+        self.tracker.track(["tx-1"])
+        waits = []
+        for _ in range(4):
+            self.assertEqual(self.tracker.poll_due()["tx-1"]["status"], "failure")
+            waits.append(self.tracker.seconds_until_next_poll())
+            self.clock.now += waits[-1]
+        self.assertGreater(waits[-1], waits[0] * 4)
+
+    def test_poll_due_until_settled(self):
+        ids = ["tx-%d" % i for i in range(100)]
+        polls = {}
+
+        def status(transaction_id):
+            polls[transaction_id] = polls.get(transaction_id, 0) + 1
+            return {"status": "completed" if polls[transaction_id] >= 3 else "pending"}
+
+        self.client.get_payment_status.side_effect = status
+        self.tracker.track(ids)
+        while self.tracker.pending():
+            self.tracker.poll_due()
+            self.clock.now += self.tracker.seconds_until_next_poll() or 0
+        self.assertEqual(self.client.get_payment_status.call_count, 300)
+        self.assertIsNone(self.tracker.seconds_until_next_poll())
+        statuses = self.tracker.get_statuses(ids + ids)
+        self.assertEqual(len(statuses), 100)
+        self.assertEqual(self.client.get_payment_status.call_count, 300)
+
+
+if __name__ == "__main__":
+    unittest.main()
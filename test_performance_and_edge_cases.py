@@ -23,6 +23,18 @@ class TestPerformanceAndEdgeCases(unittest.TestCase):
             f"{duration:.2f} seconds"
         )
 
+    def test_performance_bulk_account_generation(self):
+        start_time = time.time()
+        account_numbers = self.bank_utils.generate_accounts(10000, 12)
+        duration = time.time() - start_time
+        self.assertIsNotNone(account_numbers)
+        self.assertEqual(len(account_numbers), 10000)
+        self.assertLess(duration, 1.0)
+        print(
+            f"Bulk account generation for 10,000 accounts took "
+            f"{duration * 1000:.2f} milliseconds"
+        )
+
     def test_performance_routing_retrieval(self):
         start_time = time.time()
         for _ in range(10000):
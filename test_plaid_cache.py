@@ -0,0 +1,117 @@
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock
+
+from plaid_cache import PlaidResponseCache
+from plaid_integration import PlaidIntegration
+from testing_helpers import FakeClock
+
+
+class TestPlaidResponseCache(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.cache = PlaidResponseCache(
+            max_entries=3, ttls={"auth_get": 60, "item_get": 300}, clock=self.clock
+        )
+
+    def test_per_endpoint_ttl(self):
+        loader = MagicMock(side_effect=lambda: object())
+        accounts = self.cache.get_or_load("auth_get", "tok", loader)
+        item = self.cache.get_or_load("item_get", "tok", loader)
+        self.clock.now = 59
+        self.assertIs(self.cache.get_or_load("auth_get", "tok", loader), accounts)
+        self.clock.now = 61
+        self.assertIsNot(self.cache.get_or_load("auth_get", "tok", loader), accounts)
+        self.assertIs(self.cache.get_or_load("item_get", "tok", loader), item)
+        self.assertEqual(loader.call_count, 3)
+        stats = self.cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (2, 3))
+
+    def test_uncached_endpoint_always_loads(self):
+        loader = MagicMock(return_value="r")
+        self.cache.get_or_load("transactions_get", "tok", loader)
+        self.cache.get_or_load("transactions_get", "tok", loader)
+        self.assertEqual(loader.call_count, 2)
+
+    def test_lru_eviction(self):
+        for token in ("a", "b", "c"):
+            self.cache.put("auth_get", token, token)
+        self.cache.get("auth_get", "a")
+        self.cache.put("auth_get", "d", "d")
+        self.assertIsNone(self.cache.get("auth_get", "b"))
+        self.assertEqual(self.cache.get("auth_get", "a"), "a")
+        self.assertEqual(self.cache.stats()["evictions"], 1)
+        self.assertEqual(len(self.cache), 3)
+
+    def test_single_flight(self):
+        release = threading.Event()
+        calls = []
+
+        def loader():
+            calls.append(1)
+            release.wait(5)
+            return {"accounts": []}
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(self.cache.get_or_load("auth_get", "tok", loader)))
+            for _ in range(10)
+        ]
+        for thread in threads:
+            thread.start()
+        time.sleep(0.1)
+        release.set()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(len(results), 10)
+        self.assertEqual(self.cache.stats()["coalesced"], 9)
+
+    def test_errors_propagate_and_are_not_cached(self):
+        loader = MagicMock(side_effect=[RuntimeError("down"), "ok"])
+        with self.assertRaises(RuntimeError):
+            self.cache.get_or_load("auth_get", "tok", loader)
+        self.assertEqual(self.cache.get_or_load("auth_get", "tok", loader), "ok")
+
+    def test_invalidate_drops_all_endpoints_of_token(self):
+        self.cache.put("auth_get", "tok", 1)
+        self.cache.put("item_get", "tok", 2)
+        self.cache.put("auth_get", "other", 3)
+        self.assertEqual(self.cache.invalidate("tok"), 2)
+        self.assertIsNone(self.cache.get("item_get", "tok"))
+        self.assertEqual(self.cache.get("auth_get", "other"), 3)
+
+    def test_load_racing_invalidation_is_not_cached(self):
+        def loader():
+            self.cache.invalidate("tok")
+            return "stale"
+
+        self.assertEqual(self.cache.get_or_load("auth_get", "tok", loader), "stale")
+        self.assertIsNone(self.cache.get("auth_get", "tok"))
+
+
+class TestPlaidIntegrationCache(unittest.TestCase):
+    def setUp(self):
+        self.cache = PlaidResponseCache()
+        self.plaid = PlaidIntegration(cache=self.cache)
+        self.plaid.client = MagicMock()
+        self.plaid.client.item_get.return_value.to_dict.return_value = {"item": {"item_id": "i1"}}
+
+    def test_get_item_cached_until_removed(self):
+        self.assertEqual(self.plaid.get_item("tok"), {"item": {"item_id": "i1"}})
+        self.plaid.get_item("tok")
+        self.assertEqual(self.plaid.client.item_get.call_count, 1)
+        self.plaid.remove_item("tok")
+        self.plaid.get_item("tok")
+        self.assertEqual(self.plaid.client.item_get.call_count, 2)
+
+    def test_invalidate_access_token_drops_cache(self):
+        self.plaid.get_item("tok")
+        self.plaid.invalidate_access_token("tok")
+        self.plaid.get_item("tok")
+        self.assertEqual(self.plaid.client.item_get.call_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
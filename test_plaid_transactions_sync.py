@@ -0,0 +1,137 @@
+import json
+import os
+import tempfile
+import threading
+import unittest
+from unittest.mock import MagicMock
+
+from plaid.exceptions import ApiException
+
+from plaid_integration import PlaidIntegration
+
+from plaid_transactions_sync import (
+    MUTATION_DURING_PAGINATION,
+    CursorStore,
+    TransactionsSyncEngine,
+)
+
+
+class FakePlaid:
+    """Serves /transactions/sync pages from a per-token list of pages keyed by cursor."""
+
+    def __init__(self, pages):
+        self.pages = pages  # {token: {cursor: page}}
+        self.calls = []
+        self.lock = threading.Lock()
+        self.fail_once = set()
+
+    def sync_transactions_page(self, access_token, cursor=None, count=500):
+        with self.lock:
+            self.calls.append((access_token, cursor))
+            if (access_token, cursor) in self.fail_once:
+                self.fail_once.discard((access_token, cursor))
+                error = ApiException(status=400, reason="Bad Request")
+                error.body = json.dumps({"error_code": MUTATION_DURING_PAGINATION})
+                raise error
+        if access_token == "bad-token":
+            raise ApiException(status=400, reason="Bad Request")
+        return self.pages[access_token][cursor]
+
+
+def make_pages(token, pages):
+    """Chain pages: page i is served for cursor c<i-1> and returns cursor c<i>."""
+    served = {}
+    previous = None
+    for i, (added, modified, removed) in enumerate(pages):
+        cursor = "%s-c%d" % (token, i)
+        served[previous] = {
+            "added": [{"transaction_id": t, "amount": 1.0} for t in added],
+            "modified": [{"transaction_id": t, "amount": 2.0} for t in modified],
+            "removed": [{"transaction_id": t} for t in removed],
+            "next_cursor": cursor,
+            "has_more": i < len(pages) - 1,
+        }
+        previous = cursor
+    return served
+
+
+class TestTransactionsSyncEngine(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.store = CursorStore(os.path.join(self.tmpdir.name, "cursors.db"))
+        self.addCleanup(self.store.close)
+
+    def test_pages_through_deltas_and_commits_cursor(self):
+        plaid = FakePlaid({"tok": make_pages("tok", [(["t1", "t2"], [], []), (["t3"], ["t1"], ["t2"])])})
+        engine = TransactionsSyncEngine(plaid, self.store)
+        events = [(e.kind, e.transaction["transaction_id"]) for e in engine.sync("tok")]
+        self.assertEqual(events, [
+            ("added", "t1"), ("added", "t2"), ("added", "t3"), ("modified", "t1"), ("removed", "t2"),
+        ])
+        self.assertEqual(self.store.get("tok"), "tok-c1")
+        self.assertEqual(engine.stats()["pages"], 2)
+
+    def test_incremental_sync_starts_from_stored_cursor(self):
+        pages = make_pages("tok", [(["t1"], [], []), (["t2"], [], [])])
+        pages["tok-c1"] = {"added": [], "modified": [], "removed": [],
+                           "next_cursor": "tok-c1", "has_more": False}
+        plaid = FakePlaid({"tok": pages})
+        engine = TransactionsSyncEngine(plaid, self.store)
+        self.assertEqual(len(list(engine.sync("tok"))), 2)
+        plaid.calls.clear()
+        self.assertEqual(list(engine.sync("tok")), [])
+        self.assertEqual(plaid.calls, [("tok", "tok-c1")])
+
+    def test_fans_out_across_items(self):
+        tokens = ["tok%d" % i for i in range(20)]
+        plaid = FakePlaid({
+            t: make_pages(t, [(["%s-a%d" % (t, j) for j in range(50)], [], [])] * 3)
+            for t in tokens
+        })
+        engine = TransactionsSyncEngine(plaid, self.store, max_workers=4, queue_size=16)
+        events = list(engine.stream(tokens + tokens[:3]))
+        self.assertEqual(len(events), 20 * 150)
+        self.assertEqual({e.access_token for e in events}, set(tokens))
+        self.assertTrue(all(self.store.get(t) == "%s-c2" % t for t in tokens))
+
+    def test_failed_item_keeps_cursor_and_others_complete(self):
+        plaid = FakePlaid({"tok": make_pages("tok", [(["t1"], [], [])])})
+        engine = TransactionsSyncEngine(plaid, self.store)
+        events = list(engine.stream(["tok", "bad-token"]))
+        self.assertEqual(len(events), 1)
+        self.assertIn("bad-token", engine.errors)
+        self.assertIsNone(self.store.get("bad-token"))
+        self.assertEqual(self.store.get("tok"), "tok-c0")
+
+    def test_restarts_pagination_on_mutation(self):
+        plaid = FakePlaid({"tok": make_pages("tok", [(["t1"], [], []), (["t2"], [], [])])})
+        plaid.fail_once.add(("tok", "tok-c0"))
+        engine = TransactionsSyncEngine(plaid, self.store)
+        ids = [e.transaction["transaction_id"] for e in engine.sync("tok")]
+        self.assertEqual(ids, ["t1", "t1", "t2"])  # replayed page is delivered again
+        self.assertEqual(plaid.calls, [("tok", None), ("tok", "tok-c0"), ("tok", None), ("tok", "tok-c0")])
+        self.assertEqual(engine.stats()["restarts"], 1)
+
+    def test_early_exit_does_not_commit_cursor(self):
+        plaid = FakePlaid({"tok": make_pages("tok", [(["t%d" % i for i in range(100)], [], [])] * 5)})
+        engine = TransactionsSyncEngine(plaid, self.store, queue_size=10)
+        stream = engine.sync("tok")
+        next(stream)
+        stream.close()
+        self.assertIsNone(self.store.get("tok"))
+
+    def test_plaid_integration_page_request(self):
+        plaid = PlaidIntegration()
+        plaid.client = MagicMock()
+        plaid.client.transactions_sync.return_value = make_pages("tok", [(["t1"], [], [])])[None]
+        engine = TransactionsSyncEngine(plaid, self.store)
+        self.assertEqual(len(list(engine.sync("tok"))), 1)
+        request = plaid.client.transactions_sync.call_args[0][0]
+        self.assertEqual(request.access_token, "tok")
+        self.assertEqual(request.count, 500)
+        self.assertNotIn("cursor", request.to_dict())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,131 @@
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+from plaid.model.account_balance import AccountBalance
+from plaid.model.account_base import AccountBase
+from plaid.model.account_subtype import AccountSubtype
+from plaid.model.account_type import AccountType
+from plaid.model.accounts_get_response import AccountsGetResponse
+
+from banking_utils import BankingUtils
+from plaid_integration import PlaidIntegration
+from plaid_views import ListView, ResponseView, convert_response, project
+
+
+def make_accounts_response(count):
+    accounts = [
+        AccountBase(
+            account_id="acc-%d" % i,
+            balances=AccountBalance(
+                available=100.0 + i, current=110.0 + i, limit=None,
+                iso_currency_code="USD", unofficial_currency_code=None,
+            ),
+            mask="%04d" % i,
+            name="Checking %d" % i,
+            official_name=None,
+            type=AccountType("depository"),
+            subtype=AccountSubtype("checking"),
+        )
+        for i in range(count)
+    ]
+    return AccountsGetResponse(
+        accounts=accounts, item={"item_id": "item-1"}, request_id="req-1", _check_type=False
+    )
+
+
+class TestResponseView(unittest.TestCase):
+    def setUp(self):
+        self.response = make_accounts_response(3)
+
+    def test_view_matches_to_dict(self):
+        view = ResponseView(self.response)
+        expected = self.response.to_dict()
+        self.assertEqual(set(view), set(expected))
+        self.assertIsInstance(view["accounts"], ListView)
+        self.assertEqual(len(view["accounts"]), 3)
+        account = view["accounts"][1]
+        self.assertEqual(account["balances"]["available"], 101.0)
+        self.assertEqual(account.type, "depository")
+        self.assertEqual(view.item, {"item_id": "item-1"})
+        self.assertEqual(account.to_dict(), expected["accounts"][1])
+        self.assertEqual(view["accounts"].to_list(), expected["accounts"])
+        self.assertEqual(dict(account["balances"]), expected["accounts"][1]["balances"])
+
+    def test_missing_field(self):
+        view = ResponseView(self.response)
+        with self.assertRaises(KeyError):
+            view["missing"]
+        self.assertIsNone(view.get("missing"))
+        with self.assertRaises(AttributeError):
+            view.missing
+
+    def test_views_have_no_instance_dict(self):
+        self.assertFalse(hasattr(ResponseView(self.response), "__dict__"))
+        self.assertFalse(hasattr(ListView([]), "__dict__"))
+
+    def test_project(self):
+        projected = project(self.response, [
+            "accounts.account_id", "accounts.balances.available", "item", "request_id", "nope",
+        ])
+        self.assertEqual(projected["accounts"][2], {"account_id": "acc-2", "balances": {"available": 102.0}})
+        self.assertEqual(projected["item"], {"item_id": "item-1"})
+        self.assertEqual(projected["request_id"], "req-1")
+        self.assertNotIn("nope", projected)
+
+    def test_convert_response_modes(self):
+        self.assertEqual(convert_response(self.response), self.response.to_dict())
+        self.assertIsInstance(convert_response(self.response, lazy=True), ResponseView)
+        self.assertEqual(convert_response(self.response, fields=["request_id"]), {"request_id": "req-1"})
+
+    def test_projection_cheaper_than_full_conversion(self):
+        response = make_accounts_response(2000)
+        fields = ["accounts.account_id", "accounts.balances.available"]
+
+        def best_of(func):
+            best = float("inf")
+            for _ in range(3):
+                start = time.perf_counter()
+                func()
+                best = min(best, time.perf_counter() - start)
+            return best
+
+        full = best_of(response.to_dict)
+        projected = best_of(lambda: project(response, fields))
+        lazy = best_of(lambda: [a["balances"]["available"] for a in ResponseView(response)["accounts"]])
+        self.assertLess(projected, full)
+        self.assertLess(lazy, full)
+        print(f"2000 accounts: to_dict {full * 1e3:.1f} ms, project {projected * 1e3:.1f} ms, "
+              f"lazy view {lazy * 1e3:.1f} ms")
+
+
+class TestPlaidIntegrationResponseModes(unittest.TestCase):
+    def setUp(self):
+        self.plaid = PlaidIntegration()
+        self.plaid.client = MagicMock()
+        self.plaid.client.auth_get.return_value = make_accounts_response(2)
+
+    def test_default_returns_dict(self):
+        self.assertIsInstance(self.plaid.get_accounts("tok"), dict)
+
+    def test_lazy_and_projection(self):
+        self.assertIsInstance(self.plaid.get_accounts("tok", lazy=True), ResponseView)
+        self.assertEqual(
+            self.plaid.get_accounts("tok", fields=["accounts.mask"]),
+            {"accounts": [{"mask": "0000"}, {"mask": "0001"}]},
+        )
+
+    def test_client_wide_lazy_mode(self):
+        self.plaid.lazy_responses = True
+        self.assertIsInstance(self.plaid.get_accounts("tok"), ResponseView)
+        self.assertIsInstance(self.plaid.get_accounts("tok", lazy=False), dict)
+
+    @patch('banking_utils.BankingUtils.plaid_integration', create=True)
+    def test_banking_utils_opt_in(self, mock_plaid):
+        mock_plaid.get_accounts.return_value = {'accounts': []}
+        BankingUtils.get_plaid_accounts('tok', fields=['accounts.account_id'])
+        mock_plaid.get_accounts.assert_called_once_with('tok', fields=['accounts.account_id'], lazy=False)
+
+
+if __name__ == "__main__":
+    unittest.main()
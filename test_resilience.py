@@ -0,0 +1,203 @@
+import time
+import unittest
+from unittest.mock import MagicMock
+
+import requests
+from plaid.exceptions import ApiException
+
+from ach_payments import ACHPayments
+from plaid_integration import PlaidIntegration
+from resilience import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+    CircuitOpenError,
+    RateLimitExceeded,
+    TokenBucket,
+    guarded_call,
+)
+from test_ach_payments import start_stub_gateway
+from testing_helpers import FakeClock
+
+
+def fail():
+    raise ConnectionError("down")
+
+
+class TestTokenBucket(unittest.TestCase):
+    def test_burst_then_refill(self):
+        clock = FakeClock(100.0)
+        bucket = TokenBucket(rate=10, capacity=5, clock=clock)
+        self.assertEqual(sum(bucket.try_acquire() for _ in range(10)), 5)
+        clock.now += 0.35
+        self.assertEqual(sum(bucket.try_acquire() for _ in range(10)), 3)
+        clock.now += 100
+        self.assertEqual(bucket.metrics()["available_tokens"], 5)
+
+    def test_acquire_waits_for_rate(self):
+        bucket = TokenBucket(rate=200, capacity=1)
+        start = time.perf_counter()
+        for _ in range(21):
+            self.assertTrue(bucket.acquire(timeout=1))
+        self.assertGreaterEqual(time.perf_counter() - start, 0.09)
+        self.assertGreater(bucket.metrics()["throttled"], 0)
+
+    def test_acquire_gives_up_after_timeout(self):
+        bucket = TokenBucket(rate=1, capacity=1)
+        self.assertTrue(bucket.acquire(timeout=0))
+        self.assertFalse(bucket.acquire(timeout=0.01))
+        self.assertEqual(bucket.metrics()["rejected"], 1)
+        with self.assertRaises(RateLimitExceeded):
+            guarded_call("x", lambda: None, rate_limiter=bucket, max_wait=0.01)
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock(100.0)
+        self.breaker = CircuitBreaker(
+            failure_threshold=3, window_seconds=10, open_seconds=5, clock=self.clock
+        )
+
+    def trip(self, endpoint="a"):
+        for _ in range(3):
+            with self.assertRaises(ConnectionError):
+                self.breaker.call(endpoint, fail)
+
+    def test_opens_after_threshold_within_window(self):
+        for _ in range(2):
+            with self.assertRaises(ConnectionError):
+                self.breaker.call("a", fail)
+            self.clock.now += 6
+        # The first failure has left the window
+        with self.assertRaises(ConnectionError):
+            self.breaker.call("a", fail)
+        self.assertEqual(self.breaker.state("a"), CLOSED)
+        with self.assertRaises(ConnectionError):
+            self.breaker.call("a", fail)
+        self.assertEqual(self.breaker.state("a"), OPEN)
+
+    def test_endpoints_are_independent(self):
+        self.trip("a")
+        self.assertEqual(self.breaker.call("b", lambda: "ok"), "ok")
+        with self.assertRaises(CircuitOpenError):
+            self.breaker.call("a", lambda: "ok")
+
+    def test_half_open_trial_closes_or_reopens(self):
+        self.trip()
+        self.clock.now += 5
+        self.assertEqual(self.breaker.state("a"), HALF_OPEN)
+        with self.assertRaises(ConnectionError):
+            self.breaker.call("a", fail)
+        self.assertEqual(self.breaker.state("a"), OPEN)
+
+        self.clock.now += 5
+        self.breaker.before_call("a")
+        with self.assertRaises(CircuitOpenError):
+            self.breaker.before_call("a")  # only one trial call at a time
+        self.breaker.record_success("a")
+        self.assertEqual(self.breaker.state("a"), CLOSED)
+        self.assertEqual(self.breaker.metrics()["a"]["times_opened"], 2)
+
+    def test_ignored_errors_do_not_trip(self):
+        for _ in range(5):
+            with self.assertRaises(ValueError):
+                self.breaker.call("a", int, "x", is_failure=lambda e: not isinstance(e, ValueError))
+        self.assertEqual(self.breaker.state("a"), CLOSED)
+
+    def test_open_circuit_fails_fast(self):
+        self.trip()
+        calls = 10000
+        start = time.perf_counter()
+        for _ in range(calls):
+            try:
+                self.breaker.call("a", fail)
+            except CircuitOpenError:
+                pass
+        per_call = (time.perf_counter() - start) / calls
+        self.assertLess(per_call, 50e-6)
+        metrics = self.breaker.metrics()["a"]
+        self.assertEqual(metrics["rejected"], calls)
+        self.assertEqual(metrics["state_code"], 2)
+        print(f"Open-circuit rejection: {per_call * 1e6:.2f} us per call")
+
+    def test_rate_limited_call_releases_half_open_slot(self):
+        self.trip()
+        self.clock.now += 5
+        bucket = TokenBucket(rate=1, capacity=1)
+        bucket.try_acquire()
+        with self.assertRaises(RateLimitExceeded):
+            guarded_call("a", lambda: None, rate_limiter=bucket,
+                         circuit_breaker=self.breaker, max_wait=0)
+        self.assertEqual(guarded_call("a", lambda: "ok", circuit_breaker=self.breaker), "ok")
+        self.assertEqual(self.breaker.state("a"), CLOSED)
+
+
+class TestACHPaymentsCircuitBreaker(unittest.TestCase):
+    def make_client(self, url, breaker):
+        ach = ACHPayments(max_retries=2, backoff_factor=0.01, backoff_jitter=0,
+                          circuit_breaker=breaker)
+        ach.api_key = "test_api_key"
+        ach.api_url = url
+        self.addCleanup(ach.close)
+        return ach
+
+    def test_flaky_gateway_opens_and_recovers(self):
+        server, url = start_stub_gateway(self, failures=10 ** 6)
+        breaker = CircuitBreaker(failure_threshold=3, window_seconds=60, open_seconds=0.2)
+        ach = self.make_client(url, breaker)
+
+        for _ in range(3):
+            self.assertEqual(ach.create_payment("123456789", "021000021", 1.0)["status"], "failure")
+        posts = server.posts
+        self.assertEqual(posts, 6)  # three calls, two attempts each
+        self.assertEqual(breaker.state("ach.create_payment"), OPEN)
+
+        response = ach.create_payment("123456789", "021000021", 1.0)
+        self.assertIn("open", response["error"])
+        self.assertEqual(server.posts, posts)
+        # Other endpoints keep their own circuit
+        self.assertEqual(ach.get_payment_status("tx-1")["status"], "completed")
+
+        with server.lock:
+            server.failures_remaining = 0
+        time.sleep(0.25)
+        self.assertEqual(ach.create_payment("123456789", "021000021", 1.0)["status"], "success")
+        self.assertEqual(breaker.state("ach.create_payment"), CLOSED)
+        self.assertEqual(ach.stats()["circuits"]["ach.create_payment"]["times_opened"], 1)
+
+    def test_client_errors_do_not_trip(self):
+        breaker = CircuitBreaker(failure_threshold=1)
+        ach = self.make_client("http://127.0.0.1:9/payments", breaker)
+        response = MagicMock(status_code=400)
+        response.raise_for_status.side_effect = requests.HTTPError(response=response)
+        ach.session.request = MagicMock(return_value=response)
+        ach.create_payment("123456789", "021000021", 1.0)
+        self.assertEqual(breaker.state("ach.create_payment"), CLOSED)
+
+
+class TestPlaidIntegrationCircuitBreaker(unittest.TestCase):
+    def test_plaid_outage_fails_fast(self):
+        breaker = CircuitBreaker(failure_threshold=2, open_seconds=60)
+        plaid = PlaidIntegration(circuit_breaker=breaker)
+        plaid.client = MagicMock()
+        plaid.client.auth_get.side_effect = ApiException(status=503, reason="Service Unavailable")
+        self.assertIsNone(plaid.get_accounts("access-token"))
+        self.assertIsNone(plaid.get_accounts("access-token"))
+        self.assertIsNone(plaid.get_accounts("access-token"))
+        self.assertEqual(plaid.client.auth_get.call_count, 2)
+        self.assertEqual(breaker.metrics()["plaid.auth_get"]["rejected"], 1)
+
+    def test_plaid_invalid_request_does_not_trip(self):
+        breaker = CircuitBreaker(failure_threshold=1)
+        plaid = PlaidIntegration(circuit_breaker=breaker)
+        plaid.client = MagicMock()
+        plaid.client.auth_get.side_effect = ApiException(status=400, reason="Bad Request")
+        plaid.get_accounts("access-token")
+        plaid.get_accounts("access-token")
+        self.assertEqual(plaid.client.auth_get.call_count, 2)
+        self.assertEqual(breaker.state("plaid.auth_get"), CLOSED)
+
+
+if __name__ == "__main__":
+    unittest.main()
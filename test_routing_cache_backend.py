@@ -0,0 +1,133 @@
+import json
+import multiprocessing
+import os
+import sqlite3
+import tempfile
+import time
+import unittest
+
+import get_routing_number
+from get_routing_number import JSONCacheBackend, RoutingNumberCache
+from routing_cache_backend import SQLiteCacheBackend, read_json_cache, write_json_cache
+
+
+def _write_entries(path, worker, count):
+    backend = SQLiteCacheBackend(path)
+    for i in range(count):
+        backend.write({
+            "bank %d-%d" % (worker, i): {"routing_number": "021000021", "timestamp": time.time()}
+        })
+    backend.close()
+
+
+def _write_json_entries(path, worker, count):
+    get_routing_number.CACHE_FILE = path
+    backend = JSONCacheBackend()
+    for i in range(count):
+        backend.write({
+            "bank %d-%d" % (worker, i): {"routing_number": "021000021", "timestamp": time.time()}
+        })
+
+
+class TestSQLiteCacheBackend(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.path = os.path.join(self.tmpdir.name, "cache.db")
+        self.backend = SQLiteCacheBackend(self.path, ttl=60)
+        self.addCleanup(self.backend.close)
+
+    def entry(self, age=0.0):
+        return {"routing_number": "021000021", "timestamp": time.time() - age}
+
+    def test_write_load_fetch(self):
+        self.assertTrue(self.backend.write({"a": self.entry(), "b": self.entry()}))
+        self.assertEqual(set(self.backend.load()), {"a", "b"})
+        self.assertEqual(self.backend.fetch("a")["routing_number"], "021000021")
+        self.assertIsNone(self.backend.fetch("missing"))
+
+    def test_wal_mode(self):
+        self.backend.load()
+        conn = sqlite3.connect(self.path)
+        self.addCleanup(conn.close)
+        self.assertEqual(conn.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+
+    def test_expired_entries_hidden_and_compacted_incrementally(self):
+        self.backend.write({"bank %d" % i: self.entry(age=120) for i in range(5)})
+        self.backend.write({"fresh": self.entry()})
+        self.assertEqual(set(self.backend.load()), {"fresh"})
+        self.assertIsNone(self.backend.fetch("bank 0"))
+        self.assertEqual(self.backend.compact(limit=2), 2)
+        self.assertEqual(self.backend.compact(limit=10), 3)
+        self.assertEqual(self.backend.compact(), 0)
+
+    def test_json_import_export(self):
+        json_path = os.path.join(self.tmpdir.name, "cache.json")
+        with open(json_path, "w") as f:
+            json.dump({"a": self.entry(), "old": self.entry(age=120)}, f)
+        self.assertEqual(self.backend.import_json(json_path), 1)
+
+        export_path = os.path.join(self.tmpdir.name, "export.json")
+        self.assertEqual(self.backend.export_json(export_path), 1)
+        self.assertEqual(set(read_json_cache(export_path, 60)), {"a"})
+
+    def test_concurrent_writer_processes(self):
+        self.backend.load()
+        workers = [
+            multiprocessing.Process(target=_write_entries, args=(self.path, w, 50))
+            for w in range(4)
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+            self.assertEqual(worker.exitcode, 0)
+        self.assertEqual(len(self.backend.load()), 200)
+
+    def test_routing_cache_reads_entries_from_other_processes(self):
+        cache = RoutingNumberCache(backend=self.backend, flush_interval=60)
+        self.addCleanup(cache.reset)
+        self.assertIsNone(cache.get("capetain cetriva"))
+
+        other = SQLiteCacheBackend(self.path, ttl=60)
+        self.addCleanup(other.close)
+        other.write({"capetain cetriva": self.entry()})
+        self.assertEqual(cache.get("capetain cetriva"), "021000021")
+
+    def test_routing_cache_flushes_batch(self):
+        cache = RoutingNumberCache(backend=self.backend, flush_interval=60)
+        self.addCleanup(cache.reset)
+        cache.set("a", "111111111")
+        cache.set("b", "222222222")
+        self.assertEqual(self.backend.load(), {})
+        cache.flush()
+        self.assertEqual(set(self.backend.load()), {"a", "b"})
+
+
+class TestJSONCacheFile(unittest.TestCase):
+    def test_atomic_write_leaves_no_temp_files(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "cache.json")
+            entries = {"a": {"routing_number": "021000021", "timestamp": time.time()}}
+            write_json_cache(path, entries)
+            write_json_cache(path, entries)
+            self.assertEqual(os.listdir(tmpdir), ["cache.json"])
+            self.assertEqual(read_json_cache(path, 60), entries)
+
+    def test_concurrent_writer_processes_keep_every_entry(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "cache.json")
+            workers = [
+                multiprocessing.Process(target=_write_json_entries, args=(path, w, 50))
+                for w in range(4)
+            ]
+            for worker in workers:
+                worker.start()
+            for worker in workers:
+                worker.join()
+                self.assertEqual(worker.exitcode, 0)
+            self.assertEqual(len(read_json_cache(path, 60)), 200)
+
+
+if __name__ == "__main__":
+    unittest.main()
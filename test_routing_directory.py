@@ -0,0 +1,110 @@
+import os
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+
+from get_routing_number import get_routing_number, routing_cache
+from routing_directory import RoutingDirectory, get_routing_directory, normalize_bank_name
+
+
+def fedach_record(routing_number, name, office_code="O", city="NEW YORK", state="NY"):
+    return (
+        routing_number + office_code + "011000015" + "0" + "010125" + "000000000"
+        + name.ljust(36)[:36] + "1 MAIN STREET".ljust(36) + city.ljust(20) + state
+        + "10001" + "0000" + "2125551234" + "1" + "1" + " " * 5
+    )
+
+
+RECORDS = [
+    fedach_record("021000021", "JPMORGAN CHASE BANK, NA"),
+    fedach_record("021000089", "CITIBANK NA"),
+    fedach_record("026009593", "BANK OF AMERICA, N.A.", city="CHARLOTTE", state="NC"),
+    fedach_record("011000138", "BANK OF AMERICA, N.A.", office_code="B", city="BOSTON", state="MA"),
+    fedach_record("031101114", "CAPETAIN CETRIVA PRIVATE BANK", city="WILMINGTON", state="DE"),
+]
+
+
+class TestRoutingDirectory(unittest.TestCase):
+    def write_directory(self, records, newline="\n"):
+        with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False, newline="") as f:
+            f.write(newline.join(records) + newline)
+        self.addCleanup(os.remove, f.name)
+        return f.name
+
+    def setUp(self):
+        self.directory = RoutingDirectory.load(self.write_directory(RECORDS))
+
+    def test_record_layout(self):
+        self.assertEqual(len(RECORDS[0]), 155)
+        self.assertEqual(len(self.directory), 5)
+
+    def test_reverse_lookup(self):
+        record = self.directory.institution("026009593")
+        self.assertEqual(record["customer_name"], "BANK OF AMERICA, N.A.")
+        self.assertEqual(record["city"], "CHARLOTTE")
+        self.assertEqual(record["state"], "NC")
+        self.assertIsNone(self.directory.institution("999999999"))
+
+    def test_lookup_by_normalized_name_prefers_main_office(self):
+        self.assertEqual(self.directory.lookup("Bank of America N.A."), "026009593")
+        self.assertEqual(self.directory.lookup("jpmorgan chase bank na"), "021000021")
+        self.assertIsNone(self.directory.lookup("Unknown Bank"))
+
+    def test_prefix_search(self):
+        names = [r["customer_name"] for r in self.directory.search_prefix("bank of")]
+        self.assertEqual(names, ["BANK OF AMERICA, N.A."] * 2)
+        routing = [r["routing_number"] for r in self.directory.search_routing_prefix("0210")]
+        self.assertEqual(routing, ["021000021", "021000089"])
+
+    def test_fuzzy_search(self):
+        self.assertEqual(self.directory.search("capetain")[0]["routing_number"], "031101114")
+        self.assertEqual(self.directory.search("Cetrva Privat")[0]["routing_number"], "031101114")
+        self.assertEqual(self.directory.search("chase")[0]["routing_number"], "021000021")
+        self.assertEqual(self.directory.search("zzzz"), [])
+
+    def test_crlf_and_missing_final_newline(self):
+        path = self.write_directory(RECORDS, newline="\r\n")
+        self.assertEqual(len(RoutingDirectory.load(path)), 5)
+        with tempfile.NamedTemporaryFile("w", delete=False, newline="") as f:
+            f.write("\n".join(RECORDS))
+        self.addCleanup(os.remove, f.name)
+        self.assertEqual(RoutingDirectory.load(f.name).institution("031101114")["state"], "DE")
+
+    def test_single_record_file(self):
+        directory = RoutingDirectory.load(self.write_directory(RECORDS[:1]))
+        self.assertEqual(len(directory), 1)
+        self.assertEqual(directory.lookup("JPMorgan Chase Bank NA"), "021000021")
+
+    def test_rejects_short_records(self):
+        with self.assertRaises(ValueError):
+            RoutingDirectory.load(self.write_directory(["021000021 too short"]))
+
+    def test_load_full_size_directory_quickly(self):
+        records = [
+            fedach_record("%09d" % i, "SYNTHETIC BANK %d" % i) for i in range(20000)
+        ]
+        path = self.write_directory(records)
+        start_time = time.time()
+        directory = RoutingDirectory.load(path)
+        duration = time.time() - start_time
+        self.assertEqual(len(directory), 20000)
+        self.assertEqual(directory.lookup("Synthetic Bank 12345"), "000012345")
+        self.assertLess(duration, 1.0)
+
+    def test_get_routing_number_uses_configured_directory(self):
+        path = self.write_directory(RECORDS)
+        routing_cache.reset()
+        self.addCleanup(routing_cache.reset)
+        with patch.dict(os.environ, {"FEDACH_DIRECTORY_FILE": path}), \
+                patch("get_routing_number.load_cache", return_value={}):
+            self.assertIsNotNone(get_routing_directory())
+            self.assertEqual(get_routing_number("Citibank, N.A."), "021000089")
+            self.assertEqual(get_routing_number("Capetain Cetriva"), "021000021")
+
+    def test_normalize_bank_name(self):
+        self.assertEqual(normalize_bank_name("  Citibank, N.A. "), "citibank na")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,16 @@
 import unittest
-from validate_routing_number import validate_routing_number
+
+import numpy as np
+
+from validate_routing_number import (
+    REASON_BAD_CHECKSUM,
+    REASON_BAD_LENGTH,
+    REASON_NON_DIGIT,
+    REASON_NOT_STRING,
+    REASON_VALID,
+    validate_routing_number,
+    validate_routing_numbers,
+)
 
 
 class TestValidateRoutingNumber(unittest.TestCase):
@@ -25,5 +36,34 @@ class TestValidateRoutingNumber(unittest.TestCase):
         self.assertFalse(validate_routing_number(123456789))
 
 
+class TestValidateRoutingNumbers(unittest.TestCase):
+    def test_reason_codes(self):
+        mask, reasons = validate_routing_numbers(
+            ["021000021", "12345678", "1234567890", "abcdefghi", "123456789", None, b"021000021"]
+        )
+        self.assertEqual(mask.tolist(), [True, False, False, False, False, False, True])
+        self.assertEqual(reasons.tolist(), [
+            REASON_VALID, REASON_BAD_LENGTH, REASON_BAD_LENGTH, REASON_NON_DIGIT,
+            REASON_BAD_CHECKSUM, REASON_NOT_STRING, REASON_VALID,
+        ])
+
+    def test_matches_scalar_validation(self):
+        rng = np.random.default_rng(0)
+        numbers = ["".join(map(str, row)) for row in rng.integers(0, 10, size=(2000, 9))]
+        mask, _ = validate_routing_numbers(np.array(numbers))
+        self.assertEqual(mask.tolist(), [validate_routing_number(n) for n in numbers])
+
+    def test_digit_matrix_input(self):
+        digits = np.array([[0, 2, 1, 0, 0, 0, 0, 2, 1], [1, 2, 3, 4, 5, 6, 7, 8, 9]], dtype=np.uint8)
+        mask, reasons = validate_routing_numbers(digits)
+        self.assertEqual(mask.tolist(), [True, False])
+        self.assertEqual(reasons.tolist(), [REASON_VALID, REASON_BAD_CHECKSUM])
+
+    def test_empty_batch(self):
+        mask, reasons = validate_routing_numbers([])
+        self.assertEqual(len(mask), 0)
+        self.assertEqual(len(reasons), 0)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,13 @@
+"""
+Helpers shared by the unit tests.
+"""
+
+
+class FakeClock:
+    """Settable time source for code that takes a ``clock`` callable."""
+
+    def __init__(self, now: float = 0.0) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
@@ -1,10 +1,30 @@
 import logging
-from typing import Union
+from typing import Any, Iterable, Tuple, Union
+
+import numpy as np
 
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+ROUTING_NUMBER_LENGTH: int = 9
+# ABA checksum weights: 3-7-1 repeated across the nine digits.
+ROUTING_WEIGHTS = np.array([3, 7, 1] * 3, dtype=np.int64)
+
+# Reason codes returned by validate_routing_numbers.
+REASON_VALID: int = 0
+REASON_BAD_LENGTH: int = 1
+REASON_NON_DIGIT: int = 2
+REASON_BAD_CHECKSUM: int = 3
+REASON_NOT_STRING: int = 4
+REASON_NAMES = {
+    REASON_VALID: "valid",
+    REASON_BAD_LENGTH: "bad length",
+    REASON_NON_DIGIT: "non-digit",
+    REASON_BAD_CHECKSUM: "bad checksum",
+    REASON_NOT_STRING: "not a string",
+}
+
 
 def validate_routing_number(routing_number: Union[str, None]) -> bool:
     """
@@ -39,12 +59,96 @@ def validate_routing_number(routing_number: Union[str, None]) -> bool:
         1 * (digits[2] + digits[5] + digits[8])
     )
     is_valid = checksum % 10 == 0
-    logger.info(
-        f"Routing number {routing_number} validation result: {is_valid}"
-    )
+    logger.debug("Routing number %s validation result: %s", routing_number, is_valid)
     return is_valid
 
 
+def _routing_digit_matrix(
+    routing_numbers: Union[Iterable[Any], np.ndarray]
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Parse routing numbers into a (n, 9) uint8 matrix of ASCII-offset digit values.
+
+    Returns:
+        Tuple of the digit matrix, the length of each entry and a mask of entries
+        that were not strings.
+    """
+    if isinstance(routing_numbers, np.ndarray) and routing_numbers.dtype.kind in "SU":
+        array = routing_numbers.ravel()
+        not_string = np.zeros(len(array), dtype=bool)
+        if array.dtype.kind == "U":
+            try:
+                array = array.astype(bytes)
+            except UnicodeEncodeError:
+                array = np.char.encode(array, "ascii", "replace")
+    else:
+        items = list(routing_numbers)
+        not_string = np.array(
+            [not isinstance(item, (str, bytes)) for item in items], dtype=bool
+        )
+        array = np.array(
+            [
+                item.encode("ascii", "replace") if isinstance(item, str)
+                else item if isinstance(item, bytes) else b""
+                for item in items
+            ],
+            dtype=bytes,
+        )
+
+    width = max(array.dtype.itemsize, ROUTING_NUMBER_LENGTH)
+    matrix = array.astype(f"S{width}").view(np.uint8).reshape(len(array), width)
+    # NumPy pads byte strings with NULs, so the length is the count of non-NUL bytes.
+    lengths = np.count_nonzero(matrix, axis=1)
+    digits = matrix[:, :ROUTING_NUMBER_LENGTH] - np.uint8(ord("0"))
+    return digits, lengths, not_string
+
+
+def validate_routing_numbers(
+    routing_numbers: Union[Iterable[Any], np.ndarray]
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Validates many US bank routing numbers in one vectorized pass.
+    Numbers are parsed into a uint8 digit matrix and the 3-7-1 weights are applied
+    as a single matrix-vector product.
+
+    Args:
+        routing_numbers: Iterable of routing number strings (or bytes), a NumPy
+            string array, or an (n, 9) uint8 matrix of digit values 0-9.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Boolean validity mask and a uint8 array of
+        reason codes (REASON_VALID, REASON_BAD_LENGTH, REASON_NON_DIGIT,
+        REASON_BAD_CHECKSUM or REASON_NOT_STRING), one per input.
+
+    Usage example:
+        >>> mask, reasons = validate_routing_numbers(["021000021", "12345", "123456789"])
+        >>> mask
+        array([ True, False, False])
+        >>> reasons
+        array([0, 1, 3], dtype=uint8)
+    """
+    if (
+        isinstance(routing_numbers, np.ndarray)
+        and routing_numbers.dtype == np.uint8
+        and routing_numbers.ndim == 2
+    ):
+        if routing_numbers.shape[1] != ROUTING_NUMBER_LENGTH:
+            raise ValueError("Digit matrix must have 9 columns")
+        digits = routing_numbers
+        lengths = np.full(len(digits), ROUTING_NUMBER_LENGTH)
+        not_string = np.zeros(len(digits), dtype=bool)
+    else:
+        digits, lengths, not_string = _routing_digit_matrix(routing_numbers)
+
+    checksums = digits @ ROUTING_WEIGHTS
+    reasons = np.full(len(digits), REASON_VALID, dtype=np.uint8)
+    reasons[checksums % 10 != 0] = REASON_BAD_CHECKSUM
+    reasons[(digits > 9).any(axis=1)] = REASON_NON_DIGIT
+    reasons[lengths != ROUTING_NUMBER_LENGTH] = REASON_BAD_LENGTH
+    reasons[not_string] = REASON_NOT_STRING
+    return reasons == REASON_VALID, reasons
+
+
 if __name__ == "__main__":
     routing_number = "987654321"
     is_valid = validate_routing_number(routing_number)